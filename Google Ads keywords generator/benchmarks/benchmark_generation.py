@@ -0,0 +1,78 @@
+"""
+Keyword generation benchmark.
+
+Times the vectorized KeywordCrossProduct engine against the original
+itertools.product / f-string approach for 1M, 10M and 100M keywords.
+
+Usage:
+    python benchmarks/benchmark_generation.py [--sizes 1000000 10000000] [--legacy-max 10000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import product
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from keyword_generator.strategies import (  # noqa: E402
+    BroadMatchStrategy,
+    ExactMatchStrategy,
+    PhraseMatchStrategy,
+    generate_all,
+)
+
+PRODUCT_COUNT = 50_000
+DEFAULT_SIZES = [1_000_000, 10_000_000, 100_000_000]
+
+
+def make_inputs(size: int):
+    """Build product and modifier lists whose cross product has `size` rows."""
+    products = [f"product {i}" for i in range(min(PRODUCT_COUNT, size))]
+    modifiers = [f"modifier {i}" for i in range(max(1, size // len(products)))]
+    return products, modifiers
+
+
+def legacy_generate(products, modifiers):
+    """The original three-pass, list-of-f-strings implementation."""
+    frames = []
+    for template, match_type in (('{} {}', 'Broad'), ('"{} {}"', 'Phrase'), ('[{} {}]', 'Exact')):
+        keywords = [template.format(mod, prod) for mod, prod in product(modifiers, products)]
+        frames.append(pd.DataFrame({'keyword': keywords, 'match_type': match_type}))
+    return frames
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--legacy-max', type=int, default=10_000_000,
+                        help="Skip the legacy implementation above this many keywords per match type.")
+    args = parser.parse_args()
+
+    strategies = [BroadMatchStrategy(), PhraseMatchStrategy(), ExactMatchStrategy()]
+    print(f"{'keywords':>12} {'engine':>10} {'seconds':>10} {'keywords/s':>14}")
+    for size in args.sizes:
+        products, modifiers = make_inputs(size)
+        total = len(products) * len(modifiers) * len(strategies)
+
+        elapsed, result = time_call(generate_all, products, modifiers, strategies)
+        print(f"{total:>12,} {'vectorized':>10} {elapsed:>10.2f} {total / elapsed:>14,.0f}")
+        del result
+
+        if size <= args.legacy_max:
+            elapsed, result = time_call(legacy_generate, products, modifiers)
+            print(f"{total:>12,} {'legacy':>10} {elapsed:>10.2f} {total / elapsed:>14,.0f}")
+            del result
+
+
+if __name__ == "__main__":
+    main()
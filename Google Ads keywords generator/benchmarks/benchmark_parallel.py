@@ -0,0 +1,56 @@
+"""
+Parallel generation benchmark.
+
+Times KeywordGenerator.generate_keywords_parallel for broad, phrase and
+exact match with an increasing number of worker processes.
+
+Usage:
+    python benchmarks/benchmark_parallel.py [--keywords 10000000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from keyword_generator.generator import KeywordGenerator, StrategyFactory  # noqa: E402
+from keyword_generator.observers import KeywordSaver  # noqa: E402
+
+
+class CountingKeywordSaver(KeywordSaver):
+    """An observer that only counts the keywords it receives."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def update(self, keywords):
+        self.rows += len(keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keywords', type=int, default=10_000_000,
+                        help="Keywords per match type.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    products = [f"product {i}" for i in range(50_000)]
+    modifiers = [f"modifier {i}" for i in range(max(1, args.keywords // len(products)))]
+    factory = StrategyFactory()
+    strategies = [factory.create_strategy(name) for name in ('broad', 'phrase', 'exact')]
+
+    print(f"{'workers':>8} {'seconds':>10} {'keywords/s':>14}")
+    for workers in args.workers:
+        generator = KeywordGenerator(products, modifiers)
+        counter = CountingKeywordSaver()
+        generator.attach(counter)
+        start = time.perf_counter()
+        generator.generate_keywords_parallel(strategies, shards=4 * workers, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>10.2f} {counter.rows / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
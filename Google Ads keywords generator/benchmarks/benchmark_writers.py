@@ -0,0 +1,74 @@
+"""
+Keyword writer benchmark.
+
+Streams the same keywords through every bulk writer and reports rows per
+second and output size per format, next to pandas' DataFrame.to_csv.
+
+Usage:
+    python benchmarks/benchmark_writers.py [--keywords 10000000] [--chunk-size 1000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from keyword_generator.observers import (  # noqa: E402
+    ArrowKeywordSaver,
+    CsvKeywordSaver,
+    ParquetKeywordSaver,
+)
+from keyword_generator.strategies import BroadMatchStrategy  # noqa: E402
+
+SAVERS = {
+    'keywords.csv': lambda path, flush: CsvKeywordSaver(path, flush_size=flush),
+    'keywords.csv.gz': lambda path, flush: CsvKeywordSaver(path, flush_size=flush),
+    'keywords.csv.zst': lambda path, flush: CsvKeywordSaver(path, flush_size=flush),
+    'keywords.parquet': lambda path, flush: ParquetKeywordSaver(path, flush_size=flush),
+    'keywords.arrow': lambda path, flush: ArrowKeywordSaver(path, flush_size=flush),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keywords', type=int, default=10_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--flush-size', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    products = [f"product {i}" for i in range(50_000)]
+    modifiers = [f"modifier {i}" for i in range(max(1, args.keywords // len(products)))]
+    chunks = list(BroadMatchStrategy().generate_chunks(products, modifiers, args.chunk_size))
+    total = sum(len(chunk) for chunk in chunks)
+
+    print(f"{'format':>18} {'seconds':>10} {'rows/s':>14} {'MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'pandas.csv')
+        start = time.perf_counter()
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(path, mode='a', header=i == 0, index=False)
+        elapsed = time.perf_counter() - start
+        print(f"{'pandas to_csv':>18} {elapsed:>10.2f} {total / elapsed:>14,.0f} "
+              f"{os.path.getsize(path) / 1e6:>10.1f}")
+
+        for name, make_saver in SAVERS.items():
+            path = os.path.join(tmp, name)
+            try:
+                saver = make_saver(path, args.flush_size)
+            except ImportError as e:
+                print(f"{name:>18} skipped: {e}")
+                continue
+            start = time.perf_counter()
+            for chunk in chunks:
+                saver.update(chunk)
+            saver.close()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>18} {elapsed:>10.2f} {total / elapsed:>14,.0f} "
+                  f"{os.path.getsize(path) / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+AdWords Keyword Dynamo: Command-line batch runner.
+
+Reads products and modifiers from files, generates keywords for the chosen
+strategies into the chosen sinks and reports per-stage timing and
+keywords per second.
+
+Examples:
+    python src/cli.py --products products.txt --modifiers modifiers.csv \\
+        --strategies broad exact --sink csv:data/keywords.csv.gz --chunk-size 1000000
+
+    python src/cli.py --products products.txt --modifiers modifiers.txt --dry-run
+"""
+
+import argparse
+import csv
+import sys
+import time
+from typing import Iterator, List, Optional
+import pandas as pd
+from keyword_generator.generator import KeywordGenerator, SaverFactory, StrategyFactory
+from keyword_generator.observers import KeywordSaver
+from keyword_generator.pipeline import KeywordCleaningStage, KeywordStage
+from keyword_generator.strategies import KeywordGenerationStrategy
+
+
+def read_terms(filepath: str, column: Optional[str] = None) -> Iterator[str]:
+    """
+    Stream terms from a CSV or newline-delimited file, one line at a time.
+
+    CSV files ('.csv') must have a header row; terms are read from the given
+    column, or the first column. Any other file is read as one term per line.
+    Blank lines are skipped.
+
+    Args:
+        filepath: The file to read.
+        column: The CSV column holding the terms.
+
+    Yields:
+        The stripped terms, in file order.
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        if filepath.lower().endswith('.csv'):
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if column is not None and column not in header:
+                raise ValueError(f"Column '{column}' not found in {filepath}")
+            index = header.index(column) if column is not None else 0
+            for row in reader:
+                if len(row) > index and row[index].strip():
+                    yield row[index].strip()
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+def load_terms(filepath: str, column: Optional[str] = None) -> List[str]:
+    """Read the unique terms of a file, keeping their first-seen order."""
+    return list(dict.fromkeys(read_terms(filepath, column)))
+
+
+def estimate_csv_bytes(products: List[str], modifiers: List[str], strategy: KeywordGenerationStrategy) -> int:
+    """
+    Compute the size of a strategy's CSV output without generating it.
+
+    Every keyword is '<modifier> <product>', so the total text length follows
+    from the summed lengths of the inputs. The CSV writer quotes every field
+    and doubles quotes inside it.
+
+    Args:
+        products: The product terms.
+        modifiers: The modifier terms.
+        strategy: The strategy whose decoration is applied.
+
+    Returns:
+        The estimated size in bytes, excluding the header row.
+    """
+    count = len(products) * len(modifiers)
+    text_bytes = (
+        len(products) * sum(len(m.encode('utf-8')) for m in modifiers)
+        + len(modifiers) * sum(len(p.encode('utf-8')) for p in products)
+        + count  # the space between modifier and product
+        + len(products) * sum(m.count('"') for m in modifiers)
+        + len(modifiers) * sum(p.count('"') for p in products)
+    )
+    decoration = strategy.decorate(pd.Series([''], dtype='string')).iloc[0]
+    keyword_overhead = len(decoration.encode('utf-8')) + decoration.count('"') + 2
+    # Quoted match type, a comma and a newline.
+    row_overhead = len(strategy.match_type) + 2 + 2
+    return text_bytes + count * (keyword_overhead + row_overhead)
+
+
+class TimedKeywordSaver(KeywordSaver):
+    """
+    Wraps a keyword saver and measures the time spent writing.
+    """
+
+    def __init__(self, saver: KeywordSaver):
+        self.saver = saver
+        self.seconds = 0.0
+
+    def _timed(self, method: str, *args):
+        start = time.perf_counter()
+        getattr(self.saver, method)(*args)
+        self.seconds += time.perf_counter() - start
+
+    def update(self, keywords: pd.DataFrame):
+        self._timed('update', keywords)
+
+    def update_delta(self, delta):
+        self._timed('update_delta', delta)
+
+    def flush(self):
+        self._timed('flush')
+
+    def close(self):
+        self._timed('close')
+
+
+class TimedStage(KeywordStage):
+    """
+    Wraps a pipeline stage and measures its processing time.
+    """
+
+    def __init__(self, stage: KeywordStage):
+        self.stage = stage
+        self.seconds = 0.0
+
+    def process(self, keywords: pd.DataFrame) -> pd.DataFrame:
+        start = time.perf_counter()
+        result = self.stage.process(keywords)
+        self.seconds += time.perf_counter() - start
+        return result
+
+
+class KeywordCounter(KeywordSaver):
+    """
+    Counts the keywords delivered to the observers.
+    """
+
+    def __init__(self):
+        self.rows = 0
+
+    def update(self, keywords: pd.DataFrame):
+        self.rows += len(keywords)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate Google Ads keywords from product and modifier files.",
+        epilog=__doc__.split('Examples:')[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--products', required=True, help="CSV or newline-delimited file of products.")
+    parser.add_argument('--modifiers', required=True, help="CSV or newline-delimited file of modifiers.")
+    parser.add_argument('--column', help="The CSV column holding the terms in both files (default: first column).")
+    parser.add_argument('--product-column', help="The CSV column holding the products (default: --column).")
+    parser.add_argument('--modifier-column', help="The CSV column holding the modifiers (default: --column).")
+    parser.add_argument('--strategies', nargs='+', default=list(StrategyFactory.strategy_types),
+                        choices=StrategyFactory.strategy_types, help="Match types to generate.")
+    parser.add_argument('--sink', action='append', metavar='TYPE[:PATH]',
+                        help=f"Output sink, one of {', '.join(SaverFactory.saver_types)}; repeatable "
+                             "(default: csv:data/generated_keywords.csv). CSV files are appended to; "
+                             "existing Parquet and Arrow files are kept and a run-indexed file is written.")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                        help="Keywords per streamed chunk, and at most per shard with --workers.")
+    parser.add_argument('--flush-size', type=int, default=1_000_000,
+                        help="Rows per batch written by file sinks.")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Generate in a process pool with this many workers (default: sequential).")
+    parser.add_argument('--negative-keywords', help="File of negative keywords to filter out.")
+    parser.add_argument('--dedupe', action='store_true', help="Normalize and deduplicate keywords.")
+    parser.add_argument('--async-dispatch', action='store_true',
+                        help="Write to the sinks on background threads.")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Only report the output cardinality and estimated size.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the keyword generator from the command line.
+    """
+    args = parse_args(argv)
+    strategy_factory = StrategyFactory()
+    strategies = [strategy_factory.create_strategy(name) for name in args.strategies]
+
+    start = time.perf_counter()
+    products = load_terms(args.products, args.product_column or args.column)
+    modifiers = load_terms(args.modifiers, args.modifier_column or args.column)
+    read_seconds = time.perf_counter() - start
+    print(f"Read {len(products)} products and {len(modifiers)} modifiers in {read_seconds:.2f}s")
+
+    if args.dry_run:
+        total_count = 0
+        total_bytes = 0
+        for strategy in strategies:
+            count = len(products) * len(modifiers)
+            size = estimate_csv_bytes(products, modifiers, strategy)
+            total_count += count
+            total_bytes += size
+            print(f"{strategy.match_type:>8}: {count:>15,} keywords, ~{size / 1e6:,.1f} MB as CSV")
+        print(f"{'Total':>8}: {total_count:>15,} keywords, ~{total_bytes / 1e6:,.1f} MB as CSV")
+        return 0
+
+    generator = KeywordGenerator(products, modifiers)
+    stages = []
+    if args.dedupe or args.negative_keywords:
+        negative_keywords = load_terms(args.negative_keywords) if args.negative_keywords else []
+        stages.append(TimedStage(KeywordCleaningStage(negative_keywords, deduplicate=args.dedupe)))
+    for stage in stages:
+        generator.add_stage(stage)
+
+    saver_factory = SaverFactory()
+    savers = []
+    for sink in args.sink or ['csv:data/generated_keywords.csv']:
+        saver_type, _, filepath = sink.partition(':')
+        savers.append(TimedKeywordSaver(saver_factory.create_saver(saver_type, filepath, args.flush_size)))
+    counter = KeywordCounter()
+    for saver in savers + [counter]:
+        generator.attach(saver)
+    if args.async_dispatch:
+        generator.enable_async_dispatch()
+
+    start = time.perf_counter()
+    if args.workers:
+        generator.generate_keywords_parallel(strategies, max_workers=args.workers, chunk_size=args.chunk_size)
+    else:
+        for strategy in strategies:
+            generator.set_strategy(strategy)
+            generator.generate_keywords(chunk_size=args.chunk_size)
+    generator.close()
+    run_seconds = time.perf_counter() - start
+
+    stage_seconds = sum(stage.seconds for stage in stages)
+    write_seconds = sum(saver.seconds for saver in savers)
+    print("--- Timing ---")
+    print(f"{'read':>10}: {read_seconds:8.2f}s")
+    if args.async_dispatch:
+        # Writes overlap with generation, so they are reported separately.
+        print(f"{'generate':>10}: {run_seconds - stage_seconds:8.2f}s")
+    else:
+        print(f"{'generate':>10}: {run_seconds - stage_seconds - write_seconds:8.2f}s")
+    if stages:
+        print(f"{'pipeline':>10}: {stage_seconds:8.2f}s")
+    for saver in savers:
+        print(f"{'write':>10}: {saver.seconds:8.2f}s ({type(saver.saver).__name__})")
+    total_seconds = read_seconds + run_seconds
+    rate = counter.rows / total_seconds if total_seconds else 0.0
+    print(f"{counter.rows:,} keywords in {total_seconds:.2f}s ({rate:,.0f} keywords/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
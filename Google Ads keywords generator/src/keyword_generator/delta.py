@@ -0,0 +1,113 @@
+"""
+Incremental Keyword Generation.
+
+This module contains the pieces that let the generator emit only the
+keywords that changed since its previous run, including:
+- KeywordDelta: The event observers receive for an incremental run.
+- InputSnapshot: The products and modifiers a strategy last ran with.
+- SnapshotStore: Keeps snapshots in memory and, optionally, in a JSON file.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import pandas as pd
+
+
+class KeywordDelta:
+    """
+    The keywords added and removed by an incremental generation run.
+
+    Attributes:
+        match_type: The match type of the strategy that produced the delta.
+        added: A pandas DataFrame with the new keywords.
+        removed: A pandas DataFrame with the keywords that no longer exist.
+    """
+
+    def __init__(self, match_type: str, added: pd.DataFrame, removed: pd.DataFrame):
+        self.match_type = match_type
+        self.added = added
+        self.removed = removed
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed)
+
+    def __repr__(self) -> str:
+        return f"KeywordDelta({self.match_type!r}, added={len(self.added)}, removed={len(self.removed)})"
+
+
+class InputSnapshot:
+    """
+    The products and modifiers a strategy was last run with.
+    """
+
+    def __init__(self, products: Sequence[str], modifiers: Sequence[str]):
+        # Duplicates would be generated twice, so only the first occurrence counts.
+        self.products: List[str] = list(dict.fromkeys(products))
+        self.modifiers: List[str] = list(dict.fromkeys(modifiers))
+
+    def diff(self, current: 'InputSnapshot') -> Tuple[List[Tuple[List[str], List[str]]], List[Tuple[List[str], List[str]]]]:
+        """
+        Work out which product x modifier blocks were added and removed.
+
+        A keyword is new if its modifier is new, or if its product is new and
+        its modifier is kept; removals mirror this. The blocks never overlap,
+        so no keyword is emitted twice.
+
+        Args:
+            current: The snapshot of the current inputs.
+
+        Returns:
+            Two lists of (products, modifiers) blocks: added and removed.
+        """
+        old_products, old_modifiers = set(self.products), set(self.modifiers)
+        new_products, new_modifiers = set(current.products), set(current.modifiers)
+
+        added_products = [p for p in current.products if p not in old_products]
+        removed_products = [p for p in self.products if p not in new_products]
+        added_modifiers = [m for m in current.modifiers if m not in old_modifiers]
+        removed_modifiers = [m for m in self.modifiers if m not in new_modifiers]
+        kept_modifiers = [m for m in current.modifiers if m in old_modifiers]
+
+        added = [(current.products, added_modifiers), (added_products, kept_modifiers)]
+        removed = [(self.products, removed_modifiers), (removed_products, kept_modifiers)]
+        return (
+            [(products, modifiers) for products, modifiers in added if products and modifiers],
+            [(products, modifiers) for products, modifiers in removed if products and modifiers],
+        )
+
+
+class SnapshotStore:
+    """
+    Keeps the last InputSnapshot of every match type.
+
+    With a filepath the snapshots are saved as JSON after every run, so a
+    daily job can compute its delta against the previous day's run.
+    """
+
+    def __init__(self, filepath: Optional[str] = None):
+        self.filepath = filepath
+        self._snapshots: Dict[str, InputSnapshot] = {}
+        if filepath and os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for match_type, data in json.load(f).items():
+                    self._snapshots[match_type] = InputSnapshot(data['products'], data['modifiers'])
+
+    def get(self, match_type: str) -> InputSnapshot:
+        """Get the last snapshot of a match type, or an empty one."""
+        return self._snapshots.get(match_type, InputSnapshot([], []))
+
+    def put(self, match_type: str, snapshot: InputSnapshot):
+        """Store the snapshot of a match type, saving the file if configured."""
+        self._snapshots[match_type] = snapshot
+        if self.filepath:
+            os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+            data = {
+                key: {'products': value.products, 'modifiers': value.modifiers}
+                for key, value in self._snapshots.items()
+            }
+            # Write to a temporary file first so a crash never leaves a truncated snapshot.
+            temp_path = f"{self.filepath}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.filepath)
@@ -0,0 +1,179 @@
+"""
+Asynchronous Observer Dispatch.
+
+This module lets the generator hand keywords to its observers without
+waiting for them, including:
+- DispatchMetrics: Timing and queue-depth counters for one observer.
+- ObserverWorker: A bounded queue and worker thread for one observer.
+- AsyncDispatcher: Fans observer calls out to one ObserverWorker each.
+
+Each observer gets its own queue and thread, so a slow sink only delays
+itself. Queues are bounded: when a sink falls behind, the generator blocks
+on put() until the sink catches up (backpressure), which keeps memory
+bounded by max_queue frames per observer. Calls reach each observer in the
+order they were dispatched.
+"""
+
+from typing import Dict, List, Optional
+import queue
+import threading
+import time
+
+from .observers import KeywordSaver
+
+# Placed on a worker's queue to make its thread exit.
+_STOP = object()
+
+
+class DispatchMetrics:
+    """
+    Counters collected for one observer during asynchronous dispatch.
+
+    Attributes:
+        calls: The number of observer calls handled.
+        rows: The number of keyword rows passed to update().
+        busy_seconds: Time the observer spent inside its calls.
+        blocked_seconds: Time the generator waited on a full queue.
+        max_queue_depth: The largest queue depth seen at dispatch time.
+        undelivered: Calls still queued when stopping the worker timed out.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.rows = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self.undelivered = 0
+
+    def __str__(self) -> str:
+        rate = self.rows / self.busy_seconds if self.busy_seconds else 0.0
+        return (f"{self.name}: {self.calls} calls, {self.rows} rows, busy {self.busy_seconds:.2f}s "
+                f"({rate:,.0f} rows/s), blocked {self.blocked_seconds:.2f}s, "
+                f"max queue depth {self.max_queue_depth}")
+
+
+class ObserverWorker:
+    """
+    Runs one observer's calls on a dedicated thread, fed by a bounded queue.
+    """
+
+    def __init__(self, observer: KeywordSaver, max_queue: int = 8):
+        self.observer = observer
+        self.metrics = DispatchMetrics(type(observer).__name__)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=f"observer-{self.metrics.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, method: str, *args):
+        """
+        Queue a call to one of the observer's methods, blocking while the queue is full.
+
+        Args:
+            method: The observer method to call, e.g. 'update'.
+            *args: The arguments for the call.
+        """
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self._queue.qsize())
+        start = time.perf_counter()
+        self._queue.put((method, args))
+        self.metrics.blocked_seconds += time.perf_counter() - start
+
+    def stop(self, timeout: Optional[float] = None, close_observer: bool = False) -> bool:
+        """
+        Drain the queue and stop the worker thread.
+
+        If the timeout expires, the calls still queued are counted in
+        metrics.undelivered; the daemon thread may deliver them later, but
+        the caller must not rely on it.
+
+        Args:
+            timeout: The maximum number of seconds to wait, including any
+                wait for room in a full queue, or None to wait for the drain.
+            close_observer: Queue a call to the observer's close() first.
+
+        Returns:
+            True if the worker finished within the timeout.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        calls = [('close', ())] if close_observer else []
+        calls.append((_STOP, ()))
+        queued = 0
+        try:
+            for call in calls:
+                remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                self._queue.put(call, timeout=remaining)
+                queued += 1
+        except queue.Full:
+            pass
+        remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        self._thread.join(remaining)
+        if not self._thread.is_alive():
+            return True
+        # The observer calls still queued plus those that did not fit; the stop marker is not a call.
+        stop_queued = int(queued == len(calls))
+        self.metrics.undelivered = self._queue.qsize() - stop_queued + len(calls) - 1 - (queued - stop_queued)
+        return False
+
+    def _run(self):
+        while True:
+            method, args = self._queue.get()
+            if method is _STOP:
+                return
+            start = time.perf_counter()
+            try:
+                getattr(self.observer, method)(*args)
+            except Exception as e:
+                print(f"Error in {self.metrics.name}.{method}: {e}")
+            self.metrics.busy_seconds += time.perf_counter() - start
+            self.metrics.calls += 1
+            if method == 'update':
+                self.metrics.rows += len(args[0])
+
+
+class AsyncDispatcher:
+    """
+    Dispatches observer calls to one ObserverWorker per observer.
+    """
+
+    def __init__(self, max_queue: int = 8):
+        self.max_queue = max_queue
+        self._workers: Dict[int, ObserverWorker] = {}
+
+    def add(self, observer: KeywordSaver):
+        """Start a worker for an observer."""
+        self._workers[id(observer)] = ObserverWorker(observer, self.max_queue)
+
+    def remove(self, observer: KeywordSaver, timeout: Optional[float] = None):
+        """Drain and stop an observer's worker."""
+        worker = self._workers.pop(id(observer), None)
+        if worker:
+            worker.stop(timeout)
+
+    def dispatch(self, observer: KeywordSaver, method: str, *args):
+        """Queue a call for one observer."""
+        self._workers[id(observer)].submit(method, *args)
+
+    def shutdown(self, timeout: Optional[float] = None, close_observers: bool = False) -> List[DispatchMetrics]:
+        """
+        Drain every queue, stop all workers and report their metrics.
+
+        Workers that do not finish in time are reported with the number of
+        calls they did not deliver (DispatchMetrics.undelivered).
+
+        Args:
+            timeout: The maximum number of seconds to wait for each worker.
+            close_observers: Call every observer's close() before stopping.
+
+        Returns:
+            The DispatchMetrics of every observer.
+        """
+        metrics = []
+        for worker in self._workers.values():
+            start = time.perf_counter()
+            finished = worker.stop(timeout, close_observer=close_observers)
+            status = "" if finished else f" (timed out, {worker.metrics.undelivered} calls not delivered)"
+            print(f"{worker.metrics} - drained in {time.perf_counter() - start:.2f}s{status}")
+            metrics.append(worker.metrics)
+        self._workers.clear()
+        return metrics
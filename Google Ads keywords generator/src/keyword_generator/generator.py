@@ -4,9 +4,13 @@ Keyword Generator Core Logic.
 This module contains the core classes for the keyword generator, including:
 - KeywordGenerator: The main class that generates keywords.
 - StrategyFactory: A factory for creating keyword generation strategies.
+- SaverFactory: A factory for creating keyword savers (observers).
 """
 
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+import os
 import pandas as pd
 from .strategies import (
     KeywordGenerationStrategy,
@@ -14,7 +18,17 @@ from .strategies import (
     PhraseMatchStrategy,
     ExactMatchStrategy
 )
-from .observers import KeywordSaver
+from .dispatch import AsyncDispatcher, DispatchMetrics
+from .delta import InputSnapshot, KeywordDelta, SnapshotStore
+from .observers import (
+    KeywordSaver,
+    CsvKeywordSaver,
+    ParquetKeywordSaver,
+    ArrowKeywordSaver,
+    ConsoleKeywordSaver
+)
+from .pipeline import KeywordStage
+from .templates import KeywordTemplate
 
 
 class KeywordGenerator:
@@ -24,41 +38,301 @@ class KeywordGenerator:
     This class uses the Strategy pattern to allow for different keyword
     generation methods (e.g., broad match, phrase match, exact match).
     It also uses the Observer pattern to notify observers when new
-    keywords are generated.
+    keywords are generated. Pipeline stages added with add_stage() process
+    every generated frame, in order, before the observers are notified.
     """
 
-    def __init__(self, products: List[str], modifiers: List[str]):
+    def __init__(self, products: List[str], modifiers: List[str], state_path: Optional[str] = None):
+        """
+        Args:
+            products: A list of product keywords.
+            modifiers: A list of modifier keywords.
+            state_path: An optional JSON file in which generate_delta() keeps
+                the inputs of the previous run, so deltas survive restarts.
+        """
         self.products = products
         self.modifiers = modifiers
-        self._strategy: KeywordGenerationStrategy | None = None
+        self._snapshots = SnapshotStore(state_path)
+        self._strategy: Optional[KeywordGenerationStrategy] = None
         self._observers: List[KeywordSaver] = []
+        self._stages: List[KeywordStage] = []
+        self._dispatcher: Optional[AsyncDispatcher] = None
 
     def attach(self, observer: KeywordSaver):
         """Attach an observer to the keyword generator."""
         self._observers.append(observer)
+        if self._dispatcher:
+            self._dispatcher.add(observer)
 
     def detach(self, observer: KeywordSaver):
         """Detach an observer from the keyword generator."""
         self._observers.remove(observer)
+        if self._dispatcher:
+            self._dispatcher.remove(observer)
+
+    def enable_async_dispatch(self, max_queue: int = 8):
+        """
+        Deliver observer calls asynchronously, one worker thread per observer.
+
+        Generation then overlaps with I/O. Each observer has a queue of at
+        most max_queue pending calls; when it is full the generator waits
+        (backpressure). Observers share the frames they receive and must
+        not modify them. Call shutdown_async_dispatch() or close() to drain.
+
+        Args:
+            max_queue: The maximum number of pending calls per observer.
+        """
+        if self._dispatcher:
+            return
+        self._dispatcher = AsyncDispatcher(max_queue)
+        for observer in self._observers:
+            self._dispatcher.add(observer)
+
+    def shutdown_async_dispatch(self, timeout: Optional[float] = None) -> List[DispatchMetrics]:
+        """
+        Drain all observer queues and return to synchronous dispatch.
+
+        Args:
+            timeout: The maximum number of seconds to wait for each observer.
+                Calls an observer has not received by then are counted in
+                its metrics' undelivered and reported.
+
+        Returns:
+            Per-observer timing and queue-depth metrics.
+        """
+        return self._shutdown_dispatcher(timeout, close_observers=False)
+
+    def _shutdown_dispatcher(self, timeout: Optional[float], close_observers: bool) -> List[DispatchMetrics]:
+        if not self._dispatcher:
+            return []
+        dispatcher, self._dispatcher = self._dispatcher, None
+        return dispatcher.shutdown(timeout, close_observers=close_observers)
+
+    def _call_observers(self, method: str, *args):
+        for observer in self._observers:
+            if self._dispatcher:
+                self._dispatcher.dispatch(observer, method, *args)
+            else:
+                getattr(observer, method)(*args)
+
+    def add_stage(self, stage: KeywordStage):
+        """Add a pipeline stage to run between generation and notification."""
+        self._stages.append(stage)
+
+    def remove_stage(self, stage: KeywordStage):
+        """Remove a pipeline stage."""
+        self._stages.remove(stage)
 
     def notify(self, keywords: pd.DataFrame):
         """Notify all observers about newly generated keywords."""
-        for observer in self._observers:
-            observer.update(keywords)
+        self._call_observers('update', keywords)
+
+    def notify_delta(self, delta: KeywordDelta):
+        """Notify all observers about an incremental change to the keywords."""
+        self._call_observers('update_delta', delta)
+
+    def notify_complete(self):
+        """Notify all observers that the current generation run has finished."""
+        self._call_observers('flush')
+
+    def close(self, timeout: Optional[float] = None) -> List[DispatchMetrics]:
+        """
+        Close all observers, flushing and releasing their output files.
+
+        With asynchronous dispatch, this also drains the queues and prints
+        each observer's metrics.
+
+        Args:
+            timeout: With asynchronous dispatch, the maximum number of
+                seconds to wait for each observer to drain and close.
+
+        Returns:
+            Per-observer metrics with asynchronous dispatch, else an empty list.
+        """
+        if self._dispatcher:
+            return self._shutdown_dispatcher(timeout, close_observers=True)
+        self._call_observers('close')
+        return []
+
+    def _emit(self, keywords: pd.DataFrame):
+        """Run the pipeline stages over generated keywords and notify observers."""
+        for stage in self._stages:
+            keywords = stage.process(keywords)
+        # Frames emptied by the stages, e.g. fully deduplicated chunks, are skipped.
+        if len(keywords) or not self._stages:
+            self.notify(keywords)
 
     def set_strategy(self, strategy: KeywordGenerationStrategy):
         """Set the keyword generation strategy."""
         self._strategy = strategy
 
-    def generate_keywords(self):
+    def generate_keywords(self, chunk_size: Optional[int] = None):
         """
         Generate keywords using the current strategy and notify observers.
+
+        Args:
+            chunk_size: If given, stream the keywords to the observers in
+                chunks of at most this many rows instead of one DataFrame.
         """
         if not self._strategy:
             raise ValueError("Keyword generation strategy not set.")
 
-        generated_keywords = self._strategy.generate(self.products, self.modifiers)
-        self.notify(generated_keywords)
+        if chunk_size is None:
+            generated_keywords = self._strategy.generate(self.products, self.modifiers)
+            self._emit(generated_keywords)
+        else:
+            for chunk in self._strategy.generate_chunks(self.products, self.modifiers, chunk_size):
+                self._emit(chunk)
+        self.notify_complete()
+
+    def generate_delta(self, chunk_size: Optional[int] = None):
+        """
+        Generate only the keywords that changed since the strategy's last run.
+
+        The products and modifiers are compared with those of the previous
+        generate_delta() call for the same match type. Keywords involving added
+        items are emitted as additions, keywords involving deleted items as
+        removals, and observers receive KeywordDelta events via update_delta().
+        The first run for a match type emits every keyword as an addition.
+        Additions pass through the pipeline stages' process() and removals
+        through their retract(), so both are normalized alike and keywords
+        that are removed and later added back are emitted again.
+
+        Args:
+            chunk_size: If given, emit deltas of at most this many rows each.
+        """
+        if not self._strategy:
+            raise ValueError("Keyword generation strategy not set.")
+
+        match_type = self._strategy.match_type
+        current = InputSnapshot(self.products, self.modifiers)
+        added_blocks, removed_blocks = self._snapshots.get(match_type).diff(current)
+
+        empty = self._strategy.generate([], [])
+        for products, modifiers in removed_blocks:
+            for removed in self._generate_block(products, modifiers, chunk_size):
+                for stage in self._stages:
+                    removed = stage.retract(removed)
+                if len(removed):
+                    self.notify_delta(KeywordDelta(match_type, empty, removed))
+        for products, modifiers in added_blocks:
+            for added in self._generate_block(products, modifiers, chunk_size):
+                for stage in self._stages:
+                    added = stage.process(added)
+                if len(added):
+                    self.notify_delta(KeywordDelta(match_type, added, empty))
+        self.notify_complete()
+        self._snapshots.put(match_type, current)
+
+    def _generate_block(self, products: List[str], modifiers: List[str], chunk_size: Optional[int]):
+        if chunk_size is None:
+            yield self._strategy.generate(products, modifiers)
+        else:
+            yield from self._strategy.generate_chunks(products, modifiers, chunk_size)
+
+    def generate_template_keywords(self, template: KeywordTemplate, chunk_size: Optional[int] = None):
+        """
+        Generate keywords for an N-slot template using the current strategy.
+
+        Args:
+            template: The KeywordTemplate to expand. The generator's products
+                and modifiers are not used.
+            chunk_size: If given, stream the keywords to the observers in
+                chunks of at most this many rows instead of one DataFrame.
+        """
+        if not self._strategy:
+            raise ValueError("Keyword generation strategy not set.")
+
+        if chunk_size is None:
+            self._emit(self._strategy.from_template(template))
+        else:
+            for chunk in self._strategy.template_chunks(template, chunk_size):
+                self._emit(chunk)
+        self.notify_complete()
+
+    def generate_keywords_parallel(
+        self,
+        strategies: Optional[Sequence[KeywordGenerationStrategy]] = None,
+        shards: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ):
+        """
+        Generate keywords for several strategies in a process pool.
+
+        The product list is split into contiguous shards and every
+        strategy x shard pair is generated in a worker process. Results are
+        delivered to the observers from this process only, strategy by
+        strategy and shard by shard, so observers never see frames from two
+        strategies interleaved. Each strategy's run ends with notify_complete().
+        Within a strategy, keywords are ordered by product shard first.
+
+        At most 2 x max_workers shards are in flight at a time. With
+        chunk_size, shards are made small enough to hold at most chunk_size
+        keywords each (at least one product), so peak memory is bounded by
+        the chunk size as in generate_keywords(chunk_size=...).
+
+        Args:
+            strategies: The strategies to run. Defaults to the current strategy.
+            shards: The number of product shards. Defaults to the worker count.
+            max_workers: The number of worker processes. Defaults to the CPU count.
+            chunk_size: If given, the most keywords a shard may produce.
+        """
+        if strategies is None:
+            if not self._strategy:
+                raise ValueError("Keyword generation strategy not set.")
+            strategies = [self._strategy]
+
+        if not self.products:
+            # No products means no keywords, but every strategy's run still ends.
+            for _ in strategies:
+                self.notify_complete()
+            return
+
+        max_workers = max_workers or os.cpu_count() or 1
+        shards = max(1, min(shards or max_workers, len(self.products)))
+        shard_size = -(-len(self.products) // shards)
+        if chunk_size is not None:
+            shard_size = min(shard_size, max(1, chunk_size // max(1, len(self.modifiers))))
+        product_shards = [
+            self.products[start:start + shard_size]
+            for start in range(0, len(self.products), shard_size)
+        ]
+        # Each task is (strategy, shard, is_last_shard_of_strategy).
+        tasks = iter([
+            (strategy, shard, index == len(product_shards) - 1)
+            for strategy in strategies
+            for index, shard in enumerate(product_shards)
+        ])
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # Keep a bounded window of tasks in flight so finished shards do
+            # not pile up in memory while observers consume earlier ones.
+            pending = deque()
+
+            def submit_next():
+                task = next(tasks, None)
+                if task is not None:
+                    strategy, shard, is_last = task
+                    pending.append((pool.submit(_generate_shard, strategy, shard, self.modifiers), is_last))
+
+            for _ in range(2 * max_workers):
+                submit_next()
+            while pending:
+                future, is_last = pending.popleft()
+                submit_next()
+                self._emit(future.result())
+                if is_last:
+                    self.notify_complete()
+
+
+def _generate_shard(
+    strategy: KeywordGenerationStrategy,
+    products: List[str],
+    modifiers: List[str]
+) -> pd.DataFrame:
+    """Generate one strategy x product shard in a worker process."""
+    return strategy.generate(products, modifiers)
 
 
 class StrategyFactory:
@@ -66,6 +340,8 @@ class StrategyFactory:
     A factory for creating keyword generation strategies.
     """
 
+    strategy_types = ('broad', 'phrase', 'exact')
+
     def create_strategy(self, strategy_type: str) -> KeywordGenerationStrategy:
         """
         Create a keyword generation strategy based on the given type.
@@ -83,3 +359,36 @@ class StrategyFactory:
         if strategy_type == 'exact':
             return ExactMatchStrategy()
         raise ValueError(f"Unknown strategy type: {strategy_type}")
+
+
+class SaverFactory:
+    """
+    A factory for creating keyword savers (observers).
+    """
+
+    saver_types = ('csv', 'parquet', 'arrow', 'console')
+
+    def create_saver(self, saver_type: str, filepath: Optional[str] = None, flush_size: int = 1_000_000) -> KeywordSaver:
+        """
+        Create a keyword saver based on the given type.
+
+        Args:
+            saver_type: The type of saver to create ('csv', 'parquet', 'arrow', 'console').
+            filepath: The output file for file based savers. For 'csv' a '.gz'
+                or '.zst' extension selects compression.
+            flush_size: The number of rows file based savers write per batch.
+
+        Returns:
+            A KeywordSaver instance.
+        """
+        if saver_type == 'console':
+            return ConsoleKeywordSaver()
+        if saver_type not in self.saver_types:
+            raise ValueError(f"Unknown saver type: {saver_type}")
+        if not filepath:
+            raise ValueError(f"The '{saver_type}' saver needs an output file path.")
+        if saver_type == 'csv':
+            return CsvKeywordSaver(filepath, flush_size=flush_size)
+        if saver_type == 'parquet':
+            return ParquetKeywordSaver(filepath, flush_size=flush_size)
+        return ArrowKeywordSaver(filepath, flush_size=flush_size)
@@ -2,12 +2,44 @@
 Keyword Savers (Observers).
 
 This module contains the observer classes that are responsible for saving
-the generated keywords to different destinations (e.g., CSV, console).
+the generated keywords to different destinations (e.g., CSV, Parquet,
+Arrow IPC, console).
 """
 
 from abc import ABC, abstractmethod
-import pandas as pd
+from typing import Optional
+import gzip
 import os
+import time
+import numpy as np
+import pandas as pd
+from .delta import KeywordDelta
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow is needed for the Arrow based writers
+    pa = None
+
+KEYWORD_SCHEMA = pa.schema([('keyword', pa.string()), ('match_type', pa.string())]) if pa else None
+KEYWORD_COLUMNS = ['keyword', 'match_type']
+
+# Buffer size for the underlying file handles.
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def _unused_path(filepath: str) -> str:
+    """
+    The filepath itself if nothing has been written to it yet, otherwise the
+    first free run-indexed name: 'keywords.parquet' -> 'keywords-1.parquet'.
+    """
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return filepath
+    stem, extension = os.path.splitext(filepath)
+    index = 1
+    while os.path.exists(f"{stem}-{index}{extension}"):
+        index += 1
+    return f"{stem}-{index}{extension}"
 
 
 class KeywordSaver(ABC):
@@ -25,38 +57,287 @@ class KeywordSaver(ABC):
         """
         pass
 
+    def update_delta(self, delta: KeywordDelta):
+        """
+        Receive the keywords added and removed by an incremental run.
+
+        The default implementation passes the additions to update(), which
+        suits append-only sinks; savers that can delete keywords should
+        override it to handle delta.removed as well.
+
+        Args:
+            delta: A KeywordDelta with the added and removed keywords.
+        """
+        if len(delta.added):
+            self.update(delta.added)
+
+    def flush(self):
+        """
+        Called once a generation run is complete.
+
+        In streaming mode update() receives one chunk per call; flush()
+        marks the end of the stream. The default implementation does nothing.
+        """
+        pass
+
+    def close(self):
+        """
+        Release any resources held by the saver, such as open file handles.
+
+        The default implementation does nothing.
+        """
+        pass
+
 
-class CsvKeywordSaver(KeywordSaver):
+class BufferedKeywordSaver(KeywordSaver):
     """
-    A keyword saver that saves the keywords to a CSV file.
+    Base class for savers that write keywords to a file in large batches.
+
+    The output file is opened once, on the first write, and kept open across
+    updates and runs until close() is called. Updates are collected until at
+    least flush_size rows are pending and then written as a single batch.
+    Each flush() reports the rows per second achieved by the format's writer.
     """
 
-    def __init__(self, filepath: str):
+    format_name = ''
+    requires_pyarrow = True
+
+    def __init__(self, filepath: str, flush_size: int = 1_000_000):
+        if pa is None and self.requires_pyarrow:
+            raise ImportError(f"{type(self).__name__} requires the 'pyarrow' package.")
         self.filepath = filepath
+        self.flush_size = flush_size
+        self._pending: list = []
+        self._pending_rows = 0
+        self._rows_written = 0
+        self._write_seconds = 0.0
         # Ensure the directory for the output file exists.
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
 
     def update(self, keywords: pd.DataFrame):
         """
-        Save the generated keywords to a CSV file.
+        Buffer the generated keywords and write them once a batch is full.
 
         Args:
             keywords: A pandas DataFrame with the generated keywords.
         """
         try:
-            # Check if the file exists and is not empty to append with header correctly
-            header = not os.path.exists(self.filepath)
-            keywords.to_csv(self.filepath, mode='a', header=header, index=False)
-            print(f"Keywords saved to {self.filepath}")
+            self._pending.append(self._to_batch(keywords))
+            self._pending_rows += len(keywords)
+            if self._pending_rows >= self.flush_size:
+                self._write_pending()
+        except Exception as e:
+            print(f"Error saving keywords to {self.filepath}: {e}")
+
+    def flush(self):
+        """
+        Write any pending keywords and report the writer's throughput.
+        """
+        try:
+            self._write_pending()
         except Exception as e:
             print(f"Error saving keywords to {self.filepath}: {e}")
+            return
+        rate = self._rows_written / self._write_seconds if self._write_seconds else 0.0
+        print(f"{self._rows_written} keywords saved to {self.filepath} "
+              f"({self.format_name}, {rate:,.0f} rows/s)")
+        self._rows_written = 0
+        self._write_seconds = 0.0
+
+    def close(self):
+        """
+        Flush pending keywords and close the output file.
+        """
+        if self._pending:
+            self.flush()
+        self._close()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        batch = self._concat(self._pending)
+        self._pending = []
+        self._pending_rows = 0
+        start = time.perf_counter()
+        self._write_batch(batch)
+        self._write_seconds += time.perf_counter() - start
+        self._rows_written += len(batch)
+
+    def _to_batch(self, keywords: pd.DataFrame):
+        """Convert an update to the batch type the writer consumes, an Arrow table by default."""
+        return pa.Table.from_pandas(keywords, schema=KEYWORD_SCHEMA, preserve_index=False)
+
+    def _concat(self, batches: list):
+        """Combine pending batches into one."""
+        return pa.concat_tables(batches)
+
+    @abstractmethod
+    def _write_batch(self, batch: 'pa.Table'):
+        """Write one batch of keywords, opening the output file if needed."""
+        pass
+
+    @abstractmethod
+    def _close(self):
+        """Close the output file if it is open."""
+        pass
+
+
+class CsvKeywordSaver(BufferedKeywordSaver):
+    """
+    A keyword saver that saves the keywords to a CSV file.
+
+    Keywords are appended through a single buffered handle. Fields are quoted
+    like pandas' to_csv (csv.QUOTE_MINIMAL), only when they contain a quote,
+    a comma or a line break, so appended rows match files written by earlier
+    versions. With pyarrow, each batch is formatted with Arrow compute
+    kernels; without it, pandas formats the batch. The file can be gzip or
+    zstd compressed for direct upload to a bulk importer; by default the
+    compression is inferred from the file extension ('.gz' or '.zst').
+    """
+
+    requires_pyarrow = False
+
+    def __init__(self, filepath: str, compression: Optional[str] = 'infer', flush_size: int = 1_000_000):
+        super().__init__(filepath, flush_size)
+        if compression == 'infer':
+            compression = {'.gz': 'gzip', '.zst': 'zstd'}.get(os.path.splitext(filepath)[1])
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"Unknown CSV compression: {compression}")
+        self.compression = compression
+        self.format_name = f"csv+{compression}" if compression else 'csv'
+        self._handle = None
+        self._header = False
+
+    def _to_batch(self, keywords: pd.DataFrame):
+        if pa is None:
+            return keywords[KEYWORD_COLUMNS]
+        return super()._to_batch(keywords)
+
+    def _concat(self, batches: list):
+        if pa is None:
+            return pd.concat(batches, ignore_index=True)
+        return super()._concat(batches)
+
+    def _open(self):
+        # Only write the header when starting a new file, decided once per handle.
+        self._header = not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0
+        if self.compression == 'gzip':
+            # Appending produces a multi-member gzip file, which readers treat as one stream.
+            self._handle = gzip.open(self.filepath, 'ab', compresslevel=6)
+        elif self.compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compressed CSV output requires the 'zstandard' package.")
+            raw = open(self.filepath, 'ab', buffering=WRITE_BUFFER_SIZE)
+            self._handle = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        else:
+            self._handle = open(self.filepath, 'ab', buffering=WRITE_BUFFER_SIZE)
+
+    def _write_batch(self, batch):
+        if self._handle is None:
+            self._open()
+        if self._header:
+            self._handle.write((','.join(KEYWORD_COLUMNS) + '\n').encode('utf-8'))
+            self._header = False
+        self._handle.write(self._csv_bytes(batch))
+        self._handle.flush()
+
+    @staticmethod
+    def _csv_bytes(batch):
+        """The CSV rows of a batch as a bytes-like object, without a header."""
+        if pa is None:
+            return batch.to_csv(header=False, index=False, lineterminator='\n').encode('utf-8')
+        quote, empty = pa.scalar('"', pa.large_string()), pa.scalar('', pa.large_string())
+        columns = []
+        for column in batch.columns:
+            values = pc.fill_null(pc.cast(column, pa.large_string()), empty)
+            needs_quotes = pc.match_substring_regex(values, '[",\r\n]')
+            quoted = pc.binary_join_element_wise(quote, pc.replace_substring(values, '"', '""'), quote, empty)
+            columns.append(pc.if_else(needs_quotes, quoted, values))
+        # One string per row, ending in a newline, so the CSV text is the
+        # contiguous value buffer of the array and is written without a copy.
+        row = pc.binary_join_element_wise(*columns, pa.scalar(',', pa.large_string()))
+        rows = pc.binary_join_element_wise(row, pa.scalar('\n', pa.large_string()), empty)
+        if isinstance(rows, pa.ChunkedArray):
+            rows = rows.combine_chunks()
+        _, offsets, data = rows.buffers()
+        first, last = np.frombuffer(offsets, dtype=np.int64)[[rows.offset, rows.offset + len(rows)]]
+        return memoryview(data[first:last]) if len(rows) else b''
+
+    def _close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class ParquetKeywordSaver(BufferedKeywordSaver):
+    """
+    A keyword saver that saves the keywords to a Parquet file.
+
+    Every written batch becomes one row group. Parquet files cannot be
+    appended to, so a saver whose file already holds an earlier run's output
+    writes to the next free run-indexed name instead ('keywords-1.parquet',
+    'keywords-2.parquet', ...); filepath is updated to the file written.
+    """
+
+    format_name = 'parquet'
+
+    def __init__(self, filepath: str, compression: str = 'zstd', flush_size: int = 1_000_000):
+        super().__init__(filepath, flush_size)
+        self.compression = compression
+        self._writer = None
+
+    def _write_batch(self, batch: 'pa.Table'):
+        if self._writer is None:
+            import pyarrow.parquet as pq
+            self.filepath = _unused_path(self.filepath)
+            self._writer = pq.ParquetWriter(self.filepath, KEYWORD_SCHEMA, compression=self.compression)
+        self._writer.write_table(batch)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ArrowKeywordSaver(BufferedKeywordSaver):
+    """
+    A keyword saver that saves the keywords to an Arrow IPC (Feather v2) file.
+
+    Like Parquet, Arrow IPC files cannot be appended to, so earlier output is
+    kept and a new run-indexed file is written instead (see ParquetKeywordSaver).
+    """
+
+    format_name = 'arrow'
+
+    def __init__(self, filepath: str, flush_size: int = 1_000_000):
+        super().__init__(filepath, flush_size)
+        self._writer = None
+
+    def _write_batch(self, batch: 'pa.Table'):
+        if self._writer is None:
+            import pyarrow.ipc as ipc
+            self.filepath = _unused_path(self.filepath)
+            self._writer = ipc.new_file(self.filepath, KEYWORD_SCHEMA)
+        self._writer.write_table(batch)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
 
 
 class ConsoleKeywordSaver(KeywordSaver):
     """
     A keyword saver that prints the keywords to the console.
+
+    Streamed chunks are printed as they arrive, under a single heading per run.
     """
 
+    def __init__(self):
+        self._in_run = False
+
     def update(self, keywords: pd.DataFrame):
         """
         Print the generated keywords to the console.
@@ -64,5 +345,26 @@ class ConsoleKeywordSaver(KeywordSaver):
         Args:
             keywords: A pandas DataFrame with the generated keywords.
         """
-        print("--- New Keywords Generated ---")
-        print(keywords.to_string(index=False))
+        if not self._in_run:
+            print("--- New Keywords Generated ---")
+        print(keywords.to_string(index=False, header=not self._in_run))
+        self._in_run = True
+
+    def update_delta(self, delta: KeywordDelta):
+        """
+        Print the keywords added and removed by an incremental run.
+
+        Args:
+            delta: A KeywordDelta with the added and removed keywords.
+        """
+        if len(delta.added):
+            self.update(delta.added)
+        if len(delta.removed):
+            print("--- Keywords Removed ---")
+            print(delta.removed.to_string(index=False))
+
+    def flush(self):
+        """
+        End the current run so the next update prints a new heading.
+        """
+        self._in_run = False
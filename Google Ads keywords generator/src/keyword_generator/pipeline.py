@@ -0,0 +1,462 @@
+"""
+Keyword Processing Pipeline.
+
+This module contains the stages that run between a strategy generating
+keywords and the generator notifying its observers, including:
+- KeywordStage: The abstract base class for a pipeline stage.
+- FingerprintSet: A compact open-addressing set of 64-bit fingerprints.
+- NegativeKeywordMatcher: An Aho-Corasick automaton over keyword tokens.
+- KeywordCleaningStage: Normalizes, filters and deduplicates keywords.
+
+All stages work on whole chunks with NumPy and Arrow kernels, so their cost
+is linear in the number of keywords and independent of Python object counts.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow is needed for the cleaning stage
+    pa = None
+
+# Keywords are processed as large_string so a chunk may exceed 2 GB of text.
+SPACE = pa.scalar(' ', pa.large_string()) if pa else None
+EMPTY = pa.scalar('', pa.large_string()) if pa else None
+
+# The match type syntax around a keyword: '"buy camera"' (phrase) or '[buy camera]' (exact).
+MATCH_TYPE_WRAPPERS = (('"', '"'), ('[', ']'))
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """The splitmix64 finalizer, applied element-wise to a uint64 array."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class KeywordStage(ABC):
+    """
+    Abstract base class for a keyword pipeline stage.
+    """
+
+    @abstractmethod
+    def process(self, keywords: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform a frame of generated keywords before observers see it.
+
+        Args:
+            keywords: A pandas DataFrame with the generated keywords.
+
+        Returns:
+            A pandas DataFrame with the processed keywords.
+        """
+        pass
+
+    def retract(self, keywords: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform keywords that an incremental run removes, so they match the
+        keywords process() emitted when they were added, and forget them.
+
+        The default implementation returns the keywords unchanged.
+
+        Args:
+            keywords: A pandas DataFrame with the removed keywords.
+
+        Returns:
+            A pandas DataFrame with the removed keywords as observers saw them.
+        """
+        return keywords
+
+    def reset(self):
+        """
+        Forget any state kept across calls. The default implementation does nothing.
+        """
+        pass
+
+
+class FingerprintSet:
+    """
+    A set of 64-bit fingerprints stored in a NumPy open-addressing hash table.
+
+    Each member costs 8 bytes (16 at the maximum load factor of one half),
+    compared with roughly 60-100 bytes for a Python str in a set. Insertion
+    is vectorized: every round probes all pending keys at once and resolves
+    collisions with linear probing, so a batch of n keys costs O(n).
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self._slots = np.zeros(1 << max(4, (capacity - 1).bit_length()), dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the hash table in bytes."""
+        return self._slots.nbytes
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Add a batch of fingerprints to the set.
+
+        Args:
+            fingerprints: A uint64 array of fingerprints.
+
+        Returns:
+            A boolean mask that is True for the first occurrence of every
+            fingerprint that was not already in the set.
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        # Zero marks an empty slot, so it is folded onto one.
+        fingerprints = np.where(fingerprints == 0, np.uint64(1), fingerprints)
+        candidates = np.flatnonzero(~pd.Series(fingerprints).duplicated().to_numpy())
+        self._reserve(self._size + len(candidates))
+        inserted = self._insert(fingerprints[candidates])
+        is_new = np.zeros(len(fingerprints), dtype=bool)
+        is_new[candidates[inserted]] = True
+        return is_new
+
+    def discard(self, fingerprints: np.ndarray) -> int:
+        """
+        Remove a batch of fingerprints from the set.
+
+        Linear probing cannot leave holes in a probe sequence, so the
+        remaining members are reinserted, which costs O(capacity).
+
+        Args:
+            fingerprints: A uint64 array of fingerprints.
+
+        Returns:
+            The number of fingerprints that were removed.
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        fingerprints = np.where(fingerprints == 0, np.uint64(1), fingerprints)
+        members = self._slots[self._slots != 0]
+        remaining = members[~np.isin(members, fingerprints)]
+        if len(remaining) == len(members):
+            return 0
+        self.clear()
+        self._insert(remaining)
+        return len(members) - len(remaining)
+
+    def clear(self):
+        """Remove all fingerprints from the set."""
+        self._slots[:] = 0
+        self._size = 0
+
+    def _reserve(self, size: int):
+        if size * 2 <= len(self._slots):
+            return
+        members = self._slots[self._slots != 0]
+        capacity = len(self._slots)
+        while size * 2 > capacity:
+            capacity *= 2
+        self._slots = np.zeros(capacity, dtype=np.uint64)
+        self._size = 0
+        self._insert(members)
+
+    def _insert(self, keys: np.ndarray) -> np.ndarray:
+        # keys must be unique within the batch.
+        slots = self._slots
+        mask = np.uint64(len(slots) - 1)
+        positions = (keys & mask).astype(np.int64)
+        inserted = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys))
+        while pending.size:
+            probe = positions[pending]
+            wanted = keys[pending]
+            current = slots[probe]
+            found = current == wanted
+            empty = current == 0
+            # Several keys may race for one empty slot; the last write wins
+            # and the others move on to the next slot.
+            slots[probe[empty]] = wanted[empty]
+            won = empty & (slots[probe] == wanted)
+            inserted[pending[won]] = True
+            self._size += int(won.sum())
+            pending = pending[~(found | won)]
+            positions[pending] = (positions[pending] + 1) & (len(slots) - 1)
+        return inserted
+
+
+class NegativeKeywordMatcher:
+    """
+    Matches keywords against a list of negative keywords.
+
+    The negative keywords are compiled into an Aho-Corasick automaton over
+    word tokens: a trie whose edges are kept as one sorted array of packed
+    (state, symbol) keys, plus failure links. A batch of keywords is run
+    through the automaton one token position at a time for all keywords at
+    once, each step looking up every keyword's edge with np.searchsorted
+    and following failure links only for the keywords that have no edge.
+    Compiling costs O(total negative keyword words) and matching amortized
+    O(total tokens) lookups, regardless of how many negative keywords there
+    are. A keyword matches if it contains all words of a negative keyword,
+    contiguously and in order (phrase match negatives).
+    """
+
+    def __init__(self, negative_keywords: Iterable[str]):
+        # Symbol 0 stands for every word that appears in no negative keyword.
+        self.vocabulary: Dict[str, int] = {}
+        patterns = []
+        for negative_keyword in negative_keywords:
+            words = negative_keyword.lower().split()
+            if words:
+                patterns.append([self.vocabulary.setdefault(word, len(self.vocabulary) + 1) for word in words])
+        self._alphabet_size = len(self.vocabulary) + 1
+        self._edge_keys, self._edge_targets, self._failure, self._accepting = self._compile(
+            patterns, self._alphabet_size)
+
+    def __len__(self) -> int:
+        return int(self._accepting.sum())
+
+    @staticmethod
+    def _compile(patterns: List[List[int]], alphabet_size: int):
+        goto: List[Dict[int, int]] = [{}]
+        accepting = [False]
+        for pattern in patterns:
+            state = 0
+            for symbol in pattern:
+                if symbol not in goto[state]:
+                    goto[state][symbol] = len(goto)
+                    goto.append({})
+                    accepting.append(False)
+                state = goto[state][symbol]
+            accepting[state] = True
+
+        # Breadth-first construction of failure links; a state also accepts
+        # if the longest proper suffix it fails to accepts.
+        failure = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            accepting[state] = accepting[state] or accepting[failure[state]]
+            for symbol, target in goto[state].items():
+                fallback = failure[state]
+                while fallback and symbol not in goto[fallback]:
+                    fallback = failure[fallback]
+                failure[target] = goto[fallback].get(symbol, 0) if state else 0
+                queue.append(target)
+
+        edges = [(state * alphabet_size + symbol, target)
+                 for state, children in enumerate(goto) for symbol, target in children.items()]
+        edges.sort()
+        edge_keys = np.array([key for key, _ in edges], dtype=np.int64)
+        edge_targets = np.array([target for _, target in edges], dtype=np.int32)
+        return edge_keys, edge_targets, np.array(failure, dtype=np.int32), np.array(accepting, dtype=bool)
+
+    def _step(self, states: np.ndarray, symbols: np.ndarray) -> np.ndarray:
+        """The next state of every keyword after reading one symbol each."""
+        next_states = np.zeros(len(states), dtype=np.int32)
+        # Symbol 0 has no edges anywhere, so it always leads back to the root.
+        pending = np.flatnonzero(symbols != 0)
+        current = states[pending]
+        symbols = symbols[pending].astype(np.int64)
+        while pending.size:
+            keys = current.astype(np.int64) * self._alphabet_size + symbols
+            positions = np.minimum(np.searchsorted(self._edge_keys, keys), len(self._edge_keys) - 1)
+            found = self._edge_keys[positions] == keys
+            next_states[pending[found]] = self._edge_targets[positions[found]]
+            # Without an edge, retry from the failure state; the root without
+            # an edge stays at the root.
+            retry = ~found & (current != 0)
+            pending, current, symbols = pending[retry], self._failure[current[retry]], symbols[retry]
+        return next_states
+
+    def symbols(self, words: Sequence[str]) -> np.ndarray:
+        """Map words to the automaton's symbols (0 for unknown words)."""
+        return np.array([self.vocabulary.get(word, 0) for word in words], dtype=np.int32)
+
+    def match_tokens(self, symbols: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Run tokenized keywords through the automaton.
+
+        Args:
+            symbols: The flattened token symbols of all keywords.
+            lengths: The number of tokens of each keyword.
+
+        Returns:
+            A boolean mask that is True for keywords containing a negative keyword.
+        """
+        count = len(lengths)
+        if count == 0 or len(symbols) == 0 or not self._accepting.any():
+            return np.zeros(count, dtype=bool)
+        starts = np.cumsum(lengths) - lengths
+        rows = np.repeat(np.arange(count), lengths)
+        positions = np.arange(len(symbols)) - np.repeat(starts, lengths)
+        # Padding with symbol 0 returns the automaton to the root, so it never
+        # produces a match on its own.
+        grid = np.zeros((count, int(lengths.max())), dtype=np.int32)
+        grid[rows, positions] = symbols
+        states = np.zeros(count, dtype=np.int32)
+        matched = np.zeros(count, dtype=bool)
+        for column in grid.T:
+            states = self._step(states, column)
+            matched |= self._accepting[states]
+        return matched
+
+    def matches(self, keyword: str) -> bool:
+        """Check a single keyword against the negative keywords."""
+        words = keyword.lower().split()
+        return bool(self.match_tokens(self.symbols(words), np.array([len(words)]))[0])
+
+
+class KeywordCleaningStage(KeywordStage):
+    """
+    Normalizes, filters and deduplicates generated keywords.
+
+    Keywords are lower-cased and their whitespace collapsed, keeping the
+    match type syntax ('"..."' or '[...]'). Keywords that contain a negative
+    keyword are dropped. The rest are deduplicated across every call by
+    64-bit fingerprints of their words and match type. For the match types
+    in order_insensitive_match_types (broad match by default) the
+    fingerprint ignores word order, so "cheap camera buy" and
+    "buy cheap camera" count as the same keyword.
+    """
+
+    def __init__(
+        self,
+        negative_keywords: Iterable[str] = (),
+        deduplicate: bool = True,
+        order_insensitive_match_types: Sequence[str] = ('Broad',),
+        capacity: int = 1 << 16
+    ):
+        if pa is None:
+            raise ImportError(f"{type(self).__name__} requires the 'pyarrow' package.")
+        self.matcher = NegativeKeywordMatcher(negative_keywords)
+        self.deduplicate = deduplicate
+        self.order_insensitive_match_types = set(order_insensitive_match_types)
+        self.seen = FingerprintSet(capacity)
+        self.filtered_count = 0
+        self.duplicate_count = 0
+
+    def reset(self):
+        """Forget all keywords seen so far."""
+        self.seen.clear()
+        self.filtered_count = 0
+        self.duplicate_count = 0
+
+    def process(self, keywords: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalize, filter and deduplicate a frame of keywords.
+
+        Args:
+            keywords: A pandas DataFrame with 'keyword' and 'match_type' columns.
+
+        Returns:
+            A pandas DataFrame with the surviving, normalized keywords.
+        """
+        if len(keywords) == 0:
+            return keywords
+
+        parts = self._split(keywords)
+        keep = ~self._negative(parts)
+        self.filtered_count += int((~keep).sum())
+
+        if self.deduplicate:
+            fingerprints = self._fingerprints(keywords['match_type'], *parts[1:])
+            is_new = np.zeros(len(keywords), dtype=bool)
+            is_new[keep] = self.seen.add(fingerprints[keep])
+            self.duplicate_count += int(keep.sum() - is_new.sum())
+            keep = is_new
+        return self._normalized(keywords, parts, keep)
+
+    def retract(self, keywords: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalize keywords removed by an incremental run and forget them, so
+        they are emitted again if they are added back later.
+
+        Args:
+            keywords: A pandas DataFrame with 'keyword' and 'match_type' columns.
+
+        Returns:
+            A pandas DataFrame with the normalized removed keywords, without
+            those containing a negative keyword (they were never emitted).
+        """
+        if len(keywords) == 0:
+            return keywords
+
+        parts = self._split(keywords)
+        keep = ~self._negative(parts)
+        if self.deduplicate:
+            fingerprints = self._fingerprints(keywords['match_type'], *parts[1:])
+            self.seen.discard(fingerprints[keep])
+        return self._normalized(keywords, parts, keep)
+
+    def _split(self, keywords: pd.DataFrame):
+        """The match type marks, tokens, token counts, distinct words and token codes of keywords."""
+        keyword_array = pa.array(keywords['keyword'], type=pa.large_string())
+        if isinstance(keyword_array, pa.ChunkedArray):
+            keyword_array = keyword_array.combine_chunks()
+        # Split '"buy camera"' into ('"', 'buy camera', '"') without a regex.
+        # Exactly one matching pair is removed, so '"[buy x]"' keeps its brackets.
+        first = pc.utf8_slice_codeunits(keyword_array, 0, 1)
+        last = pc.utf8_slice_codeunits(keyword_array, -1)
+        long_enough = pc.greater_equal(pc.utf8_length(keyword_array), 2)
+        wrapped = pa.array(np.zeros(len(keyword_array), dtype=bool))
+        for opening_mark, closing_mark in MATCH_TYPE_WRAPPERS:
+            pair = pc.and_(pc.equal(first, opening_mark), pc.equal(last, closing_mark))
+            wrapped = pc.or_(wrapped, pc.and_(pair, long_enough))
+        opening = pc.if_else(wrapped, first, EMPTY)
+        closing = pc.if_else(wrapped, last, EMPTY)
+        core = pc.if_else(wrapped, pc.utf8_slice_codeunits(keyword_array, 1, -1), keyword_array)
+        # Arrow yields empty tokens for leading and trailing whitespace, so trim first.
+        tokens = pc.utf8_split_whitespace(pc.utf8_trim_whitespace(pc.utf8_lower(core)))
+        lengths = pc.list_value_length(tokens).to_numpy(zero_copy_only=False).astype(np.int64)
+        encoded = pc.dictionary_encode(pc.list_flatten(tokens))
+        words = encoded.dictionary.to_pylist()
+        codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+        return (opening, closing, tokens), words, codes, lengths
+
+    def _negative(self, parts) -> np.ndarray:
+        """Whether each split keyword contains a negative keyword."""
+        _, words, codes, lengths = parts
+        if not len(self.matcher):
+            return np.zeros(len(lengths), dtype=bool)
+        return self.matcher.match_tokens(self.matcher.symbols(words)[codes], lengths)
+
+    @staticmethod
+    def _normalized(keywords: pd.DataFrame, parts, keep: np.ndarray) -> pd.DataFrame:
+        """The normalized keywords of the rows in keep."""
+        (opening, closing, tokens), _, _, _ = parts
+        normalized = pc.binary_join_element_wise(opening, pc.binary_join(tokens, SPACE), closing, EMPTY)
+        result = pd.DataFrame({
+            'keyword': pd.arrays.ArrowStringArray(normalized.filter(pa.array(keep))),
+            'match_type': keywords['match_type'].to_numpy()[keep],
+        })
+        if isinstance(keywords['match_type'].dtype, pd.CategoricalDtype):
+            result['match_type'] = result['match_type'].astype(keywords['match_type'].dtype)
+        return result
+
+    def _fingerprints(
+        self,
+        match_types: pd.Series,
+        words: List[str],
+        codes: np.ndarray,
+        lengths: np.ndarray
+    ) -> np.ndarray:
+        # Only the distinct words are hashed; every token then reuses its word's hash.
+        token_hashes = pd.util.hash_array(np.array(words, dtype=object))[codes]
+        starts = np.cumsum(lengths) - lengths
+        positions = (np.arange(len(codes)) - np.repeat(starts, lengths)).astype(np.uint64)
+
+        ordered = self._sum_per_keyword(_mix64(token_hashes ^ _mix64(positions)), starts, lengths)
+        unordered = self._sum_per_keyword(_mix64(token_hashes), starts, lengths)
+        order_insensitive = match_types.isin(self.order_insensitive_match_types).to_numpy()
+        fingerprints = np.where(order_insensitive, unordered, ordered)
+        return _mix64(fingerprints + pd.util.hash_pandas_object(match_types, index=False).to_numpy())
+
+    @staticmethod
+    def _sum_per_keyword(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        sums = np.zeros(len(lengths), dtype=np.uint64)
+        non_empty = lengths > 0
+        if values.size:
+            sums[non_empty] = np.add.reduceat(values, starts[non_empty])
+        return sums
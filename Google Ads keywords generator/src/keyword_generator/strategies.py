@@ -3,6 +3,7 @@ Keyword Generation Strategies.
 
 This module contains the abstract base class for strategies and the
 concrete implementations, including:
+- KeywordCrossProduct: The shared modifier x product template.
 - KeywordGenerationStrategy: The abstract base class.
 - BroadMatchStrategy: For generating broad match keywords.
 - PhraseMatchStrategy: For generating phrase match keywords.
@@ -10,17 +11,90 @@ concrete implementations, including:
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
 import pandas as pd
-from itertools import product
+
+from .templates import KeywordTemplate
+
+# The template behind the classic modifier x product keywords.
+CROSS_PRODUCT_TEMPLATE = '{modifier} {product}'
+
+
+class KeywordCrossProduct(KeywordTemplate):
+    """
+    The modifier x product cross product as a two-slot KeywordTemplate.
+
+    The combined "modifier product" strings are built once with vectorized
+    string operations and can then be decorated by every match type, so
+    generating broad, phrase and exact keywords costs a single expansion
+    instead of three. Rows are ordered modifier-major, matching
+    itertools.product(modifiers, products).
+    """
+
+    def __init__(self, products: Sequence[str], modifiers: Sequence[str]):
+        super().__init__(CROSS_PRODUCT_TEMPLATE, {'modifier': modifiers, 'product': products})
 
 
 class KeywordGenerationStrategy(ABC):
     """
     Abstract base class for a keyword generation strategy.
+
+    Concrete strategies only decide how a plain keyword is decorated for
+    their match type. The keywords themselves come from a KeywordTemplate,
+    so every match type works with any template, not only modifier x product.
     """
 
+    match_type: str = ''
+
     @abstractmethod
+    def decorate(self, keywords: pd.Series) -> pd.Series:
+        """
+        Decorate plain keywords with the match type's syntax.
+
+        Args:
+            keywords: A pandas string Series of plain keywords.
+
+        Returns:
+            A pandas string Series with the decorated keywords.
+        """
+        pass
+
+    def from_template(self, template: KeywordTemplate) -> pd.DataFrame:
+        """
+        Generate keywords for every combination of a template.
+
+        Args:
+            template: The KeywordTemplate to expand. Its expansion is cached,
+                so several strategies can share it.
+
+        Returns:
+            A pandas DataFrame with the generated keywords.
+        """
+        return self._to_frame(self.decorate(template.keywords))
+
+    def template_chunks(
+        self,
+        template: KeywordTemplate,
+        chunk_size: int,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily generate the keywords of a template index range in fixed-size chunks.
+
+        Args:
+            template: The KeywordTemplate to expand.
+            chunk_size: The maximum number of keywords per chunk.
+            start: The first keyword index (inclusive).
+            stop: The last keyword index (exclusive). Defaults to all keywords.
+
+        Yields:
+            pandas DataFrames with at most chunk_size generated keywords each.
+        """
+        for keywords in template.iter_chunks(chunk_size, start, stop):
+            yield self._to_frame(self.decorate(keywords))
+
     def generate(self, products: List[str], modifiers: List[str]) -> pd.DataFrame:
         """
         Generate keywords based on a given strategy.
@@ -32,7 +106,36 @@ class KeywordGenerationStrategy(ABC):
         Returns:
             A pandas DataFrame with the generated keywords.
         """
-        pass
+        return self.from_template(KeywordCrossProduct(products, modifiers))
+
+    def generate_chunks(
+        self,
+        products: List[str],
+        modifiers: List[str],
+        chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily generate keywords in fixed-size chunks.
+
+        Only one chunk is materialized at a time, so peak memory is
+        proportional to chunk_size rather than to the full cross product.
+
+        Args:
+            products: A list of product keywords.
+            modifiers: A list of modifier keywords.
+            chunk_size: The maximum number of keywords per chunk.
+
+        Yields:
+            pandas DataFrames with at most chunk_size generated keywords each.
+        """
+        return self.template_chunks(KeywordCrossProduct(products, modifiers), chunk_size)
+
+    def _to_frame(self, keywords: pd.Series) -> pd.DataFrame:
+        # A single-category column costs one byte per row instead of one object pointer.
+        match_type = pd.Categorical.from_codes(
+            np.zeros(len(keywords), dtype=np.int8), categories=[self.match_type]
+        )
+        return pd.DataFrame({'keyword': keywords.reset_index(drop=True), 'match_type': match_type})
 
 
 class BroadMatchStrategy(KeywordGenerationStrategy):
@@ -40,19 +143,19 @@ class BroadMatchStrategy(KeywordGenerationStrategy):
     A strategy for generating broad match keywords.
     """
 
-    def generate(self, products: List[str], modifiers: List[str]) -> pd.DataFrame:
+    match_type = 'Broad'
+
+    def decorate(self, keywords: pd.Series) -> pd.Series:
         """
-        Generate broad match keywords by combining products and modifiers.
+        Broad match keywords are the plain keywords.
 
         Args:
-            products: A list of product keywords.
-            modifiers: A list of modifier keywords.
+            keywords: A pandas string Series of plain keywords.
 
         Returns:
-            A pandas DataFrame with the generated broad match keywords.
+            The keywords unchanged.
         """
-        keywords = [f"{mod} {prod}" for mod, prod in product(modifiers, products)]
-        return pd.DataFrame({'keyword': keywords, 'match_type': 'Broad'})
+        return keywords
 
 
 class PhraseMatchStrategy(KeywordGenerationStrategy):
@@ -60,19 +163,19 @@ class PhraseMatchStrategy(KeywordGenerationStrategy):
     A strategy for generating phrase match keywords.
     """
 
-    def generate(self, products: List[str], modifiers: List[str]) -> pd.DataFrame:
+    match_type = 'Phrase'
+
+    def decorate(self, keywords: pd.Series) -> pd.Series:
         """
-        Generate phrase match keywords by combining products and modifiers.
+        Wrap keywords in quotes for phrase match.
 
         Args:
-            products: A list of product keywords.
-            modifiers: A list of modifier keywords.
+            keywords: A pandas string Series of plain keywords.
 
         Returns:
-            A pandas DataFrame with the generated phrase match keywords.
+            A pandas string Series with the phrase match keywords.
         """
-        keywords = [f'"{mod} {prod}"' for mod, prod in product(modifiers, products)]
-        return pd.DataFrame({'keyword': keywords, 'match_type': 'Phrase'})
+        return '"' + keywords + '"'
 
 
 class ExactMatchStrategy(KeywordGenerationStrategy):
@@ -80,16 +183,39 @@ class ExactMatchStrategy(KeywordGenerationStrategy):
     A strategy for generating exact match keywords.
     """
 
-    def generate(self, products: List[str], modifiers: List[str]) -> pd.DataFrame:
+    match_type = 'Exact'
+
+    def decorate(self, keywords: pd.Series) -> pd.Series:
         """
-        Generate exact match keywords by combining products and modifiers.
+        Wrap keywords in square brackets for exact match.
 
         Args:
-            products: A list of product keywords.
-            modifiers: A list of modifier keywords.
+            keywords: A pandas string Series of plain keywords.
 
         Returns:
-            A pandas DataFrame with the generated exact match keywords.
+            A pandas string Series with the exact match keywords.
         """
-        keywords = [f'[{mod} {prod}]' for mod, prod in product(modifiers, products)]
-        return pd.DataFrame({'keyword': keywords, 'match_type': 'Exact'})
+        return '[' + keywords + ']'
+
+
+def generate_all(
+    products: List[str],
+    modifiers: List[str],
+    strategies: Sequence[KeywordGenerationStrategy]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Generate keywords for several strategies from one shared cross product.
+
+    Args:
+        products: A list of product keywords.
+        modifiers: A list of modifier keywords.
+        strategies: The strategies to generate keywords for.
+
+    Returns:
+        A dict mapping each strategy's match type to its keywords DataFrame.
+    """
+    cross_product = KeywordCrossProduct(products, modifiers)
+    return {
+        strategy.match_type: strategy.from_template(cross_product)
+        for strategy in strategies
+    }
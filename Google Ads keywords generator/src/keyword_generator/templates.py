@@ -0,0 +1,231 @@
+"""
+Keyword Templates.
+
+This module contains the template expansion engine used by the keyword
+generation strategies, including:
+- TemplateSlot: The values of one template slot and their constraints.
+- KeywordTemplate: A combinatorial template such as
+  "{modifier} {brand} {product} {location}".
+
+A template's combinations are numbered in mixed radix, the first slot being
+the most significant digit. This gives the exact number of keywords up front
+and lets any keyword, or any contiguous range of keywords, be built directly
+from its index, so workers can take disjoint ranges without coordination.
+"""
+
+from string import Formatter
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+import re
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:  # pragma: no cover - pyarrow is an optional speed-up
+    STRING_DTYPE = 'string'
+
+
+class TemplateSlot:
+    """
+    The values that can fill one slot of a keyword template.
+
+    Constraints are applied to the values once, when the slot is created, so
+    the number of combinations stays exact and index-addressable.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[str],
+        optional: bool = False,
+        exclude: Iterable[str] = (),
+        pattern: Optional[str] = None,
+        min_length: int = 0,
+        max_length: Optional[int] = None
+    ):
+        """
+        Args:
+            values: The candidate values for the slot.
+            optional: If True, the slot may also be left empty.
+            exclude: Values to leave out.
+            pattern: A regular expression every value must fully match.
+            min_length: The minimum number of characters of a value.
+            max_length: The maximum number of characters of a value.
+        """
+        excluded = set(exclude)
+        compiled = re.compile(pattern) if pattern else None
+        kept = [
+            value for value in values
+            if value not in excluded
+            and len(value) >= min_length
+            and (max_length is None or len(value) <= max_length)
+            and (compiled is None or compiled.fullmatch(value))
+        ]
+        self.optional = optional
+        # The empty value comes first, so keywords without the slot come first.
+        self.values = ([''] if optional else []) + kept
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class KeywordTemplate:
+    """
+    A combinatorial keyword template with N named slots.
+
+    Example:
+        KeywordTemplate("{modifier} {brand} {product}", {
+            'modifier': ['buy', 'cheap'],
+            'brand': TemplateSlot(['canon', 'nikon'], optional=True),
+            'product': ['camera'],
+        })
+
+    A slot used more than once in the template takes the same value in every
+    position. Whitespace left by empty optional slots is collapsed.
+    """
+
+    def __init__(self, template: str, slots: Mapping[str, Union[Sequence[str], TemplateSlot]]):
+        self.template = template
+        self._literals: List[str] = []
+        self._fields: List[str] = []
+        # _literals[i] precedes _fields[i]; the last literal follows the last field.
+        literal_text = ''
+        for literal, field, format_spec, conversion in Formatter().parse(template):
+            literal_text += literal
+            if field is not None:
+                if format_spec or conversion:
+                    raise ValueError(f"Template fields do not support format specs: {{{field}}}")
+                if field not in slots:
+                    raise ValueError(f"No values given for template slot '{field}'")
+                self._literals.append(literal_text)
+                self._fields.append(field)
+                literal_text = ''
+        self._literals.append(literal_text)
+
+        self.slot_names: List[str] = list(dict.fromkeys(self._fields))
+        self.slots: Dict[str, TemplateSlot] = {
+            name: slots[name] if isinstance(slots[name], TemplateSlot) else TemplateSlot(slots[name])
+            for name in self.slot_names
+        }
+        self._values = {name: pd.array(slot.values, dtype=STRING_DTYPE) for name, slot in self.slots.items()}
+        self._radices = np.array([len(self.slots[name]) for name in self.slot_names], dtype=np.int64)
+        self._has_optional = any(slot.optional for slot in self.slots.values())
+        self._keywords: Optional[pd.Series] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def count(self) -> int:
+        """The exact number of keywords the template expands to."""
+        count = 1
+        for radix in self._radices:
+            count *= int(radix)
+        return count
+
+    @property
+    def keywords(self) -> pd.Series:
+        """All keywords of the template, built on first access."""
+        if self._keywords is None:
+            self._keywords = self.slice(0, self.count)
+        return self._keywords
+
+    def combination_at(self, index: int) -> Dict[str, str]:
+        """
+        Get the slot values of the keyword at the given index.
+
+        Args:
+            index: The keyword index, from 0 to count - 1.
+
+        Returns:
+            A dict mapping slot names to values.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(f"Keyword index {index} out of range for {self.count} keywords")
+        combination = {}
+        for name, radix in zip(reversed(self.slot_names), reversed(self._radices.tolist())):
+            index, digit = divmod(index, radix)
+            combination[name] = self.slots[name].values[digit]
+        return {name: combination[name] for name in self.slot_names}
+
+    def keyword_at(self, index: int) -> str:
+        """
+        Build the keyword at the given index.
+
+        Args:
+            index: The keyword index, from 0 to count - 1.
+
+        Returns:
+            The keyword.
+        """
+        combination = self.combination_at(index)
+        pieces = []
+        for literal, field in zip(self._literals, self._fields):
+            pieces += [literal, combination[field]]
+        keyword = ''.join(pieces) + self._literals[-1]
+        return ' '.join(keyword.split()) if self._has_optional else keyword
+
+    def slice(self, start: int, stop: int) -> pd.Series:
+        """
+        Build the keywords for the index range [start, stop) with vectorized string operations.
+
+        Args:
+            start: The first keyword index (inclusive).
+            stop: The last keyword index (exclusive).
+
+        Returns:
+            A pandas string Series with the keywords.
+        """
+        rows = np.arange(max(start, 0), min(stop, self.count), dtype=np.int64)
+        digits = {}
+        for name, radix in zip(reversed(self.slot_names), reversed(self._radices.tolist())):
+            rows, digits[name] = np.divmod(rows, radix)
+
+        keywords = None
+        for literal, field in zip(self._literals, self._fields):
+            values = pd.Series(self._values[field].take(digits[field]))
+            piece = literal + values if literal else values
+            keywords = piece if keywords is None else keywords + piece
+        if keywords is None:
+            # A template without slots expands to itself.
+            return pd.Series(pd.array([self._literals[0]] * len(rows), dtype=STRING_DTYPE))
+        if self._literals[-1]:
+            keywords = keywords + self._literals[-1]
+        if self._has_optional:
+            keywords = keywords.str.replace(r'\s+', ' ', regex=True).str.strip()
+        return keywords
+
+    def iter_chunks(self, chunk_size: int, start: int = 0, stop: Optional[int] = None) -> Iterator[pd.Series]:
+        """
+        Lazily build the keywords of an index range in fixed-size chunks.
+
+        Args:
+            chunk_size: The maximum number of keywords per chunk.
+            start: The first keyword index (inclusive).
+            stop: The last keyword index (exclusive). Defaults to count.
+
+        Yields:
+            pandas string Series with at most chunk_size keywords each.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        stop = self.count if stop is None else min(stop, self.count)
+        for chunk_start in range(start, stop, chunk_size):
+            yield self.slice(chunk_start, min(chunk_start + chunk_size, stop))
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.iter_chunks(100_000):
+            yield from chunk
+
+    def partition(self, parts: int) -> List[range]:
+        """
+        Split the template's index space into contiguous, disjoint ranges.
+
+        Args:
+            parts: The number of ranges.
+
+        Returns:
+            A list of at most `parts` non-empty ranges covering all keywords.
+        """
+        size = -(-self.count // max(1, parts))
+        return [range(start, min(start + size, self.count)) for start in range(0, self.count, size or 1)]
@@ -6,12 +6,17 @@ This script demonstrates the use of the keyword generator by:
 2. Creating a KeywordGenerator instance.
 3. Creating a factory for keyword generation strategies.
 4. Attaching observers to save the generated keywords.
-5. Generating keywords using different strategies.
+5. Generating keywords using different strategies in parallel.
 """
 
 import pandas as pd
 from keyword_generator.generator import KeywordGenerator, StrategyFactory
 from keyword_generator.observers import CsvKeywordSaver, ConsoleKeywordSaver
+from keyword_generator.pipeline import KeywordCleaningStage
+from keyword_generator.templates import KeywordTemplate, TemplateSlot
+
+# Keywords are streamed to the observers in chunks of this many rows.
+CHUNK_SIZE = 100_000
 
 
 def main():
@@ -25,6 +30,9 @@ def main():
     # Create a KeywordGenerator instance
     keyword_generator = KeywordGenerator(products, modifiers)
 
+    # Normalize and deduplicate keywords, and drop those with negative keywords
+    keyword_generator.add_stage(KeywordCleaningStage(negative_keywords=['free', 'used']))
+
     # Create a factory for keyword generation strategies
     strategy_factory = StrategyFactory()
 
@@ -36,21 +44,14 @@ def main():
     keyword_generator.attach(csv_saver)
     keyword_generator.attach(console_saver)
 
-    # Generate keywords using different strategies
-    print("--- Generating Broad Match Keywords ---")
+    # Generate broad, phrase and exact match keywords in parallel
+    print("--- Generating Broad, Phrase and Exact Match Keywords ---")
     broad_match_strategy = strategy_factory.create_strategy('broad')
-    keyword_generator.set_strategy(broad_match_strategy)
-    keyword_generator.generate_keywords()
-
-    print("\n--- Generating Phrase Match Keywords ---")
     phrase_match_strategy = strategy_factory.create_strategy('phrase')
-    keyword_generator.set_strategy(phrase_match_strategy)
-    keyword_generator.generate_keywords()
-
-    print("\n--- Generating Exact Match Keywords ---")
     exact_match_strategy = strategy_factory.create_strategy('exact')
-    keyword_generator.set_strategy(exact_match_strategy)
-    keyword_generator.generate_keywords()
+    keyword_generator.generate_keywords_parallel(
+        [broad_match_strategy, phrase_match_strategy, exact_match_strategy]
+    )
 
     # You can also generate keywords for a new set of products and modifiers
     print("\n--- Generating Keywords for a New Product Set ---")
@@ -59,7 +60,27 @@ def main():
     keyword_generator.products = new_products
     keyword_generator.modifiers = new_modifiers
     keyword_generator.set_strategy(broad_match_strategy)
-    keyword_generator.generate_keywords()
+    keyword_generator.generate_delta(chunk_size=CHUNK_SIZE)
+
+    # Later runs only emit the keywords affected by changed products or modifiers
+    print("\n--- Generating Keywords for Catalog Changes Only ---")
+    keyword_generator.products = ['4k tv', 'led tv', 'oled tv']
+    keyword_generator.generate_delta(chunk_size=CHUNK_SIZE)
+
+    # Templates combine any number of slots; optional slots may be left out
+    print("\n--- Generating Keywords from a Template ---")
+    template = KeywordTemplate('{modifier} {brand} {product} {location}', {
+        'modifier': ['buy', 'best'],
+        'brand': TemplateSlot(['samsung', 'lg'], optional=True),
+        'product': new_products,
+        'location': TemplateSlot(['warsaw', 'krakow'], optional=True),
+    })
+    print(f"Template expands to {template.count} keywords")
+    keyword_generator.set_strategy(phrase_match_strategy)
+    keyword_generator.generate_template_keywords(template, chunk_size=CHUNK_SIZE)
+
+    # Close the observers so buffered output files are completed
+    keyword_generator.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+from keyword_generator.generator import KeywordGenerator, StrategyFactory
+from keyword_generator.observers import KeywordSaver
+from keyword_generator.pipeline import KeywordCleaningStage
+
+
+class DeltaRecorder(KeywordSaver):
+    def __init__(self):
+        self.added = []
+        self.removed = []
+
+    def update(self, keywords):
+        raise AssertionError("generate_delta() must only call update_delta()")
+
+    def update_delta(self, delta):
+        self.added.extend(delta.added['keyword'])
+        self.removed.extend(delta.removed['keyword'])
+
+    def take(self):
+        added, removed = sorted(self.added), sorted(self.removed)
+        self.added, self.removed = [], []
+        return added, removed
+
+
+def make_generator(products, modifiers, stage=None):
+    generator = KeywordGenerator(products, modifiers)
+    generator.set_strategy(StrategyFactory().create_strategy('exact'))
+    if stage:
+        generator.add_stage(stage)
+    recorder = DeltaRecorder()
+    generator.attach(recorder)
+    return generator, recorder
+
+
+def test_first_run_adds_every_keyword():
+    generator, recorder = make_generator(['camera', 'lens'], ['buy'])
+    generator.generate_delta()
+    assert recorder.take() == (['[buy camera]', '[buy lens]'], [])
+
+
+def test_changed_products_and_modifiers():
+    generator, recorder = make_generator(['camera', 'lens'], ['buy', 'cheap'])
+    generator.generate_delta()
+    recorder.take()
+
+    generator.products = ['camera', 'tripod']
+    generator.modifiers = ['buy', 'best']
+    generator.generate_delta(chunk_size=1)
+    added, removed = recorder.take()
+    assert added == ['[best camera]', '[best tripod]', '[buy tripod]']
+    assert removed == ['[buy lens]', '[cheap camera]', '[cheap lens]']
+
+
+def test_removals_are_normalized_like_additions():
+    generator, recorder = make_generator(['Digital  Camera', 'lens'], ['Buy'], KeywordCleaningStage())
+    generator.generate_delta()
+    assert recorder.take() == (['[buy digital camera]', '[buy lens]'], [])
+
+    generator.products = ['lens']
+    generator.generate_delta()
+    assert recorder.take() == ([], ['[buy digital camera]'])
+
+
+def test_removed_then_readded_keywords_are_emitted_again():
+    generator, recorder = make_generator(['camera', 'lens'], ['buy'], KeywordCleaningStage())
+    generator.generate_delta()
+    recorder.take()
+
+    generator.products = ['lens']
+    generator.generate_delta()
+    assert recorder.take() == ([], ['[buy camera]'])
+
+    generator.products = ['lens', 'camera']
+    generator.generate_delta()
+    assert recorder.take() == (['[buy camera]'], [])
+
+
+def test_removals_skip_keywords_filtered_as_negative():
+    generator, recorder = make_generator(['camera', 'free camera'], ['buy'], KeywordCleaningStage(['free']))
+    generator.generate_delta()
+    assert recorder.take() == (['[buy camera]'], [])
+
+    generator.products = []
+    generator.generate_delta()
+    assert recorder.take() == ([], ['[buy camera]'])
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pandas as pd
+
+from keyword_generator.dispatch import AsyncDispatcher, ObserverWorker
+from keyword_generator.generator import KeywordGenerator, StrategyFactory
+from keyword_generator.observers import KeywordSaver
+
+
+class RecordingSaver(KeywordSaver):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def update(self, keywords):
+        time.sleep(self.delay)
+        self.calls.append(('update', len(keywords)))
+
+    def flush(self):
+        self.calls.append(('flush', None))
+
+    def close(self):
+        self.calls.append(('close', None))
+
+
+class BlockingSaver(KeywordSaver):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def update(self, keywords):
+        self.release.wait()
+
+
+def frame(rows):
+    return pd.DataFrame({'keyword': ['kw'] * rows, 'match_type': ['Broad'] * rows})
+
+
+def test_async_dispatch_delivers_every_call_in_order():
+    generator = KeywordGenerator(['camera', 'lens', 'tripod'], ['buy', 'cheap'])
+    generator.set_strategy(StrategyFactory().create_strategy('broad'))
+    saver = RecordingSaver(delay=0.01)
+    generator.attach(saver)
+    generator.enable_async_dispatch(max_queue=1)
+
+    generator.generate_keywords(chunk_size=2)
+    metrics = generator.close()
+
+    assert saver.calls == [('update', 2)] * 3 + [('flush', None), ('close', None)]
+    assert metrics[0].rows == 6
+    assert metrics[0].undelivered == 0
+
+
+def test_shutdown_async_dispatch_flushes_without_closing():
+    generator = KeywordGenerator(['camera', 'lens'], ['buy'])
+    generator.set_strategy(StrategyFactory().create_strategy('phrase'))
+    saver = RecordingSaver(delay=0.01)
+    generator.attach(saver)
+    generator.enable_async_dispatch()
+
+    generator.generate_keywords()
+    metrics = generator.shutdown_async_dispatch()
+    assert saver.calls == [('update', 2), ('flush', None)]
+    assert metrics[0].undelivered == 0
+
+    # Back to synchronous dispatch: calls arrive before they return.
+    generator.generate_keywords()
+    assert saver.calls[-2:] == [('update', 2), ('flush', None)]
+    assert generator.close() == []
+    assert saver.calls[-1] == ('close', None)
+
+
+def test_stop_on_a_full_queue_honours_the_timeout():
+    saver = BlockingSaver()
+    worker = ObserverWorker(saver, max_queue=2)
+    worker.submit('update', frame(1))
+    # Let the worker take the first call, then fill the queue behind it.
+    while worker._queue.qsize():
+        time.sleep(0.001)
+    worker.submit('update', frame(1))
+    worker.submit('update', frame(1))
+
+    start = time.perf_counter()
+    finished = worker.stop(timeout=0.2, close_observer=True)
+    elapsed = time.perf_counter() - start
+    saver.release.set()
+
+    assert not finished
+    assert elapsed < 1.0
+    # Two queued updates and the close() that did not fit.
+    assert worker.metrics.undelivered == 3
+
+
+def test_shutdown_reports_undelivered_calls(capsys):
+    saver = BlockingSaver()
+    dispatcher = AsyncDispatcher(max_queue=4)
+    dispatcher.add(saver)
+    for _ in range(3):
+        dispatcher.dispatch(saver, 'update', frame(1))
+
+    metrics = dispatcher.shutdown(timeout=0.1)
+    saver.release.set()
+
+    assert metrics[0].undelivered >= 2
+    assert 'calls not delivered' in capsys.readouterr().out
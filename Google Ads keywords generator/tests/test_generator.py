@@ -0,0 +1,47 @@
+import pandas as pd
+
+from keyword_generator.generator import KeywordGenerator, StrategyFactory
+
+
+class RecordingSaver:
+    def __init__(self):
+        self.frames = []
+        self.flushes = 0
+
+    def update(self, keywords):
+        self.frames.append(keywords)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_parallel_generation_with_no_products():
+    factory = StrategyFactory()
+    generator = KeywordGenerator([], ['buy', 'cheap'])
+    saver = RecordingSaver()
+    generator.attach(saver)
+
+    generator.generate_keywords_parallel([factory.create_strategy('broad'), factory.create_strategy('exact')])
+
+    assert saver.frames == []
+    assert saver.flushes == 2
+
+
+def test_parallel_generation_with_chunk_size_bounds_frames():
+    factory = StrategyFactory()
+    products = [f'product {i}' for i in range(10)]
+    modifiers = ['buy', 'cheap', 'best']
+    sequential = KeywordGenerator(products, modifiers)
+    sequential.set_strategy(factory.create_strategy('phrase'))
+    expected = RecordingSaver()
+    sequential.attach(expected)
+    sequential.generate_keywords()
+
+    generator = KeywordGenerator(products, modifiers)
+    saver = RecordingSaver()
+    generator.attach(saver)
+    generator.generate_keywords_parallel([factory.create_strategy('phrase')], shards=2, max_workers=2, chunk_size=7)
+
+    assert max(len(frame) for frame in saver.frames) <= 7
+    assert saver.flushes == 1
+    assert sorted(pd.concat(saver.frames)['keyword']) == sorted(expected.frames[0]['keyword'])
@@ -0,0 +1,63 @@
+import gzip
+
+import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+
+from keyword_generator import observers
+from keyword_generator.observers import ArrowKeywordSaver, CsvKeywordSaver, ParquetKeywordSaver
+
+KEYWORDS = pd.DataFrame({
+    'keyword': ['buy camera', '"buy camera"', '[buy camera]', 'camera, cheap', 'line\nbreak'],
+    'match_type': ['Broad', 'Phrase', 'Exact', 'Broad', 'Broad'],
+})
+
+
+def save(saver, frames):
+    for keywords in frames:
+        saver.update(keywords)
+    saver.flush()
+    saver.close()
+
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_csv_matches_pandas_quoting_and_appends(tmp_path, monkeypatch, use_pyarrow):
+    if not use_pyarrow:
+        monkeypatch.setattr(observers, 'pa', None)
+    path = tmp_path / 'keywords.csv'
+    save(CsvKeywordSaver(str(path), flush_size=2), [KEYWORDS.iloc[:2], KEYWORDS.iloc[2:]])
+    save(CsvKeywordSaver(str(path)), [KEYWORDS])
+
+    expected = KEYWORDS.to_csv(index=False, lineterminator='\n') + \
+        KEYWORDS.to_csv(index=False, header=False, lineterminator='\n')
+    assert path.read_text(encoding='utf-8') == expected
+
+
+def test_gzip_csv_round_trip(tmp_path):
+    path = tmp_path / 'keywords.csv.gz'
+    save(CsvKeywordSaver(str(path)), [KEYWORDS])
+    save(CsvKeywordSaver(str(path)), [KEYWORDS])
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert pd.read_csv(f).equals(pd.concat([KEYWORDS, KEYWORDS], ignore_index=True))
+
+
+def test_parquet_and_arrow_round_trip_into_run_indexed_files(tmp_path):
+    for saver_class, name, read in ((ParquetKeywordSaver, 'keywords.parquet', pq.read_table),
+                                    (ArrowKeywordSaver, 'keywords.arrow', feather.read_table)):
+        path = tmp_path / name
+        first = saver_class(str(path), flush_size=2)
+        save(first, [KEYWORDS.iloc[:3], KEYWORDS.iloc[3:]])
+        second = saver_class(str(path))
+        save(second, [KEYWORDS.iloc[:1]])
+
+        assert first.filepath == str(path)
+        assert second.filepath == str(tmp_path / name.replace('.', '-1.'))
+        assert read(first.filepath).to_pandas().equals(KEYWORDS)
+        assert read(second.filepath).to_pandas().equals(KEYWORDS.iloc[:1])
+
+
+def test_arrow_savers_require_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(observers, 'pa', None)
+    with pytest.raises(ImportError):
+        ParquetKeywordSaver(str(tmp_path / 'keywords.parquet'))
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from keyword_generator.pipeline import FingerprintSet, KeywordCleaningStage, NegativeKeywordMatcher
+
+
+def keywords(rows):
+    return pd.DataFrame(rows, columns=['keyword', 'match_type'])
+
+
+def test_only_one_match_type_wrapper_is_stripped():
+    stage = KeywordCleaningStage(deduplicate=False)
+    result = stage.process(keywords([
+        ('"[Buy  X]"', 'Phrase'),
+        ('[Buy X]', 'Exact'),
+        ('buy x]', 'Broad'),
+        ('"buy  x', 'Broad'),
+    ]))
+    assert result['keyword'].tolist() == ['"[buy x]"', '[buy x]', 'buy x]', '"buy x']
+
+
+def test_negative_keywords_match_contiguous_words():
+    matcher = NegativeKeywordMatcher(['free', 'used camera'])
+
+    assert len(matcher) == 2
+    assert matcher.matches('Free camera manual')
+    assert matcher.matches('buy used camera')
+    assert not matcher.matches('used cheap camera')
+    assert not matcher.matches('freedom camera')
+
+
+def test_cleaning_normalizes_and_filters_negatives():
+    stage = KeywordCleaningStage(negative_keywords=['used camera'], deduplicate=False)
+
+    result = stage.process(keywords([
+        ('Buy  CAMERA', 'Broad'),
+        ('"buy used camera"', 'Phrase'),
+        ('[Cheap Lens ]', 'Exact'),
+    ]))
+
+    assert result['keyword'].tolist() == ['buy camera', '[cheap lens]']
+    assert result['match_type'].tolist() == ['Broad', 'Exact']
+    assert stage.filtered_count == 1
+
+
+def test_deduplication_spans_calls_and_respects_match_types():
+    stage = KeywordCleaningStage()
+
+    first = stage.process(keywords([
+        ('buy cheap camera', 'Broad'),
+        ('"buy cheap camera"', 'Phrase'),
+        ('Buy Cheap Camera', 'Broad'),
+    ]))
+    second = stage.process(keywords([
+        ('camera cheap buy', 'Broad'),
+        ('"camera cheap buy"', 'Phrase'),
+        ('"buy cheap camera"', 'Phrase'),
+    ]))
+
+    assert first['keyword'].tolist() == ['buy cheap camera', '"buy cheap camera"']
+    # Broad match ignores word order, phrase match does not.
+    assert second['keyword'].tolist() == ['"camera cheap buy"']
+    assert stage.duplicate_count == 3
+
+    stage.reset()
+    assert len(stage.process(keywords([('buy cheap camera', 'Broad')]))) == 1
+
+
+def test_fingerprint_set_add_and_discard():
+    seen = FingerprintSet(capacity=4)
+    values = np.arange(1, 100, dtype=np.uint64)
+
+    assert seen.add(np.r_[values, values[:3]]).sum() == len(values)
+    assert not seen.add(values).any()
+    assert seen.discard(values[:50]) == 50
+    assert len(seen) == 49
+    assert seen.add(values).tolist() == [True] * 50 + [False] * 49
+
+
+def test_surrounding_whitespace_is_trimmed_before_deduplication():
+    stage = KeywordCleaningStage()
+    result = stage.process(keywords([
+        ('[ Cheap Lens ]', 'Exact'),
+        (' buy  camera ', 'Broad'),
+        ('buy camera', 'Broad'),
+    ]))
+    assert result['keyword'].tolist() == ['[cheap lens]', 'buy camera']
+    assert stage.duplicate_count == 1
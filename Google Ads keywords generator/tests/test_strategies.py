@@ -0,0 +1,86 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+from keyword_generator.generator import KeywordGenerator, StrategyFactory
+from keyword_generator.observers import CsvKeywordSaver
+from keyword_generator.strategies import generate_all
+
+PRODUCTS = ['camera', 'lens', 'tripod', 'flash']
+MODIFIERS = ['buy', 'cheap', 'best']
+DECORATIONS = {'broad': '{}', 'phrase': '"{}"', 'exact': '[{}]'}
+
+
+class RecordingSaver:
+    def __init__(self):
+        self.frames = []
+
+    def update(self, keywords):
+        self.frames.append(keywords)
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize('strategy_type', ['broad', 'phrase', 'exact'])
+def test_strategies_match_the_itertools_product_keywords(strategy_type):
+    strategy = StrategyFactory().create_strategy(strategy_type)
+    expected = [DECORATIONS[strategy_type].format(f'{modifier} {product}')
+                for modifier, product in itertools.product(MODIFIERS, PRODUCTS)]
+
+    keywords = strategy.generate(PRODUCTS, MODIFIERS)
+
+    assert keywords['keyword'].tolist() == expected
+    assert (keywords['match_type'] == strategy.match_type).all()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 12, 100])
+@pytest.mark.parametrize('strategy_type', ['broad', 'phrase', 'exact'])
+def test_chunked_generation_equals_unchunked(strategy_type, chunk_size):
+    strategy = StrategyFactory().create_strategy(strategy_type)
+    whole = strategy.generate(PRODUCTS, MODIFIERS)
+
+    chunks = list(strategy.generate_chunks(PRODUCTS, MODIFIERS, chunk_size))
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole)
+
+
+def test_generate_all_shares_one_cross_product():
+    factory = StrategyFactory()
+    strategies = [factory.create_strategy(name) for name in DECORATIONS]
+
+    keywords = generate_all(PRODUCTS, MODIFIERS, strategies)
+
+    assert list(keywords) == ['Broad', 'Phrase', 'Exact']
+    for strategy in strategies:
+        pd.testing.assert_frame_equal(keywords[strategy.match_type], strategy.generate(PRODUCTS, MODIFIERS))
+
+
+def test_generator_streams_the_same_keywords_as_one_frame():
+    factory = StrategyFactory()
+    whole, streamed = RecordingSaver(), RecordingSaver()
+    for saver, chunk_size in ((whole, None), (streamed, 5)):
+        generator = KeywordGenerator(PRODUCTS, MODIFIERS)
+        generator.set_strategy(factory.create_strategy('exact'))
+        generator.attach(saver)
+        generator.generate_keywords(chunk_size=chunk_size)
+
+    assert len(whole.frames) == 1
+    assert len(streamed.frames) == 3
+    pd.testing.assert_frame_equal(pd.concat(streamed.frames, ignore_index=True), whole.frames[0])
+
+
+def test_chunked_csv_output_is_identical(tmp_path):
+    paths = []
+    for chunk_size in (None, 5):
+        path = tmp_path / f'keywords-{chunk_size}.csv'
+        generator = KeywordGenerator(PRODUCTS, MODIFIERS)
+        generator.set_strategy(StrategyFactory().create_strategy('phrase'))
+        generator.attach(CsvKeywordSaver(str(path), flush_size=4))
+        generator.generate_keywords(chunk_size=chunk_size)
+        generator.close()
+        paths.append(path)
+
+    assert paths[0].read_bytes() == paths[1].read_bytes()
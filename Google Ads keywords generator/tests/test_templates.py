@@ -0,0 +1,96 @@
+import itertools
+
+import pytest
+
+from keyword_generator.generator import StrategyFactory
+from keyword_generator.templates import KeywordTemplate, TemplateSlot
+
+SLOTS = {
+    'modifier': ['buy', 'cheap'],
+    'brand': ['canon', 'nikon', 'sony'],
+    'product': ['camera', 'lens'],
+}
+
+
+def test_count_and_order_follow_the_slots():
+    template = KeywordTemplate('{modifier} {brand} {product}', SLOTS)
+    expected = [' '.join(values) for values in itertools.product(*SLOTS.values())]
+
+    assert template.count == len(template) == 12
+    assert list(template) == expected
+    assert template.keywords.tolist() == expected
+
+
+def test_random_access_matches_the_full_expansion():
+    template = KeywordTemplate('{modifier} {brand} {product} near me', SLOTS)
+    keywords = template.keywords.tolist()
+
+    assert [template.keyword_at(i) for i in range(template.count)] == keywords
+    assert template.slice(3, 8).tolist() == keywords[3:8]
+    assert template.combination_at(5) == {'modifier': 'buy', 'brand': 'sony', 'product': 'lens'}
+    with pytest.raises(IndexError):
+        template.keyword_at(template.count)
+
+
+def test_partition_covers_every_index_once():
+    template = KeywordTemplate('{modifier} {brand} {product}', SLOTS)
+
+    ranges = template.partition(5)
+
+    assert len(ranges) <= 5
+    assert [i for r in ranges for i in r] == list(range(template.count))
+    chunks = [keyword for r in ranges for keyword in template.slice(r.start, r.stop)]
+    assert chunks == template.keywords.tolist()
+
+
+def test_iter_chunks_is_bounded_and_complete():
+    template = KeywordTemplate('{modifier} {brand} {product}', SLOTS)
+
+    chunks = list(template.iter_chunks(5, start=2))
+
+    assert [len(chunk) for chunk in chunks] == [5, 5]
+    assert [keyword for chunk in chunks for keyword in chunk] == template.keywords.tolist()[2:]
+    with pytest.raises(ValueError):
+        next(template.iter_chunks(0))
+
+
+def test_optional_slot_collapses_whitespace():
+    template = KeywordTemplate('{modifier} {brand} {product}', {
+        'modifier': ['buy'],
+        'brand': TemplateSlot(['canon'], optional=True),
+        'product': ['camera'],
+    })
+
+    assert template.count == 2
+    assert template.keywords.tolist() == ['buy camera', 'buy canon camera']
+    assert template.keyword_at(0) == 'buy camera'
+
+
+def test_slot_constraints_are_applied_up_front():
+    slot = TemplateSlot(['tv', 'camera', 'lens', 'x100'], exclude=['lens'], pattern='[a-z]+', min_length=3)
+
+    assert slot.values == ['camera']
+
+
+def test_repeated_slot_takes_one_value():
+    template = KeywordTemplate('{product} and {product} case', {'product': ['phone', 'tablet']})
+
+    assert template.keywords.tolist() == ['phone and phone case', 'tablet and tablet case']
+
+
+def test_invalid_templates_are_rejected():
+    with pytest.raises(ValueError):
+        KeywordTemplate('{modifier} {product}', {'modifier': ['buy']})
+    with pytest.raises(ValueError):
+        KeywordTemplate('{product:>10}', {'product': ['camera']})
+
+
+def test_strategies_decorate_template_chunks():
+    template = KeywordTemplate('{modifier} {brand} {product}', SLOTS)
+    strategy = StrategyFactory().create_strategy('exact')
+
+    chunks = list(strategy.template_chunks(template, 4, start=4, stop=10))
+
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert [keyword for chunk in chunks for keyword in chunk['keyword']] == \
+        [f'[{keyword}]' for keyword in template.keywords.tolist()[4:10]]
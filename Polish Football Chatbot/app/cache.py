@@ -0,0 +1,126 @@
+import re
+import threading
+from collections import OrderedDict
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize(text):
+    """
+    Normalizes a message for exact matching: case, punctuation and repeated
+    whitespace are ignored.
+
+    :param text: The message.
+    :return: The normalized message.
+    """
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text.casefold())).strip()
+
+class IntentCache:
+    """
+    A front-line cache of message -> intent results.
+
+    A message whose normalized text equals a normalized intent pattern is
+    answered with that pattern's intent. Other messages are looked up in a
+    bounded LRU of recent NLP results. Only messages missing from both need
+    the NLP processor. The cache is rebuilt when the intents are reloaded.
+    """
+    def __init__(self, intents, max_size=1024):
+        """
+        Initializes the IntentCache.
+
+        :param intents: The shared IntentsRepository.
+        :param max_size: The maximum number of recent results kept.
+        """
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+        self.exact_hits = 0
+        self.recent_hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+        self._build(intents)
+        intents.subscribe(self._build)
+
+    def _build(self, intents):
+        """
+        Indexes the normalized patterns and drops results of old intents.
+
+        :param intents: The IntentsRepository.
+        """
+        exact = {}
+        for tag, pattern in zip(intents.pattern_tags, intents.patterns):
+            # The first pattern wins, as in the similarity search.
+            exact.setdefault(normalize(pattern), tag)
+        with self._lock:
+            self._exact = exact
+            self._recent.clear()
+
+    def lookup(self, text):
+        """
+        Finds a cached intent for a message.
+
+        :param text: The user's message.
+        :return: The intent tag, or None on a miss.
+        """
+        key = normalize(text)
+        with self._lock:
+            tag = self._exact.get(key)
+            if tag is not None:
+                self.exact_hits += 1
+                return tag
+            tag = self._recent.get(key)
+            if tag is not None:
+                self._recent.move_to_end(key)
+                self.recent_hits += 1
+                return tag
+            self.misses += 1
+            return None
+
+    def store(self, text, tag):
+        """
+        Remembers the NLP result for a message, evicting the least recently used.
+
+        :param text: The user's message.
+        :param tag: The intent tag found by the NLP processor.
+        """
+        key = normalize(text)
+        with self._lock:
+            self._recent[key] = tag
+            self._recent.move_to_end(key)
+            if len(self._recent) > self.max_size:
+                self._recent.popitem(last=False)
+
+    def record(self, hit, seconds):
+        """
+        Adds the time taken to find intents to the hit or miss latency.
+
+        :param hit: Whether the intents came from the cache.
+        :param seconds: The total time taken, including any NLP processing.
+        """
+        with self._lock:
+            if hit:
+                self.hit_seconds += seconds
+            else:
+                self.miss_seconds += seconds
+
+    def stats(self):
+        """
+        Summarizes the cache's effectiveness.
+
+        :return: A dict with hit counts, the hit rate and the mean hit and
+            miss latency in milliseconds.
+        """
+        with self._lock:
+            hits = self.exact_hits + self.recent_hits
+            total = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "recent_hits": self.recent_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "mean_hit_ms": self.hit_seconds / hits * 1000 if hits else 0.0,
+                "mean_miss_ms": self.miss_seconds / self.misses * 1000 if self.misses else 0.0,
+                "size": len(self._recent),
+            }
+
@@ -1,23 +1,134 @@
-from app.nlp.spacy_processor import SpacyProcessor
+import threading
+import time
+from app.cache import IntentCache
+from app.intents import IntentsRepository
 from app.responses.generator import ResponseGenerator
 
 class ChatBot:
     """
     The main ChatBot class that orchestrates the conversation.
     """
-    def __init__(self):
+    LOADING_MESSAGE = "I'm still warming up my football knowledge. Give me a moment!"
+
+    PROCESSORS = ("spacy", "tfidf")
+
+    def __init__(self, background=False, exclude=None, reload_interval=2.0, cache_size=1024, processor="spacy"):
         """
         Initializes the ChatBot with an NLP processor and a response generator.
+
+        :param background: If True, load the NLP model on a background thread
+            so the caller (e.g. the GUI) is not blocked while it loads.
+        :param exclude: spaCy pipeline components not to load. Defaults to
+            spacy_processor.LEAN_EXCLUDE.
+        :param reload_interval: Seconds between checks of the intents file for
+            changes, or None to disable hot reloading.
+        :param cache_size: The number of recent message -> intent results kept.
+        :param processor: The NLP processor, "spacy" or "tfidf". The TF-IDF
+            processor needs no model and starts in milliseconds.
+        """
+        if processor not in self.PROCESSORS:
+            raise ValueError(f"Unknown processor '{processor}', expected one of {self.PROCESSORS}")
+        self.nlp_processor = None
+        self._processor = processor
+        self._exclude = exclude
+        # Loaded once and shared, so both components always see the same intents.
+        self.intents = IntentsRepository()
+        self.response_generator = ResponseGenerator(self.intents)
+        self.cache = IntentCache(self.intents, cache_size)
+        if reload_interval:
+            self.intents.watch(reload_interval)
+        self._ready = threading.Event()
+        self._load_error = None
+        if background:
+            threading.Thread(target=self._load, name="nlp-loader", daemon=True).start()
+        else:
+            self._load()
+
+    def _load(self):
+        """
+        Loads the NLP processor and signals readiness, even if loading fails.
+        """
+        try:
+            # Imported here so the TF-IDF processor never loads spaCy.
+            if self._processor == "tfidf":
+                from app.nlp.tfidf_processor import TfidfProcessor
+                self.nlp_processor = TfidfProcessor(intents=self.intents)
+            else:
+                from app.nlp.spacy_processor import LEAN_EXCLUDE, SpacyProcessor
+                exclude = LEAN_EXCLUDE if self._exclude is None else self._exclude
+                self.nlp_processor = SpacyProcessor(intents=self.intents, exclude=exclude)
+        except Exception as e:
+            self._load_error = e
+        finally:
+            self._ready.set()
+
+    @property
+    def is_ready(self):
+        """
+        Whether the NLP processor has finished loading.
+        """
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout=None):
+        """
+        Blocks until the NLP processor has finished loading.
+
+        :param timeout: The maximum number of seconds to wait.
+        :return: True if loading finished within the timeout.
         """
-        self.nlp_processor = SpacyProcessor()
-        self.response_generator = ResponseGenerator()
+        return self._ready.wait(timeout)
 
     def get_response(self, user_input):
         """
         Gets a response from the chatbot for a given user input.
 
         :param user_input: The user's message.
-        :return: The chatbot's response.
+        :return: The chatbot's response, or a warm-up message while the
+            NLP processor is still loading.
         """
-        intent = self.nlp_processor.process(user_input)
+        start = time.perf_counter()
+        intent = self.cache.lookup(user_input)
+        if intent is None:
+            if not self.is_ready:
+                return self.LOADING_MESSAGE
+            self._check_loaded()
+            intent = self.nlp_processor.process(user_input)
+            self.cache.store(user_input, intent)
+            self.cache.record(False, time.perf_counter() - start)
+        else:
+            self.cache.record(True, time.perf_counter() - start)
         return self.response_generator.generate_response(intent)
+
+    def get_responses(self, user_inputs):
+        """
+        Gets the chatbot's responses for several inputs in one batch.
+
+        :param user_inputs: The users' messages.
+        :return: The chatbot's responses, in the same order.
+        """
+        start = time.perf_counter()
+        intents = [self.cache.lookup(user_input) for user_input in user_inputs]
+        misses = [i for i, intent in enumerate(intents) if intent is None]
+        hits = len(intents) - len(misses)
+        if hits:
+            # The lookups are timed together, so hits get their share of the time.
+            self.cache.record(True, (time.perf_counter() - start) * hits / len(intents))
+        if misses:
+            if not self.is_ready:
+                return [self.LOADING_MESSAGE if intent is None else self.response_generator.generate_response(intent)
+                        for intent in intents]
+            self._check_loaded()
+            # Only the cache misses are parsed, together in one batch.
+            found = self.nlp_processor.process_batch([user_inputs[i] for i in misses])
+            for i, intent in zip(misses, found):
+                intents[i] = intent
+                self.cache.store(user_inputs[i], intent)
+            self.cache.record(False, time.perf_counter() - start)
+        return [self.response_generator.generate_response(intent) for intent in intents]
+
+    def _check_loaded(self):
+        """
+        Raises if the NLP processor failed to load.
+        """
+        if self._load_error is not None:
+            raise RuntimeError("The NLP model failed to load.") from self._load_error
@@ -1,3 +1,5 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import scrolledtext
 from app.chatbot import ChatBot
@@ -5,7 +7,16 @@ from app.chatbot import ChatBot
 class ChatApplication:
     """
     A class to create the GUI for the chatbot application.
+
+    Responses are computed on a worker thread, so the window stays
+    responsive while the bot thinks. Results come back through a queue that
+    the Tk event loop polls with after(), and are shown in the order the
+    messages were sent.
     """
+    # Older lines are trimmed so inserts stay fast in long sessions.
+    MAX_HISTORY_LINES = 500
+    POLL_MS = 50
+
     def __init__(self, master):
         """
         Initializes the ChatApplication.
@@ -16,21 +27,46 @@ class ChatApplication:
         master.title("CodeHelper Bot")
         master.geometry("500x600")
 
-        self.chatbot = ChatBot()
+        # The NLP model loads on a background thread so the window opens at once.
+        self.chatbot = ChatBot(background=True)
+
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._cancelled = set()
+        self._cancelled_lock = threading.Lock()
+        # Requests are numbered; _next_to_show is the oldest one not yet shown.
+        self._next_id = 0
+        self._next_to_show = 0
+        self._finished = {}
+        self._worker = threading.Thread(target=self._work, name="chat-worker", daemon=True)
+        self._worker.start()
 
         self.chat_history = scrolledtext.ScrolledText(master, state='disabled')
         self.chat_history.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
+        self.typing_label = tk.Label(master, text="", anchor='w', fg='gray')
+        self.typing_label.pack(padx=10, fill=tk.X)
+
         self.msg_entry = tk.Entry(master, width=50)
         self.msg_entry.pack(pady=10, padx=10, fill=tk.X, expand=False)
         self.msg_entry.bind("<Return>", self.send_message)
+        self.msg_entry.bind("<Escape>", self.cancel_pending)
 
-        self.send_button = tk.Button(master, text="Send", command=self.send_message)
-        self.send_button.pack(pady=5)
+        buttons = tk.Frame(master)
+        buttons.pack(pady=5)
+        self.send_button = tk.Button(buttons, text="Send", command=self.send_message)
+        self.send_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(buttons, text="Cancel", command=self.cancel_pending)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+        master.protocol("WM_DELETE_WINDOW", self.close)
+        self._display_message("Bot: Warming up, you can already type your question...")
+        self.master.after(self.POLL_MS, self._poll_results)
 
     def send_message(self, event=None):
         """
-        Handles sending a message from the user and displaying the response.
+        Handles sending a message from the user; the response is displayed
+        by _poll_results once the worker has computed it.
         """
         user_input = self.msg_entry.get()
         if user_input.strip() == "":
@@ -39,17 +75,107 @@ class ChatApplication:
         self._display_message(f"You: {user_input}")
         self.msg_entry.delete(0, tk.END)
 
-        response = self.chatbot.get_response(user_input)
-        self._display_message(f"Bot: {response}")
+        self._requests.put((self._next_id, user_input))
+        self._next_id += 1
+        self._update_typing_indicator()
+
+    def cancel_pending(self, event=None):
+        """
+        Cancels all messages that have not been answered yet.
+        """
+        pending = range(self._next_to_show, self._next_id)
+        if not pending:
+            return
+        with self._cancelled_lock:
+            self._cancelled.update(pending)
+        self._display_message(f"Bot: Cancelled {len(pending)} unanswered message(s).")
+
+    def close(self):
+        """
+        Stops the worker thread and closes the window.
+        """
+        self._requests.put(None)
+        self.master.destroy()
+
+    def _is_cancelled(self, request_id):
+        """
+        :param request_id: The number of a request.
+        :return: True if the request was cancelled.
+        """
+        with self._cancelled_lock:
+            return request_id in self._cancelled
+
+    def _work(self):
+        """
+        Answers requests on the worker thread until close() is called.
+        Cancelled requests are skipped but still reported, so the display
+        order can move past them.
+        """
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            request_id, user_input = request
+            self.chatbot.wait_until_ready()
+            if self._is_cancelled(request_id):
+                self._results.put((request_id, None))
+                continue
+            try:
+                response = self.chatbot.get_response(user_input)
+            except Exception as e:
+                # Any failure answers this message only; the worker keeps serving.
+                response = f"Sorry, I can't answer right now ({e})"
+            self._results.put((request_id, response))
+
+    def _poll_results(self):
+        """
+        Displays the worker's results in the order the messages were sent.
+        Runs on the Tk event loop every POLL_MS milliseconds.
+        """
+        while True:
+            try:
+                request_id, response = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._finished[request_id] = response
+
+        while self._next_to_show in self._finished:
+            response = self._finished.pop(self._next_to_show)
+            with self._cancelled_lock:
+                cancelled = self._next_to_show in self._cancelled
+                self._cancelled.discard(self._next_to_show)
+            if not cancelled:
+                self._display_message(f"Bot: {response}")
+            self._next_to_show += 1
+
+        self._update_typing_indicator()
+        self.master.after(self.POLL_MS, self._poll_results)
+
+    def _update_typing_indicator(self):
+        """
+        Shows whether the bot is still loading or working on an answer.
+        """
+        if self._next_to_show == self._next_id:
+            text = ""
+        elif not self.chatbot.is_ready:
+            text = "Bot is warming up..."
+        else:
+            text = "Bot is typing..."
+        if self.typing_label.cget('text') != text:
+            self.typing_label.config(text=text)
 
     def _display_message(self, message):
         """
-        Displays a message in the chat history.
+        Displays a message in the chat history, trimming the oldest lines
+        beyond MAX_HISTORY_LINES.
 
         :param message: The message to display.
         """
         self.chat_history.config(state='normal')
         self.chat_history.insert(tk.END, message + "\n")
+        # The text always ends with an empty line after the last newline.
+        lines = int(self.chat_history.index('end-1c').split('.')[0]) - 1
+        if lines > self.MAX_HISTORY_LINES:
+            self.chat_history.delete('1.0', f'{lines - self.MAX_HISTORY_LINES + 1}.0')
         self.chat_history.config(state='disabled')
         self.chat_history.yview(tk.END)
-
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INTENTS_PATH = os.path.join(PROJECT_ROOT, 'data', 'intents.json')
+
+# Separates the strings packed into one array of the compiled cache.
+_SEPARATOR = '\x00'
+
+class IntentsRepository:
+    """
+    The chatbot's knowledge base, loaded once and shared by its components.
+
+    The intents file is parsed into a tag -> responses dict and flat lists of
+    patterns and their tags. The parsed intents, and the pattern vectors of
+    any NLP processor, are kept in a compiled NumPy cache next to the file,
+    keyed by the file's SHA-256 hash, so large knowledge bases skip JSON
+    parsing and vector computation on start-up.
+
+    When the file changes, reload_if_changed() (or the watch() thread)
+    reparses it and notifies the subscribers.
+    """
+    def __init__(self, path=DEFAULT_INTENTS_PATH):
+        """
+        Initializes the IntentsRepository and loads the intents.
+
+        :param path: The path of the intents file. Defaults to
+            data/intents.json in the project, whatever the working directory.
+        """
+        self.path = os.path.abspath(path)
+        self.cache_path = os.path.join(os.path.dirname(self.path), '.intents_cache.npz')
+        self.version = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        self._stat = None
+        self._load()
+
+    def _load(self):
+        """
+        Reads the intents file and loads it from the compiled cache if it is
+        current, or parses it and refreshes the cache.
+        """
+        stat = os.stat(self.path)
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        cache = self._read_cache()
+        from_cache = cache.get('digest') == digest and 'intent_tags' in cache
+        intents = self._unpack_intents(cache) if from_cache else json.loads(raw)["intents"]
+        self._index(intents)
+        # Only a file that parsed and indexed becomes the current digest, so a
+        # malformed file is retried once it changes again.
+        self.digest = digest
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        if not from_cache:
+            self._write_cache(intents=intents)
+        self.version += 1
+
+    def _index(self, intents):
+        """
+        Builds the lookup structures from a list of intents.
+
+        :param intents: The "intents" list of the intents file.
+        """
+        responses = {}
+        pattern_tags = []
+        patterns = []
+        for intent in intents:
+            # The first intent with a tag provides its responses.
+            responses.setdefault(intent["tag"], intent["responses"])
+            for pattern in intent["patterns"]:
+                pattern_tags.append(intent["tag"])
+                patterns.append(pattern)
+        self.intents = intents
+        self.responses = responses
+        self.pattern_tags = pattern_tags
+        self.patterns = patterns
+
+    def get_responses(self, tag):
+        """
+        Gets the responses of an intent.
+
+        :param tag: The tag of the intent.
+        :return: The list of responses, or an empty list for an unknown tag.
+        """
+        return self.responses.get(tag, [])
+
+    def subscribe(self, listener):
+        """
+        Registers a callback to run after the intents are reloaded.
+
+        :param listener: A callable taking the repository.
+        """
+        self._listeners.append(listener)
+
+    def reload_if_changed(self):
+        """
+        Reloads the intents if the file's modification time or size changed
+        and its content hash differs, then notifies the subscribers.
+
+        :return: True if the intents were reloaded.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) == self._stat:
+                return False
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            self._stat = (stat.st_mtime_ns, stat.st_size)
+            if hashlib.sha256(raw).hexdigest() == self.digest:
+                return False
+            try:
+                self._load()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not reload {self.path}: {e}")
+                return False
+        for listener in self._listeners:
+            listener(self)
+        return True
+
+    def watch(self, interval=2.0):
+        """
+        Starts a background thread that checks the file for changes.
+
+        :param interval: Seconds between checks.
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+
+        def run():
+            while not self._stop_watching.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=run, name="intents-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """
+        Stops the watcher thread started by watch().
+        """
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def load_vectors(self, key):
+        """
+        Loads cached pattern vectors computed for the current intents.
+
+        :param key: Identifies the model that computed the vectors.
+        :return: The cached matrix, or None if there is none for this key.
+        """
+        cache = self._read_cache()
+        if cache.get('digest') == self.digest and cache.get('vectors_key') == key:
+            return cache['vectors']
+        return None
+
+    def save_vectors(self, key, matrix):
+        """
+        Caches the pattern vectors computed for the current intents.
+
+        :param key: Identifies the model that computed the vectors.
+        :param matrix: The pattern vectors, one row per pattern.
+        """
+        self._write_cache(intents=self.intents, vectors_key=key, vectors=matrix)
+
+    def _read_cache(self):
+        """
+        Reads the compiled cache.
+
+        :return: A dict of the cached arrays, empty if there is no valid cache.
+        """
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as cache:
+                data = {name: cache[name] for name in cache.files}
+        except (OSError, ValueError):
+            return {}
+        for name in ('digest', 'vectors_key'):
+            if name in data:
+                data[name] = str(data[name])
+        return data
+
+    def _write_cache(self, intents, vectors_key=None, vectors=None):
+        """
+        Writes the compiled cache of the current intents and, optionally,
+        their pattern vectors.
+
+        :param intents: The "intents" list of the intents file.
+        :param vectors_key: Identifies the model that computed the vectors.
+        :param vectors: The pattern vectors.
+        """
+        try:
+            arrays = self._pack_intents(intents)
+        except ValueError:
+            return
+        arrays['digest'] = self.digest
+        if vectors is not None:
+            arrays['vectors_key'] = vectors_key
+            arrays['vectors'] = vectors
+        # Write to a temporary file first so a crash never leaves a truncated cache.
+        temp_path = f"{self.cache_path}.tmp.npz"
+        try:
+            np.savez(temp_path, **arrays)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write the intents cache at {self.cache_path}: {e}")
+
+    @staticmethod
+    def _pack(strings):
+        """
+        Packs strings into one UTF-8 byte array.
+
+        :param strings: The strings, none containing a NUL character.
+        :return: A uint8 array.
+        """
+        text = _SEPARATOR.join(strings)
+        if text.count(_SEPARATOR) != max(len(strings) - 1, 0):
+            raise ValueError("Strings containing NUL characters cannot be cached")
+        return np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+
+    @staticmethod
+    def _unpack(array, count):
+        """
+        Unpacks strings packed by _pack.
+
+        :param array: The uint8 array.
+        :param count: The number of strings.
+        :return: The list of strings.
+        """
+        return array.tobytes().decode('utf-8').split(_SEPARATOR) if count else []
+
+    def _pack_intents(self, intents):
+        """
+        Converts intents into the arrays of the compiled cache.
+
+        :param intents: The "intents" list of the intents file.
+        :return: A dict of NumPy arrays.
+        """
+        patterns = [pattern for intent in intents for pattern in intent["patterns"]]
+        responses = [response for intent in intents for response in intent["responses"]]
+        return {
+            'intent_tags': self._pack([intent["tag"] for intent in intents]),
+            'intent_count': np.array(len(intents)),
+            'pattern_counts': np.array([len(intent["patterns"]) for intent in intents], dtype=np.int64),
+            'response_counts': np.array([len(intent["responses"]) for intent in intents], dtype=np.int64),
+            'patterns': self._pack(patterns),
+            'responses': self._pack(responses),
+        }
+
+    def _unpack_intents(self, cache):
+        """
+        Rebuilds the intents from the arrays of the compiled cache.
+
+        :param cache: The dict returned by _read_cache.
+        :return: The "intents" list.
+        """
+        pattern_counts = cache['pattern_counts'].tolist()
+        response_counts = cache['response_counts'].tolist()
+        tags = self._unpack(cache['intent_tags'], int(cache['intent_count']))
+        patterns = iter(self._unpack(cache['patterns'], sum(pattern_counts)))
+        responses = iter(self._unpack(cache['responses'], sum(response_counts)))
+        return [
+            {
+                "tag": tag,
+                "patterns": [next(patterns) for _ in range(pattern_count)],
+                "responses": [next(responses) for _ in range(response_count)],
+            }
+            for tag, pattern_count, response_count in zip(tags, pattern_counts, response_counts)
+        ]
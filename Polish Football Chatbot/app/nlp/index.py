@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+def top_k_indices(scores, k):
+    """
+    Selects the k highest scores without sorting all of them.
+
+    :param scores: A 1-D array of scores.
+    :param k: The number of results.
+    :return: The positions of the k highest scores, best first.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k == 1:
+        # argmax keeps the first of tied scores.
+        return np.array([np.argmax(scores)], dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+class VectorIndex(ABC):
+    """
+    Abstract base class for indexes over unit-length pattern vectors.
+    Like NLPProcessor, this follows the Strategy design pattern, so the
+    exact and approximate indexes are interchangeable.
+    """
+    @abstractmethod
+    def build(self, matrix):
+        """
+        Indexes a matrix of row-normalized vectors.
+
+        :param matrix: A 2-D float32 array, one unit-length vector per row.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, vector, k=1):
+        """
+        Finds the rows most similar to a unit-length query vector.
+
+        :param vector: A 1-D float32 array.
+        :param k: The number of results.
+        :return: The row numbers and cosine similarities of the best matches,
+            best first, as two arrays of at most k elements.
+        """
+        pass
+
+    def search_batch(self, vectors, k=1):
+        """
+        Searches for several query vectors at once.
+
+        :param vectors: A 2-D float32 array, one unit-length query per row.
+        :param k: The number of results per query.
+        :return: A list of (rows, scores) pairs, one per query.
+        """
+        return [self.search(vector, k) for vector in vectors]
+
+class BruteForceIndex(VectorIndex):
+    """
+    An exact index that scores every row with one matrix-vector product.
+    """
+    def __init__(self):
+        """
+        Initializes an empty BruteForceIndex.
+        """
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def build(self, matrix):
+        """
+        Indexes a matrix of row-normalized vectors.
+
+        :param matrix: A 2-D float32 array, one unit-length vector per row.
+        """
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def search(self, vector, k=1):
+        """
+        Finds the rows most similar to a unit-length query vector.
+
+        :param vector: A 1-D float32 array.
+        :param k: The number of results.
+        :return: The row numbers and cosine similarities of the best matches.
+        """
+        if len(self.matrix) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.matrix @ vector
+        top = top_k_indices(scores, k)
+        return top, scores[top]
+
+    def search_batch(self, vectors, k=1):
+        """
+        Scores all queries against all rows with one matrix-matrix product.
+
+        :param vectors: A 2-D float32 array, one unit-length query per row.
+        :param k: The number of results per query.
+        :return: A list of (rows, scores) pairs, one per query.
+        """
+        if len(self.matrix) == 0:
+            return [self.search(vector, k) for vector in vectors]
+        results = []
+        for scores in vectors @ self.matrix.T:
+            top = top_k_indices(scores, k)
+            results.append((top, scores[top]))
+        return results
+
+class IVFIndex(VectorIndex):
+    """
+    An approximate inverted-file index.
+
+    The vectors are clustered with spherical k-means into n_lists lists. A
+    query is compared with the list centroids first and then only with the
+    vectors of the n_probe closest lists. Raising n_probe improves recall at
+    the cost of latency; n_probe == n_lists is an exact search.
+    """
+    def __init__(self, n_lists=None, n_probe=8, iterations=10, seed=0):
+        """
+        Initializes an empty IVFIndex.
+
+        :param n_lists: The number of clusters. Defaults to the square root
+            of the number of vectors.
+        :param n_probe: The number of clusters searched per query.
+        :param iterations: The number of k-means iterations when building.
+        :param seed: The seed for the initial centroids.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids = np.empty((0, 0), dtype=np.float32)
+        # The vectors sorted by list; list i is rows offsets[i]:offsets[i + 1].
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def build(self, matrix):
+        """
+        Clusters a matrix of row-normalized vectors into inverted lists.
+
+        :param matrix: A 2-D float32 array, one unit-length vector per row.
+        """
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        n = len(matrix)
+        if n == 0:
+            self.rows = np.empty(0, dtype=np.int64)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            return
+        n_lists = min(n, self.n_lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(self.seed)
+        centroids = matrix[rng.choice(n, n_lists, replace=False)]
+        columns = np.ascontiguousarray(matrix.T)
+        for _ in range(self.iterations):
+            assignment = self._assign(matrix, centroids)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # One weighted bincount per dimension sums the vectors of every list.
+            sums = np.stack([np.bincount(assignment, weights=column, minlength=n_lists) for column in columns], axis=1)
+            sums = sums.astype(np.float32)
+            # Reseed empty lists with random vectors so no list stays unused.
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = matrix[rng.choice(n, len(empty), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+        assignment = self._assign(matrix, centroids)
+
+        order = np.argsort(assignment, kind='stable')
+        self.centroids = centroids
+        self.vectors = matrix[order]
+        self.rows = order.astype(np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=n_lists))))
+
+    @staticmethod
+    def _assign(matrix, centroids, batch_size=16384):
+        """
+        Assigns every vector to its most similar centroid.
+
+        :param matrix: The vectors to assign.
+        :param centroids: The list centroids.
+        :param batch_size: Rows scored at once, to bound memory.
+        :return: The list number of every vector.
+        """
+        assignment = np.empty(len(matrix), dtype=np.int64)
+        for start in range(0, len(matrix), batch_size):
+            batch = matrix[start:start + batch_size]
+            assignment[start:start + batch_size] = np.argmax(batch @ centroids.T, axis=1)
+        return assignment
+
+    def search(self, vector, k=1):
+        """
+        Finds the rows most similar to a unit-length query vector among the
+        n_probe closest lists.
+
+        :param vector: A 1-D float32 array.
+        :param k: The number of results.
+        :return: The row numbers and cosine similarities of the best matches.
+        """
+        if len(self.rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        lists = top_k_indices(self.centroids @ vector, self.n_probe)
+        candidates = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists])
+        scores = self.vectors[candidates] @ vector
+        top = top_k_indices(scores, k)
+        return self.rows[candidates[top]], scores[top]
@@ -1,20 +1,126 @@
+import copy
+import numpy as np
 import spacy
-import json
+from app.intents import IntentsRepository
+from app.nlp.index import BruteForceIndex
 from app.nlp.processor import NLPProcessor
 
+# Only tokenization and the tok2vec vectors are needed for similarity, so the
+# other components of the pipeline are not loaded at all.
+LEAN_EXCLUDE = ("tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter")
+
 class SpacyProcessor(NLPProcessor):
     """
     An NLP processor that uses the spaCy library.
+
+    The vectors of all intent patterns are computed once, cached by the
+    IntentsRepository and kept as a row-normalized NumPy matrix, so matching
+    a message costs one spaCy parse and one search of a VectorIndex over that
+    matrix instead of a parse per pattern.
     """
-    def __init__(self, model="en_core_web_sm"):
+    def __init__(self, model="en_core_web_sm", intents=None, exclude=LEAN_EXCLUDE, index=None):
         """
         Initializes the SpacyProcessor.
 
         :param model: The spaCy model to use.
+        :param intents: The shared IntentsRepository. A new one is loaded if not given.
+        :param exclude: Pipeline components not to load. Pass () for the full pipeline.
+        :param index: The VectorIndex to search the patterns with. Defaults to
+            an exact BruteForceIndex; use an IVFIndex for large intent sets.
+        """
+        self.nlp = spacy.load(model, exclude=list(exclude))
+        self.model = model
+        self.intents = intents if intents is not None else IntentsRepository()
+        self._index_template = index if index is not None else BruteForceIndex()
+        self._build(self.intents)
+        self.intents.subscribe(self._build)
+
+    @property
+    def pattern_tags(self):
+        """
+        The intent tag of every pattern.
+        """
+        return self._patterns[0]
+
+    @property
+    def pattern_matrix(self):
+        """
+        The normalized pattern vectors, one row per pattern.
+        """
+        return self._patterns[1]
+
+    @property
+    def index(self):
+        """
+        The VectorIndex over the pattern matrix.
         """
-        self.nlp = spacy.load(model)
-        with open('data/intents.json', 'r') as f:
-            self.intents = json.load(f)
+        return self._patterns[2]
+
+    def _build(self, intents):
+        """
+        Loads or computes the pattern vectors and builds a new index over them.
+
+        The tags, matrix and index are swapped in as one tuple, so requests
+        running during a reload see either the old or the new patterns.
+
+        :param intents: The IntentsRepository.
+        """
+        tags = list(intents.pattern_tags)
+        key = self._vectors_key()
+        matrix = intents.load_vectors(key)
+        if matrix is None or len(matrix) != len(tags):
+            matrix = self._compute_pattern_vectors(intents.patterns)
+            intents.save_vectors(key, matrix)
+        index = copy.copy(self._index_template)
+        index.build(matrix)
+        self._patterns = (tags, matrix, index)
+
+    def _vectors_key(self):
+        """
+        Identifies the model, so cached vectors are recomputed when it changes.
+
+        :return: A string key.
+        """
+        pipes = ','.join(self.nlp.pipe_names)
+        return f"{self.model}:{self.nlp.meta.get('version')}:{spacy.__version__}:{pipes}"
+
+    def _compute_pattern_vectors(self, patterns):
+        """
+        Parses every pattern once and stacks the normalized pattern vectors.
+
+        :param patterns: The pattern texts.
+        :return: The normalized pattern matrix.
+        """
+        vectors = [doc.vector for doc in self.nlp.pipe(pattern.lower() for pattern in patterns)]
+        matrix = np.array(vectors, dtype=np.float32).reshape(len(patterns), -1)
+        return self._normalize(matrix)
+
+    @staticmethod
+    def _normalize(matrix):
+        """
+        Scales every row to unit length, leaving all-zero rows at zero.
+
+        Zero vectors get a similarity of 0, as in spaCy's Doc.similarity.
+
+        :param matrix: A 2-D array of vectors.
+        :return: The row-normalized matrix.
+        """
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def top_k(self, text, k=5):
+        """
+        Finds the patterns most similar to the user input.
+
+        :param text: The user's input text.
+        :param k: The number of matches to return.
+        :return: A list of (tag, score) pairs, best first.
+        """
+        tags, _, index = self._patterns
+        doc = self.nlp(text.lower())
+        vector = self._normalize(np.asarray(doc.vector, dtype=np.float32))
+        rows, scores = index.search(vector, k)
+        return [(tags[row], float(score)) for row, score in zip(rows, scores)]
 
     def process(self, text):
         """
@@ -23,18 +129,38 @@ class SpacyProcessor(NLPProcessor):
         :param text: The user's input text.
         :return: The tag of the best matching intent.
         """
-        doc = self.nlp(text.lower())
-        best_match = {"tag": "default", "score": 0.0}
-
-        for intent in self.intents["intents"]:
-            for pattern in intent["patterns"]:
-                pattern_doc = self.nlp(pattern.lower())
-                similarity = doc.similarity(pattern_doc)
-                if similarity > best_match["score"]:
-                    best_match["score"] = similarity
-                    best_match["tag"] = intent["tag"]
-
-        if best_match["score"] > 0.7:  # Confidence threshold
-            return best_match["tag"]
+        return self._best_tag(self.top_k(text, k=1))
+
+    def process_batch(self, texts):
+        """
+        Processes several user inputs at once.
+
+        The inputs are parsed together with nlp.pipe and matched against the
+        patterns with one vectorized search.
+
+        :param texts: The users' input texts.
+        :return: The tag of the best matching intent of every input.
+        """
+        if not texts:
+            return []
+        tags, _, index = self._patterns
+        vectors = [doc.vector for doc in self.nlp.pipe(text.lower() for text in texts)]
+        matrix = self._normalize(np.array(vectors, dtype=np.float32).reshape(len(texts), -1))
+        results = index.search_batch(matrix, k=1)
+        return [
+            self._best_tag([(tags[row], float(score)) for row, score in zip(rows, scores)])
+            for rows, scores in results
+        ]
+
+    @staticmethod
+    def _best_tag(matches):
+        """
+        Picks the intent of the best match if it is confident enough.
+
+        :param matches: A list of (tag, score) pairs, best first.
+        :return: The tag of the best match, or "default".
+        """
+        if matches and matches[0][1] > 0.7:  # Confidence threshold
+            return matches[0][0]
         else:
             return "default"
@@ -0,0 +1,157 @@
+import math
+import re
+from collections import Counter
+import numpy as np
+from app.intents import IntentsRepository
+from app.nlp.index import top_k_indices
+from app.nlp.processor import NLPProcessor
+
+_WORD = re.compile(r"\w+")
+
+class TfidfProcessor(NLPProcessor):
+    """
+    An NLP processor that matches intents by TF-IDF over word and character
+    n-grams, using only NumPy.
+
+    The pattern matrix is stored in compressed sparse column form: for every
+    n-gram, the patterns containing it and their weights. Scoring a message
+    is a sparse matrix-vector product that only touches the columns of the
+    message's n-grams, so it needs no model and starts in milliseconds.
+    """
+    def __init__(self, intents=None, word_ngrams=(1, 2), char_ngrams=(3, 4), threshold=0.25):
+        """
+        Initializes the TfidfProcessor.
+
+        :param intents: The shared IntentsRepository. A new one is loaded if not given.
+        :param word_ngrams: The smallest and largest word n-gram sizes.
+        :param char_ngrams: The smallest and largest character n-gram sizes,
+            taken within words padded with spaces.
+        :param threshold: The minimum cosine similarity for a match.
+        """
+        self.word_ngrams = word_ngrams
+        self.char_ngrams = char_ngrams
+        self.threshold = threshold
+        self.intents = intents if intents is not None else IntentsRepository()
+        self._build(self.intents)
+        self.intents.subscribe(self._build)
+
+    def _features(self, text):
+        """
+        Extracts the word and character n-grams of a text.
+
+        :param text: The text.
+        :return: A Counter of n-gram -> count.
+        """
+        words = _WORD.findall(text.casefold())
+        features = Counter()
+        low, high = self.word_ngrams
+        for n in range(low, high + 1):
+            for i in range(len(words) - n + 1):
+                features["w:" + " ".join(words[i:i + n])] += 1
+        low, high = self.char_ngrams
+        for word in words:
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    features["c:" + padded[i:i + n]] += 1
+        return features
+
+    def _build(self, intents):
+        """
+        Builds the vocabulary, IDF weights and sparse pattern matrix.
+
+        The new state is swapped in as one tuple, so requests running during
+        a reload see either the old or the new patterns.
+
+        :param intents: The IntentsRepository.
+        """
+        tags = list(intents.pattern_tags)
+        pattern_features = [self._features(pattern) for pattern in intents.patterns]
+        vocabulary = {}
+        for features in pattern_features:
+            for feature in features:
+                vocabulary.setdefault(feature, len(vocabulary))
+        document_frequency = np.zeros(len(vocabulary), dtype=np.float64)
+        for features in pattern_features:
+            for feature in features:
+                document_frequency[vocabulary[feature]] += 1
+        # Smoothed IDF, as if one extra pattern contained every n-gram.
+        idf = np.log((1 + len(tags)) / (1 + document_frequency)) + 1
+
+        # Build the columns: for every n-gram, its patterns and weights.
+        columns = [[] for _ in range(len(vocabulary))]
+        for row, features in enumerate(pattern_features):
+            weights = {vocabulary[f]: (1 + math.log(count)) * idf[vocabulary[f]] for f, count in features.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for column, weight in weights.items():
+                columns[column].append((row, weight / norm))
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(column) for column in columns])
+        rows = np.fromiter((row for column in columns for row, _ in column), dtype=np.int64, count=indptr[-1])
+        data = np.fromiter((weight for column in columns for _, weight in column), dtype=np.float64, count=indptr[-1])
+        self._state = (tags, vocabulary, idf, indptr, rows, data)
+
+    def _scores(self, text, state):
+        """
+        Computes the cosine similarity of a text to every pattern.
+
+        :param text: The user's input text.
+        :param state: The tuple built by _build.
+        :return: A 1-D array with one score per pattern.
+        """
+        tags, vocabulary, idf, indptr, rows, data = state
+        weights = {}
+        unseen = 0
+        for feature, count in self._features(text).items():
+            column = vocabulary.get(feature)
+            if column is None:
+                unseen += 1
+            else:
+                weights[column] = (1 + math.log(count)) * idf[column]
+        if not weights:
+            return np.zeros(len(tags))
+        # The query is normalized over all of its n-grams, weighting unseen ones
+        # like the rarest n-gram, so messages with many unknown words score lower.
+        norm = math.sqrt(sum(w * w for w in weights.values()) + unseen * (math.log(1 + len(tags)) + 1) ** 2)
+        columns = np.fromiter(weights, dtype=np.int64, count=len(weights))
+        query = np.fromiter(weights.values(), dtype=np.float64, count=len(weights)) / norm
+        starts, stops = indptr[columns], indptr[columns + 1]
+        lengths = stops - starts
+        # Gather the touched columns' entries and sum them per pattern.
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.bincount(rows[positions], weights=data[positions] * np.repeat(query, lengths), minlength=len(tags))
+
+    def top_k(self, text, k=5):
+        """
+        Finds the patterns most similar to the user input.
+
+        :param text: The user's input text.
+        :param k: The number of matches to return.
+        :return: A list of (tag, score) pairs, best first.
+        """
+        state = self._state
+        scores = self._scores(text, state)
+        top = top_k_indices(scores, k)
+        return [(state[0][row], float(scores[row])) for row in top]
+
+    def process(self, text):
+        """
+        Processes the user input to find the best matching intent.
+
+        :param text: The user's input text.
+        :return: The tag of the best matching intent.
+        """
+        matches = self.top_k(text, k=1)
+        if matches and matches[0][1] > self.threshold:
+            return matches[0][0]
+        else:
+            return "default"
+
+    def process_batch(self, texts):
+        """
+        Processes several user inputs.
+
+        :param texts: The users' input texts.
+        :return: The tag of the best matching intent of every input.
+        """
+        return [self.process(text) for text in texts]
@@ -1,16 +1,17 @@
-import json
 import random
+from app.intents import IntentsRepository
 
 class ResponseGenerator:
     """
     A class to generate responses based on the identified intent.
     """
-    def __init__(self):
+    def __init__(self, intents=None):
         """
-        Initializes the ResponseGenerator and loads the intents.
+        Initializes the ResponseGenerator.
+
+        :param intents: The shared IntentsRepository. A new one is loaded if not given.
         """
-        with open('data/intents.json', 'r') as f:
-            self.intents = json.load(f)
+        self.intents = intents if intents is not None else IntentsRepository()
 
     def generate_response(self, intent_tag):
         """
@@ -19,7 +20,7 @@ class ResponseGenerator:
         :param intent_tag: The tag of the intent.
         :return: A response string.
         """
-        for intent in self.intents["intents"]:
-            if intent["tag"] == intent_tag:
-                return random.choice(intent["responses"])
+        responses = self.intents.get_responses(intent_tag)
+        if responses:
+            return random.choice(responses)
         return "I'm not sure how to respond to that. Can you ask me something else about Python?"
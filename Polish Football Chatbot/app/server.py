@@ -0,0 +1,229 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class LatencyStats:
+    """
+    Thread-safe latency and throughput counters for the chat service.
+    """
+    def __init__(self, window=10000):
+        """
+        Initializes the LatencyStats.
+
+        :param window: The number of most recent latencies kept for percentiles.
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    def record_batch(self, latencies):
+        """
+        Records the latencies of the requests answered in one batch.
+
+        :param latencies: The end-to-end latency of every request, in seconds.
+        """
+        with self._lock:
+            self._latencies.extend(latencies)
+            self.requests += len(latencies)
+            self.batches += 1
+
+    def summary(self):
+        """
+        Summarizes the counters.
+
+        :return: A dict with the request count, requests per second, mean
+            batch size and p50/p99 latency in milliseconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            requests, batches = self.requests, self.batches
+        elapsed = time.perf_counter() - self.started
+        return {
+            "requests": requests,
+            "requests_per_second": requests / elapsed if elapsed else 0.0,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "p50_ms": self._percentile(latencies, 0.50) * 1000,
+            "p99_ms": self._percentile(latencies, 0.99) * 1000,
+        }
+
+    @staticmethod
+    def _percentile(values, fraction):
+        """
+        Gets a percentile of sorted values by the nearest-rank method.
+
+        :param values: The sorted values.
+        :param fraction: The percentile as a fraction, e.g. 0.99.
+        :return: The percentile, or 0.0 without values.
+        """
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+class ChatService:
+    """
+    Answers messages from many threads by batching them.
+
+    Callers submit messages from any thread. A single batcher thread takes
+    whatever has queued up, at most max_batch messages or whatever arrives
+    within max_wait seconds of the first one, and answers them with one
+    ChatBot.get_responses call, so the messages share one nlp.pipe run and
+    one vectorized similarity search.
+    """
+    def __init__(self, chatbot, max_batch=64, max_wait=0.005):
+        """
+        Initializes the ChatService and starts its batcher thread.
+
+        :param chatbot: The ChatBot answering the messages.
+        :param max_batch: The maximum number of messages per batch.
+        :param max_wait: Seconds to wait for more messages after the first.
+        """
+        self.chatbot = chatbot
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = LatencyStats()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="chat-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, message):
+        """
+        Queues a message for the next batch.
+
+        :param message: The user's message.
+        :return: A Future that resolves to the chatbot's response.
+        """
+        future = Future()
+        self._queue.put((message, future, time.perf_counter()))
+        return future
+
+    def ask(self, message, timeout=None):
+        """
+        Gets the chatbot's response to a message, waiting for its batch.
+
+        :param message: The user's message.
+        :param timeout: The maximum number of seconds to wait.
+        :return: The chatbot's response.
+        """
+        return self.submit(message).result(timeout)
+
+    def _next_batch(self):
+        """
+        Blocks for one message, then collects more until the batch is full
+        or max_wait has passed.
+
+        :return: A list of (message, future, submitted) tuples.
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get(timeout=max(deadline - time.perf_counter(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Answers batches until the process exits.
+        """
+        while True:
+            batch = self._next_batch()
+            messages = [message for message, _, _ in batch]
+            try:
+                responses = self.chatbot.get_responses(messages)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            for (_, future, _), response in zip(batch, responses):
+                future.set_result(response)
+            self.stats.record_batch([done - submitted for _, _, submitted in batch])
+
+class ChatRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end of the ChatService.
+
+    POST /chat with {"message": "..."} returns {"response": "..."};
+    GET /stats returns the LatencyStats summary and the chatbot's cache stats.
+    """
+    service = None
+
+    def do_POST(self):
+        """
+        Answers a chat message.
+        """
+        if self.path != "/chat":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            message = json.loads(self.rfile.read(length))["message"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": 'Expected a JSON body like {"message": "..."}'})
+            return
+        try:
+            response = self.service.ask(str(message), timeout=30)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"response": response})
+
+    def do_GET(self):
+        """
+        Reports the service's latency, throughput and cache hit rate.
+        """
+        if self.path != "/stats":
+            self._send_json(404, {"error": "Not found"})
+            return
+        summary = self.service.stats.summary()
+        cache = getattr(self.service.chatbot, "cache", None)
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        self._send_json(200, summary)
+
+    def _send_json(self, status, body):
+        """
+        Sends a JSON response.
+
+        :param status: The HTTP status code.
+        :param body: The JSON-serializable body.
+        """
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """
+        Silences the per-request access log.
+        """
+        pass
+
+class ChatHTTPServer(ThreadingHTTPServer):
+    """
+    A ThreadingHTTPServer with a listen backlog large enough for bursts of
+    concurrent clients.
+    """
+    request_queue_size = 128
+    daemon_threads = True
+
+def create_server(service, host="127.0.0.1", port=8000):
+    """
+    Creates a threaded HTTP server for a ChatService.
+
+    :param service: The ChatService answering the requests.
+    :param host: The interface to listen on.
+    :param port: The port to listen on.
+    :return: A ChatHTTPServer; call serve_forever() to run it.
+    """
+    handler = type("BoundChatRequestHandler", (ChatRequestHandler,), {"service": service})
+    return ChatHTTPServer((host, port), handler)
@@ -0,0 +1,77 @@
+"""
+Cold-start benchmark for the chatbot.
+
+Every scenario runs in a fresh Python process, so import and model-loading
+costs are measured as a user launching the app would see them:
+
+- full:  the complete en_core_web_sm pipeline, loaded synchronously.
+- lean:  the pipeline without unused components, loaded synchronously.
+- async: the lean pipeline loaded on a background thread, as the GUI does.
+
+For each scenario the script reports the time until the ChatBot object
+exists (when the window could appear) and until the first response.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("full", "lean", "async")
+
+
+def run_scenario(scenario):
+    """
+    Measures one cold start in the current process.
+
+    :param scenario: One of SCENARIOS.
+    :return: A dict with the construction and first-response times in seconds.
+    """
+    start = time.perf_counter()
+    from app.chatbot import ChatBot
+    from app.nlp.spacy_processor import LEAN_EXCLUDE
+
+    exclude = () if scenario == "full" else LEAN_EXCLUDE
+    bot = ChatBot(background=(scenario == "async"), exclude=exclude)
+    constructed = time.perf_counter() - start
+
+    bot.wait_until_ready()
+    bot.get_response("Tell me about Legia Warsaw")
+    first_response = time.perf_counter() - start
+    return {"constructed": constructed, "first_response": first_response}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per scenario.")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        os.chdir(PROJECT_ROOT)
+        sys.path.insert(0, PROJECT_ROOT)
+        print(json.dumps(run_scenario(args.scenario)))
+        return
+
+    print(f"{'scenario':>8} {'window (s)':>12} {'first reply (s)':>16}")
+    for scenario in SCENARIOS:
+        results = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--scenario", scenario],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        constructed = statistics.median(r["constructed"] for r in results)
+        first_response = statistics.median(r["first_response"] for r in results)
+        print(f"{scenario:>8} {constructed:>12.3f} {first_response:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
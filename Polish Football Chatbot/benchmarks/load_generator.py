@@ -0,0 +1,67 @@
+"""
+Load generator for the headless chatbot service.
+
+Sends chat messages from many concurrent client threads to a running
+`python serve.py` and reports client-side p50/p99 latency and requests
+per second, followed by the server's own /stats.
+
+Usage:
+    python serve.py &
+    python benchmarks/load_generator.py [--url http://127.0.0.1:8000] [--clients 32] [--requests 2000]
+"""
+import argparse
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+MESSAGES = [
+    "Hi there",
+    "Tell me about Legia Warsaw",
+    "Who is Robert Lewandowski?",
+    "History of Polish Cup",
+    "Which club has won the most Ekstraklasa titles?",
+    "What is the Polish national team's best World Cup result?",
+    "Tell me about Lech Poznań",
+    "Thanks, bye",
+]
+
+
+def post_message(url, message):
+    """
+    Sends one chat message.
+
+    :return: The request latency in seconds.
+    """
+    body = json.dumps({"message": message}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/chat", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="The service's base URL.")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent client threads.")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send.")
+    args = parser.parse_args()
+
+    messages = [random.choice(MESSAGES) for _ in range(args.requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        latencies = sorted(pool.map(lambda message: post_message(args.url, message), messages))
+    elapsed = time.perf_counter() - start
+
+    p50 = latencies[int(0.50 * len(latencies))] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000
+    print(f"{len(latencies)} requests from {args.clients} clients in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} requests/s), p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+    with urllib.request.urlopen(f"{args.url}/stats") as response:
+        print("Server:", json.loads(response.read()))
+
+
+if __name__ == "__main__":
+    main()
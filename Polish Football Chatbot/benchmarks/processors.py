@@ -0,0 +1,82 @@
+"""
+Accuracy and latency benchmark of the NLP processors.
+
+Runs every processor over the labelled messages in benchmarks/intents_test.json
+(messages that no intent covers are labelled "default") and reports start-up
+time, accuracy and per-message p50/p99 latency.
+
+Processors whose dependencies are missing (e.g. no spaCy model installed)
+are skipped with a note.
+
+Usage:
+    python benchmarks/processors.py [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from app.intents import IntentsRepository
+
+TEST_SET = os.path.join(PROJECT_ROOT, "benchmarks", "intents_test.json")
+
+
+def create_processor(name, intents):
+    """
+    Creates a processor by name, importing it only when needed.
+
+    :param name: "tfidf" or "spacy".
+    :param intents: The shared IntentsRepository.
+    :return: The processor.
+    """
+    if name == "tfidf":
+        from app.nlp.tfidf_processor import TfidfProcessor
+        return TfidfProcessor(intents=intents)
+    from app.nlp.spacy_processor import SpacyProcessor
+    return SpacyProcessor(intents=intents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the test set.")
+    parser.add_argument("--processors", nargs="+", default=["tfidf", "spacy"], choices=["tfidf", "spacy"])
+    parser.add_argument("--errors", action="store_true", help="List the misclassified messages.")
+    args = parser.parse_args()
+
+    with open(TEST_SET, encoding="utf-8") as f:
+        cases = json.load(f)
+    intents = IntentsRepository()
+
+    print(f"{len(cases)} labelled messages, {len(intents.patterns)} patterns")
+    print(f"{'processor':>10} {'start (s)':>10} {'accuracy':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name in args.processors:
+        start = time.perf_counter()
+        try:
+            processor = create_processor(name, intents)
+        except (ImportError, OSError) as e:
+            print(f"{name:>10} skipped: {e}")
+            continue
+        startup = time.perf_counter() - start
+
+        predictions = [processor.process(case["text"]) for case in cases]
+        correct = sum(prediction == case["tag"] for prediction, case in zip(predictions, cases))
+        latencies = []
+        for _ in range(args.repeat):
+            for case in cases:
+                start = time.perf_counter()
+                processor.process(case["text"])
+                latencies.append(time.perf_counter() - start)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{name:>10} {startup:>10.3f} {correct / len(cases):>9.1%} {p50:>9.3f} {p99:>9.3f}")
+        if args.errors:
+            for prediction, case in zip(predictions, cases):
+                if prediction != case["tag"]:
+                    print(f"{'':>12}{case['text']!r}: expected {case['tag']}, got {prediction}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the pattern vector indexes.
+
+Builds synthetic intent sets of 1k, 10k and 100k unit-length pattern
+vectors (clustered around one centre per intent, like real paraphrases)
+and compares the exact BruteForceIndex with IVFIndex at several n_probe
+settings: build time, query latency and recall@k against the exact top-k.
+
+No spaCy model is needed, so the numbers isolate the index itself.
+
+Usage:
+    python benchmarks/vector_index.py [--dim 96] [--queries 500] [--k 5]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.nlp.index import BruteForceIndex, IVFIndex
+
+SIZES = (1_000, 10_000, 100_000)
+N_PROBES = (1, 4, 16, 64)
+
+
+def normalize(matrix):
+    return matrix / np.linalg.norm(matrix, axis=-1, keepdims=True)
+
+
+def make_patterns(n, dim, rng, patterns_per_intent=20):
+    """
+    Generates n pattern vectors grouped into intents.
+
+    :param n: The number of patterns.
+    :param dim: The vector width.
+    :param rng: A NumPy random generator.
+    :param patterns_per_intent: The average number of patterns per intent.
+    :return: A row-normalized float32 matrix.
+    """
+    centres = rng.standard_normal((max(1, n // patterns_per_intent), dim))
+    intents = rng.integers(0, len(centres), n)
+    patterns = centres[intents] + 0.6 * rng.standard_normal((n, dim))
+    return normalize(patterns).astype(np.float32)
+
+
+def time_queries(index, queries, k):
+    """
+    Runs every query through an index.
+
+    :return: The result rows of every query and the per-query latencies in seconds.
+    """
+    results = []
+    latencies = np.empty(len(queries))
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        rows, _ = index.search(query, k)
+        latencies[i] = time.perf_counter() - start
+        results.append(rows)
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=96, help="Vector width (96 for en_core_web_sm).")
+    parser.add_argument("--queries", type=int, default=500, help="Queries per configuration.")
+    parser.add_argument("--k", type=int, default=5, help="Results per query.")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'patterns':>9} {'index':>18} {'build (s)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'recall@1':>9} {f'recall@{args.k}':>9}")
+    for n in SIZES:
+        matrix = make_patterns(n, args.dim, rng)
+        picks = rng.integers(0, n, args.queries)
+        queries = normalize(matrix[picks] + 0.3 * rng.standard_normal((args.queries, args.dim)) / np.sqrt(args.dim))
+        queries = queries.astype(np.float32)
+
+        exact = BruteForceIndex()
+        indexes = [("brute force", exact)]
+        indexes += [(f"ivf n_probe={n_probe}", IVFIndex(n_probe=n_probe)) for n_probe in N_PROBES]
+        truth = None
+        for name, index in indexes:
+            start = time.perf_counter()
+            index.build(matrix)
+            build = time.perf_counter() - start
+            results, latencies = time_queries(index, queries, args.k)
+            if truth is None:
+                truth = results
+            recall_1 = np.mean([r[0] == t[0] for r, t in zip(results, truth)])
+            recall_k = np.mean([len(np.intersect1d(r, t)) / len(t) for r, t in zip(results, truth)])
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{n:>9} {name:>18} {build:>10.3f} {p50:>9.3f} {p99:>9.3f} {recall_1:>9.3f} {recall_k:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
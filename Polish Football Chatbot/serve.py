@@ -0,0 +1,28 @@
+import argparse
+from app.chatbot import ChatBot
+from app.server import ChatService, create_server
+
+if __name__ == "__main__":
+    """
+    Headless entry point: serves the chatbot over HTTP for many concurrent users.
+    """
+    parser = argparse.ArgumentParser(description="Serve the chatbot over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="The interface to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="The port to listen on.")
+    parser.add_argument("--max-batch", type=int, default=64, help="The maximum number of messages per batch.")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Milliseconds to wait for more messages after the first of a batch.")
+    parser.add_argument("--processor", choices=ChatBot.PROCESSORS, default="spacy",
+                        help="The NLP processor; tfidf needs no spaCy model.")
+    args = parser.parse_args()
+
+    service = ChatService(ChatBot(processor=args.processor), max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    server = create_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} (POST /chat, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(service.stats.summary())
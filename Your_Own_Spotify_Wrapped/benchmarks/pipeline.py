@@ -0,0 +1,203 @@
+"""
+Benchmark of the Wrapped pipeline on synthetic exports.
+
+Generates synthetic exports (wrapped/synthetic.py) of 100k, 1M and 10M
+plays once, caches them under --data-dir, and times every stage of the
+pipeline on them: load, feature extraction, top-N, streaks, unique days
+and seasonal top-N. Every stage runs twice, once for the time and once
+under tracemalloc for its peak memory, so the tracing overhead does not
+distort the times.
+
+With --baseline the notebook's original pandas code runs as well
+(json.load, .dt features, per-year groupby copies, apply(longest_streak),
+apply(month_to_season)), so each optimization can be measured against
+it. The baseline json.loads the whole export, so keep it to the smaller
+sizes.
+
+Usage:
+    python benchmarks/pipeline.py [--sizes 100000 1000000 10000000] [--baseline]
+        [--data-dir benchmarks/data] [--output results.csv] [--label my-change]
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from wrapped.loader import find_export_files, load_streaming_history
+from wrapped.report import WrappedReport
+from wrapped.streaks import compute_streaks, longest_streak
+from wrapped.synthetic import generate_export
+
+SIZES = (100_000, 1_000_000, 10_000_000)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ARTIST = 'master_metadata_album_artist_name'
+ALBUM = 'master_metadata_album_album_name'
+TRACK = 'master_metadata_track_name'
+
+# A stage takes the state of the earlier stages and returns what it adds to it.
+Stage = Tuple[str, Callable[[Dict], Dict]]
+
+
+def pipeline_stages(year: int) -> List[Stage]:
+    """The stages of the optimized pipeline."""
+    return [
+        ('load', lambda state: {'plays': load_streaming_history(state['files'])}),
+        ('features', lambda state: {'report': WrappedReport(state['plays'])}),
+        ('top_n', lambda state: {'top': [state['report'].top(dimension, year) for dimension in ('artist', 'album', 'track')]}),
+        ('streaks', lambda state: {'streaks': compute_streaks(
+            state['plays'][state['plays']['ts'].dt.year == year], by=TRACK)}),
+        ('unique_days', lambda state: {'unique_days': state['report'].unique_days('track', year)}),
+        ('seasonal', lambda state: {'seasonal': state['report'].top_by_season(year)}),
+    ]
+
+
+def _month_to_season(month):
+    if month in [12, 1, 2]:
+        return 'Winter'
+    elif month in [3, 4, 5]:
+        return 'Spring'
+    elif month in [6, 7, 8]:
+        return 'Summer'
+    else:
+        return 'Autumn'
+
+
+def _baseline_load(files: List[str]) -> pd.DataFrame:
+    data = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            data.extend(json.load(f))
+    return pd.DataFrame(data)
+
+
+def _baseline_features(df: pd.DataFrame) -> pd.DataFrame:
+    df['ts'] = pd.to_datetime(df['ts'])
+    df['year'] = df['ts'].dt.year
+    df['month'] = df['ts'].dt.month
+    df['day'] = df['ts'].dt.day
+    df['weekday'] = df['ts'].dt.day_name()
+    df['hour'] = df['ts'].dt.hour
+    return df
+
+
+def _baseline_top(df: pd.DataFrame, year: int) -> List[pd.DataFrame]:
+    tables = []
+    for keys in ([ARTIST], [ARTIST, ALBUM], [ARTIST, TRACK]):
+        df_year = df[df['year'] == year].copy()
+        table = df_year.groupby(keys)['ms_played'].sum().reset_index()
+        table['hours_played'] = (table['ms_played'] / (1000 * 60 * 60)).round(2)
+        tables.append(table.sort_values(by='hours_played', ascending=False).head(10))
+    return tables
+
+
+def _baseline_streaks(df: pd.DataFrame, year: int) -> pd.Series:
+    df_year = df[df['year'] == year].copy()
+    df_year['date'] = df_year['ts'].dt.date
+    songs = df_year[[TRACK, 'date']].drop_duplicates()
+    return songs.groupby(TRACK)['date'].apply(longest_streak)
+
+
+def _baseline_unique_days(df: pd.DataFrame, year: int) -> pd.Series:
+    df_year = df[df['year'] == year].copy()
+    df_year['date'] = df_year['ts'].dt.date
+    return df_year.groupby(TRACK)['date'].nunique().sort_values(ascending=False).head(10)
+
+
+def _baseline_seasonal(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    df['season'] = df['ts'].dt.month.apply(_month_to_season)
+    df_year = df[df['ts'].dt.year == year].copy()
+    table = df_year.groupby(['season', ARTIST])['ms_played'].sum().reset_index()
+    table = table.sort_values(['season', 'ms_played'], ascending=[True, False])
+    table['rank'] = table.groupby('season')['ms_played'].rank(method='first', ascending=False)
+    return table[table['rank'] <= 3]
+
+
+def baseline_stages(year: int) -> List[Stage]:
+    """The stages as the notebook originally computed them."""
+    return [
+        ('load', lambda state: {'plays': _baseline_load(state['files'])}),
+        ('features', lambda state: {'plays': _baseline_features(state['plays'])}),
+        ('top_n', lambda state: {'top': _baseline_top(state['plays'], year)}),
+        ('streaks', lambda state: {'streaks': _baseline_streaks(state['plays'], year)}),
+        ('unique_days', lambda state: {'unique_days': _baseline_unique_days(state['plays'], year)}),
+        ('seasonal', lambda state: {'seasonal': _baseline_seasonal(state['plays'], year)}),
+    ]
+
+
+def run_stages(stages: List[Stage], files: List[str], trace_memory: bool) -> List[Tuple[str, float, float]]:
+    """
+    Run the stages in order on fresh state.
+
+    Returns:
+        (stage, seconds, peak MB) per stage; the peak is NaN unless trace_memory.
+    """
+    state = {'files': files}
+    results = []
+    for name, stage in stages:
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        state.update(stage(state))
+        seconds = time.perf_counter() - start
+        peak = float('nan')
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        results.append((name, seconds, peak))
+    return results
+
+
+def ensure_export(size: int, data_dir: str, seed: int) -> List[str]:
+    """The export files of a size, generated on the first run."""
+    folder = os.path.join(data_dir, f'plays_{size}_seed{seed}')
+    files = find_export_files(folder)
+    if not files:
+        start = time.perf_counter()
+        files = generate_export(folder, size, seed=seed)
+        print(f"Generated {size:,} plays in {len(files)} files in {time.perf_counter() - start:.1f}s", flush=True)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES[:2]))
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--year', type=int, default=2024, help='The year of the yearly stages')
+    parser.add_argument('--baseline', action='store_true', help="Also run the notebook's original code")
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--output', help='CSV file the results are appended to')
+    parser.add_argument('--label', default='', help='Label of this run in the CSV, e.g. the change measured')
+    args = parser.parse_args()
+
+    pipelines = [('optimized', pipeline_stages(args.year))]
+    if args.baseline:
+        pipelines.append(('baseline', baseline_stages(args.year)))
+
+    rows = []
+    print(f"{'plays':>11} {'pipeline':>9} {'stage':>12} {'seconds':>9} {'peak MB':>9}")
+    for size in args.sizes:
+        files = ensure_export(size, args.data_dir, args.seed)
+        for pipeline, stages in pipelines:
+            timings = run_stages(stages, files, trace_memory=False)
+            peaks = run_stages(stages, files, trace_memory=True) if not args.no_memory else timings
+            for (stage, seconds, _), (_, _, peak) in zip(timings, peaks):
+                print(f"{size:>11,} {pipeline:>9} {stage:>12} {seconds:>9.3f} {peak:>9.1f}", flush=True)
+                rows.append({'label': args.label, 'plays': size, 'pipeline': pipeline, 'stage': stage,
+                             'seconds': seconds, 'peak_mb': peak})
+
+    if args.output:
+        results = pd.DataFrame(rows)
+        results.insert(0, 'timestamp', pd.Timestamp.now().isoformat(timespec='seconds'))
+        results.to_csv(args.output, mode='a', header=not os.path.exists(args.output), index=False)
+
+
+if __name__ == '__main__':
+    main()
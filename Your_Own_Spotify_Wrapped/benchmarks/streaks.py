@@ -0,0 +1,77 @@
+"""
+Benchmark of the listening-streak computation.
+
+Generates a synthetic year of plays (tracks drawn from a Zipf distribution,
+so popular tracks are played on many consecutive days) and compares the
+notebook's groupby(...).apply(longest_streak) with compute_streaks: run
+time and whether both give the same longest streak for every track.
+
+Usage:
+    python benchmarks/streaks.py [--plays 100000 1000000] [--tracks 20000]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from wrapped.streaks import compute_streaks, longest_streak
+
+KEY = 'master_metadata_track_name'
+
+
+def make_plays(n: int, tracks: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Generate n plays spread over 2024.
+
+    Args:
+        n: The number of plays.
+        tracks: The number of distinct tracks.
+        rng: A NumPy random generator.
+
+    Returns:
+        A DataFrame with ts and a categorical track name column.
+    """
+    ranks = (rng.zipf(1.3, n) - 1) % tracks
+    seconds = np.sort(rng.integers(0, 366 * 86400, n))
+    ts = pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(seconds, unit='s')
+    names = pd.Categorical.from_codes(ranks, categories=[f'Track {i}' for i in range(tracks)])
+    return pd.DataFrame({'ts': ts, KEY: names})
+
+
+def reference(plays: pd.DataFrame) -> pd.Series:
+    """The notebook's streaks: per-track apply of longest_streak on distinct dates."""
+    songs = pd.DataFrame({KEY: plays[KEY].astype(object), 'date': plays['ts'].dt.date}).drop_duplicates()
+    return songs.groupby(KEY)['date'].apply(longest_streak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plays', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--tracks', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'plays':>10} {'keys':>7} {'apply s':>9} {'vectorized s':>13} {'speedup':>8}  identical")
+    for n in args.plays:
+        plays = make_plays(n, args.tracks, rng)
+
+        start = time.perf_counter()
+        expected = reference(plays)
+        apply_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streaks = compute_streaks(plays, by=KEY)
+        vectorized_seconds = time.perf_counter() - start
+
+        identical = (expected.index.tolist() == streaks[KEY].tolist()
+                     and np.array_equal(expected.to_numpy(), streaks['longest_streak_days'].to_numpy()))
+        print(f"{n:>10,} {len(streaks):>7,} {apply_seconds:>9.3f} {vectorized_seconds:>13.3f} "
+              f"{apply_seconds / vectorized_seconds:>7.1f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
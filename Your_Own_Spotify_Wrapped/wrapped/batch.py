@@ -0,0 +1,218 @@
+"""
+Batch Wrapped Generation.
+
+This module builds the Wrapped of many accounts in parallel, including:
+- find_user_folders: Finds the per-user export folders of an input directory.
+- build_user_wrapped: Builds and writes one user's Wrapped.
+- run_batch: Builds every user's Wrapped in a process pool.
+
+The input directory holds one folder per user with that user's
+`Streaming_History_Audio_*.json` files. Every user is handled by one
+worker process: the export is streamed in by the loader, WrappedReport
+computes the statistics, and the tables (CSV) and charts (PNG, rendered
+with matplotlib's non-interactive Agg backend) go to `<output>/<user>/`.
+A failing user is reported in the summary instead of stopping the batch.
+
+Usage:
+    python -m wrapped.batch INPUT_DIR OUTPUT_DIR [--workers 4] [--year 2024]
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+import argparse
+import importlib.util
+import os
+import time
+import traceback
+import pandas as pd
+
+from .loader import find_export_files, load_streaming_history
+from .report import WrappedReport
+from .streaks import compute_streaks
+
+SUMMARY_NAME = 'summary.csv'
+
+
+def find_user_folders(input_dir: str) -> List[str]:
+    """Find the subfolders of input_dir that contain export files, sorted by name."""
+    return [
+        os.path.join(input_dir, name) for name in sorted(os.listdir(input_dir))
+        if os.path.isdir(os.path.join(input_dir, name)) and find_export_files(os.path.join(input_dir, name))
+    ]
+
+
+def _check_chart_support():
+    """Raise a clear ImportError up front if charts are requested without matplotlib."""
+    if importlib.util.find_spec('matplotlib') is None:
+        raise ImportError("Rendering charts requires matplotlib: pip install matplotlib "
+                          "(or pip install -r requirements.txt), or pass --no-charts to write the tables only.")
+
+
+def _render_charts(report: WrappedReport, year: int, directory: str):
+    """Render the notebook's monthly, weekday and hourly charts of a year as PNG files."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    charts = (
+        ('month', 'monthly.png', 'Monthly Listening Hours', 'Month', (10, 5)),
+        ('weekday', 'weekday.png', 'Listening Hours by Day of Week', 'Day of Week', (10, 5)),
+        ('hour', 'hourly.png', 'Listening Hours by Hour of Day', 'Hour of Day', (12, 5)),
+    )
+    for period, filename, title, xlabel, size in charts:
+        table = report.by_period(period, year)
+        fig, ax = plt.subplots(figsize=size)
+        labels = table[period].astype(str)
+        if period == 'hour':
+            ax.plot(table[period], table['hours_played'], marker='o')
+            ax.set_xticks(range(0, 24))
+        else:
+            ax.bar(labels, table['hours_played'])
+        ax.set_title(f'{title} in {year}')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('Hours Played')
+        fig.tight_layout()
+        fig.savefig(os.path.join(directory, filename), dpi=100)
+        plt.close(fig)
+
+
+def build_user_wrapped(
+    user_dir: str,
+    output_dir: str,
+    year: Optional[int] = None,
+    top_n: int = 10,
+    charts: bool = True,
+) -> Dict:
+    """
+    Build one user's Wrapped and write it to output_dir/<user>/.
+
+    Args:
+        user_dir: The folder with the user's export files.
+        output_dir: The batch output directory.
+        year: The Wrapped year. Defaults to the user's latest year.
+        top_n: The number of rows of the top-N tables.
+        charts: Whether to render the charts.
+
+    Returns:
+        A summary dict: user, plays, year, the seconds spent loading,
+        computing and writing, the total seconds, and error (None if the
+        user succeeded).
+    """
+    user = os.path.basename(os.path.normpath(user_dir))
+    result = {'user': user, 'plays': 0, 'year': None, 'load_seconds': 0.0, 'report_seconds': 0.0,
+              'write_seconds': 0.0, 'seconds': 0.0, 'error': None}
+    start = time.perf_counter()
+    try:
+        plays = load_streaming_history(find_export_files(user_dir))
+        loaded = time.perf_counter()
+        result['load_seconds'] = loaded - start
+        result['plays'] = len(plays)
+
+        report = WrappedReport(plays)
+        if not report.years:
+            raise ValueError('no plays with a timestamp')
+        year = year if year is not None else report.years[-1]
+        result['year'] = year
+        in_year = plays['ts'].dt.year == year
+        tables = {
+            'yearly': report.yearly(),
+            'monthly_pivot': report.monthly_pivot().reset_index(),
+            'top_artists': report.top('artist', year, top_n),
+            'top_albums': report.top('album', year, top_n),
+            'top_tracks': report.top('track', year, top_n),
+            'monthly': report.by_period('month', year),
+            'weekday': report.by_period('weekday', year),
+            'hourly': report.by_period('hour', year),
+            'top_by_season': report.top_by_season(year, n=3),
+            'unique_days': report.unique_days('track', year, top_n),
+            'streaks': compute_streaks(plays[in_year]).nlargest(top_n, 'longest_streak_days', keep='first'),
+        }
+        computed = time.perf_counter()
+        result['report_seconds'] = computed - loaded
+
+        directory = os.path.join(output_dir, user)
+        os.makedirs(directory, exist_ok=True)
+        for name, table in tables.items():
+            table.to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+        if charts:
+            _render_charts(report, year, directory)
+        result['write_seconds'] = time.perf_counter() - computed
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+        traceback.print_exc()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(
+    input_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    year: Optional[int] = None,
+    top_n: int = 10,
+    charts: bool = True,
+) -> pd.DataFrame:
+    """
+    Build the Wrapped of every user folder in input_dir in a process pool.
+
+    Args:
+        input_dir: The directory of per-user export folders.
+        output_dir: The output directory; gets one folder per user and summary.csv.
+        workers: The number of worker processes. Defaults to the CPU count.
+        year: The Wrapped year of every user. Defaults to each user's latest year.
+        top_n: The number of rows of the top-N tables.
+        charts: Whether to render the charts.
+
+    Returns:
+        The per-user summary, one row per user in folder order.
+
+    Raises:
+        ImportError: If charts are requested and matplotlib is not installed.
+    """
+    if charts:
+        _check_chart_support()
+    user_dirs = find_user_folders(input_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_user_wrapped, user_dir, output_dir, year, top_n, charts) for user_dir in user_dirs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = 'ok' if result['error'] is None else f"failed ({result['error']})"
+            print(f"[{len(results)}/{len(user_dirs)}] {result['user']}: {result['plays']:,} plays "
+                  f"in {result['seconds']:.2f}s {status}", flush=True)
+    elapsed = time.perf_counter() - start
+
+    summary = pd.DataFrame(results, columns=[
+        'user', 'plays', 'year', 'load_seconds', 'report_seconds', 'write_seconds', 'seconds', 'error'])
+    summary['year'] = summary['year'].astype('Int64')
+    summary = summary.sort_values('user', ignore_index=True)
+    summary.to_csv(os.path.join(output_dir, SUMMARY_NAME), index=False)
+
+    succeeded = summary[summary['error'].isna()]
+    print(f"{len(succeeded)}/{len(summary)} users, {succeeded['plays'].sum():,} plays in {elapsed:.2f}s: "
+          f"{len(summary) / elapsed if elapsed else 0:.2f} users/s, "
+          f"{succeeded['plays'].sum() / elapsed if elapsed else 0:,.0f} plays/s")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the Wrapped of many Spotify exports in parallel.')
+    parser.add_argument('input_dir', help='Directory with one folder of export files per user')
+    parser.add_argument('output_dir', help='Directory the per-user reports are written to')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--year', type=int, default=None, help="Wrapped year (default: each user's latest year)")
+    parser.add_argument('--top', type=int, default=10, help='Rows of the top-N tables')
+    parser.add_argument('--no-charts', action='store_true', help='Write the tables only')
+    args = parser.parse_args()
+    try:
+        run_batch(args.input_dir, args.output_dir, workers=args.workers, year=args.year,
+                  top_n=args.top, charts=not args.no_charts)
+    except ImportError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Listening Rollup Cube.
+
+This module pre-aggregates the streaming history for fast repeated
+queries, including:
+- ListeningCube: Plays rolled up to one row per (date, artist, album,
+  track), persisted as Parquet and answered through a WrappedReport.
+
+Every statistic of the notebook except the hourly one only needs the
+date and the names of a play, so the cube keeps one cell per day and
+track with its play count, ms_played and first and last play timestamps.
+Building it is one sort of the plays; afterwards the yearly, monthly,
+weekday, seasonal, top-N, unique-days and streak analyses roll up the
+cells instead of rescanning every play. ListeningCube.for_store keeps
+the cube next to a HistoryStore and rebuilds it only when the store got
+new plays.
+"""
+
+from typing import Optional, Sequence, Union
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .report import ALBUM, ARTIST, DIMENSIONS, TRACK, WrappedReport, key_codes
+from .store import HistoryStore
+from .streaks import compute_streaks
+
+CUBE_NAME = '_cube.parquet'
+KEY_COLUMNS = (ARTIST, ALBUM, TRACK)
+# The play columns the cube is built from.
+CUBE_COLUMNS = ('ts', 'ms_played') + KEY_COLUMNS
+_MS_PER_DAY = 24 * 60 * 60 * 1000
+# Parquet metadata key recording the store's latest play when the cube was built.
+_MAX_TS_KEY = b'wrapped.max_ts'
+
+
+class ListeningCube:
+    """
+    Plays aggregated to (date, artist, album, track) cells.
+    """
+
+    def __init__(self, cells: pd.DataFrame, max_ts: Optional[str] = None):
+        """
+        Args:
+            cells: One row per cell with date, the KEY_COLUMNS, plays,
+                ms_played, first_ts and last_ts, as made by build().
+            max_ts: The latest play timestamp of the store the cube was
+                built from, if any.
+        """
+        self.cells = cells
+        self.max_ts = max_ts
+        self._report: Optional[WrappedReport] = None
+
+    @classmethod
+    def build(cls, plays: pd.DataFrame, max_ts: Optional[str] = None) -> 'ListeningCube':
+        """
+        Aggregate plays into cells.
+
+        Args:
+            plays: One row per play with the CUBE_COLUMNS. Plays with missing
+                names (e.g. podcast episodes) are kept in cells with missing
+                names, so yearly totals still include them.
+            max_ts: Recorded with the cube, see for_store().
+
+        Returns:
+            The cube, its cells sorted by date.
+        """
+        plays = plays[plays['ts'].notna()]
+        ts = plays['ts']
+        if ts.dt.tz is not None:
+            ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+        play_ms = ts.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+        days = play_ms // _MS_PER_DAY
+        codes, keys = key_codes(plays, KEY_COLUMNS, keep_missing=True)
+
+        first_day = days.min(initial=0)
+        # One int64 per play orders the plays by (date, key); runs of equal values are cells.
+        cell_keys = (days - first_day) * max(len(keys), 1) + codes
+        order = np.argsort(cell_keys, kind='stable')
+        cell_keys, play_ms = cell_keys[order], play_ms[order]
+        ms_played = plays['ms_played'].to_numpy(np.int64)[order]
+        starts = np.flatnonzero(np.r_[True, cell_keys[1:] != cell_keys[:-1]]) if len(cell_keys) else np.empty(0, np.int64)
+
+        cells = keys.iloc[cell_keys[starts] % max(len(keys), 1)].reset_index(drop=True).astype('category')
+        cells.insert(0, 'date', ((cell_keys[starts] // max(len(keys), 1) + first_day) * _MS_PER_DAY).astype('datetime64[ms]'))
+        cells['plays'] = np.diff(np.append(starts, len(cell_keys)))
+        cells['ms_played'] = np.add.reduceat(ms_played, starts) if len(starts) else np.empty(0, np.int64)
+        for name, reduce in (('first_ts', np.minimum), ('last_ts', np.maximum)):
+            values = reduce.reduceat(play_ms, starts) if len(starts) else np.empty(0, np.int64)
+            cells[name] = pd.Series(values.astype('datetime64[ms]')).dt.tz_localize('UTC')
+        return cls(cells, max_ts)
+
+    @classmethod
+    def for_store(cls, store: HistoryStore) -> 'ListeningCube':
+        """
+        Load the cube saved in a store, building and saving it first if it is
+        missing or older than the store's latest ingest.
+
+        Args:
+            store: The HistoryStore.
+
+        Returns:
+            The cube of all plays in the store.
+        """
+        path = os.path.join(store.root, CUBE_NAME)
+        max_ts = store.manifest['max_ts']
+        if os.path.exists(path):
+            cube = cls.load(path)
+            if cube.max_ts == max_ts:
+                return cube
+        cube = cls.build(store.read(columns=list(CUBE_COLUMNS)), max_ts=max_ts)
+        if max_ts is not None:
+            cube.save(path)
+        return cube
+
+    def save(self, path: str):
+        """Save the cube as one Parquet file, atomically."""
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        if self.max_ts is not None:
+            table = table.replace_schema_metadata({**table.schema.metadata, _MAX_TS_KEY: self.max_ts.encode()})
+        temp_path = f'{path}.tmp'
+        pq.write_table(table, temp_path, compression='zstd')
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ListeningCube':
+        """Load a cube saved by save()."""
+        table = pq.read_table(path)
+        max_ts = (table.schema.metadata or {}).get(_MAX_TS_KEY)
+        return cls(table.to_pandas(), max_ts.decode() if max_ts else None)
+
+    def report(self) -> WrappedReport:
+        """
+        The WrappedReport over the cells. Its yearly, period (all but
+        'hour'), top, top_by_season and unique_days tables equal those of a
+        WrappedReport over the plays. Built on the first call.
+        """
+        if self._report is None:
+            self._report = WrappedReport(self.cells, ts='date', hours=False)
+        return self._report
+
+    def streaks(self, by: Union[str, Sequence[str]] = TRACK, year: Optional[int] = None) -> pd.DataFrame:
+        """
+        The longest and current listening streaks, see compute_streaks.
+
+        Args:
+            by: The key column(s).
+            year: Only count the days of this year. Defaults to all years.
+        """
+        cells = self.cells
+        if year is not None:
+            cells = cells[cells['date'].dt.year == year]
+        return compute_streaks(cells, by=by, ts='date')
+
+    def first_and_last(self, dimension: str = 'artist') -> pd.DataFrame:
+        """
+        When every artist, album or track was first and last played.
+
+        Args:
+            dimension: 'artist', 'album' or 'track'.
+
+        Returns:
+            A DataFrame with the key column(s), plays, ms_played, first_ts
+            and last_ts, first discovered first.
+        """
+        codes, keys = key_codes(self.cells, DIMENSIONS[dimension])
+        known = codes >= 0
+        codes = codes[known]
+        size = len(keys)
+        first = np.full(size, np.iinfo(np.int64).max)
+        last = np.full(size, np.iinfo(np.int64).min)
+        np.minimum.at(first, codes, self.cells['first_ts'].to_numpy(dtype='datetime64[ms]')[known].astype(np.int64))
+        np.maximum.at(last, codes, self.cells['last_ts'].to_numpy(dtype='datetime64[ms]')[known].astype(np.int64))
+        keys['plays'] = np.bincount(codes, weights=self.cells['plays'].to_numpy()[known], minlength=size).astype(np.int64)
+        keys['ms_played'] = np.bincount(codes, weights=self.cells['ms_played'].to_numpy()[known], minlength=size).astype(np.int64)
+        keys = keys[keys['plays'] > 0].copy()
+        played = keys.index.to_numpy()
+        keys['first_ts'] = pd.Series(first[played].astype('datetime64[ms]'), index=keys.index).dt.tz_localize('UTC')
+        keys['last_ts'] = pd.Series(last[played].astype('datetime64[ms]'), index=keys.index).dt.tz_localize('UTC')
+        return keys.sort_values('first_ts', kind='stable', ignore_index=True)
@@ -0,0 +1,377 @@
+"""
+Wrapped Report.
+
+This module computes the notebook's yearly listening statistics from one
+set of parsed arrays, including:
+- time_features: Splits play timestamps into integer calendar fields.
+- key_codes: Integer-codes the combinations of key columns.
+- WrappedReport: Yearly, monthly, weekday, hourly and seasonal totals and
+  top artists, albums and tracks for every year.
+
+WrappedReport parses the timestamps once and integer-codes the artist,
+album and track keys once. The plays are then sorted by year a single
+time, so each year is a contiguous slice of the arrays: a statistic for
+one year is an np.bincount over that slice (a view, not a copy of the
+DataFrame), and the time statistics of all years come from one bincount
+over (year, month/weekday/hour/season) codes. Results are cached, so
+asking for the same table twice costs nothing.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+MS_PER_HOUR = 1000 * 60 * 60
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+SEASONS = ('Winter', 'Spring', 'Summer', 'Autumn')
+# Month (1-12) -> index in SEASONS; index 0 is unused.
+SEASON_OF_MONTH = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+ARTIST = 'master_metadata_album_artist_name'
+ALBUM = 'master_metadata_album_album_name'
+TRACK = 'master_metadata_track_name'
+# Dimension -> the columns identifying it; albums and tracks are told apart by artist.
+DIMENSIONS: Dict[str, Tuple[str, ...]] = {
+    'artist': (ARTIST,),
+    'album': (ARTIST, ALBUM),
+    'track': (ARTIST, TRACK),
+}
+# Time dimension -> number of values per year.
+PERIODS = {'month': 12, 'weekday': 7, 'hour': 24, 'season': 4}
+
+
+def time_features(ts: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Split play timestamps into calendar fields, in UTC like the export.
+
+    Args:
+        ts: A datetime Series, timezone-aware or naive, without missing values.
+
+    Returns:
+        A dict of int arrays: year, month (1-12), day (days since
+        1970-01-01), weekday (0 is Monday) and hour.
+    """
+    if getattr(ts.dt, 'tz', None) is not None:
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+    values = ts.to_numpy()
+    months = values.astype('datetime64[M]').astype(np.int64)
+    days = values.astype('datetime64[D]')
+    day_numbers = days.astype(np.int64)
+    return {
+        'year': (months // 12 + 1970).astype(np.int32),
+        'month': (months % 12 + 1).astype(np.int8),
+        'day': day_numbers,
+        # 1970-01-01 was a Thursday.
+        'weekday': ((day_numbers + 3) % 7).astype(np.int8),
+        'hour': ((values - days) // np.timedelta64(1, 'h')).astype(np.int8),
+    }
+
+
+def _codes(column: pd.Series, keep_missing: bool = False) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Integer-code a key column: the codes (-1 if missing, unless keep_missing
+    gives missing values a code of their own) and the unique values.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, values = column.cat.codes.to_numpy(np.int64), column.cat.categories
+    else:
+        codes, uniques = pd.factorize(column)
+        codes, values = codes.astype(np.int64), pd.Index(uniques)
+    if keep_missing and (codes < 0).any():
+        codes = np.where(codes < 0, len(values), codes)
+        values = values.append(pd.Index([None], dtype=values.dtype))
+    return codes, values
+
+
+def key_codes(
+    frame: pd.DataFrame,
+    columns: Sequence[str],
+    keep_missing: bool = False,
+) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Integer-code the distinct combinations of one or more key columns.
+
+    Every column is coded on its own (categorical codes cost nothing), and
+    the column codes are combined into one int64 per row, which hashes much
+    faster than tuples of strings.
+
+    Args:
+        frame: The rows.
+        columns: The key columns.
+        keep_missing: Code missing values like any other value, instead of
+            giving the row -1.
+
+    Returns:
+        The key code of every row (-1 if any column is missing) and a
+        DataFrame with the column values of every key code.
+    """
+    codes, values = _codes(frame[columns[0]], keep_missing)
+    keys = pd.DataFrame({columns[0]: values})
+    for column in columns[1:]:
+        inner, inner_values = _codes(frame[column], keep_missing)
+        combined = np.where((codes < 0) | (inner < 0), -1, codes * len(inner_values) + inner)
+        combined_codes, uniques = pd.factorize(combined)
+        # -1 is an ordinary value to factorize; renumber so it stays -1 and the rest are 0..n-1.
+        present = uniques >= 0
+        renumber = np.full(len(uniques), -1, dtype=np.int64)
+        renumber[present] = np.arange(present.sum())
+        uniques = uniques[present]
+        codes = renumber[combined_codes]
+        keys = keys.iloc[uniques // len(inner_values)].reset_index(drop=True)
+        keys[column] = inner_values.take(uniques % len(inner_values))
+    return codes, keys
+
+
+class WrappedReport:
+    """
+    The yearly Wrapped statistics of one listening history.
+    """
+
+    def __init__(self, plays: pd.DataFrame, ts: str = 'ts', hours: bool = True):
+        """
+        Args:
+            plays: One row per play, with ts, ms_played and the artist, album
+                and track name columns, e.g. from HistoryStore.read(). Rows
+                may also be pre-aggregated plays, like the cells of a
+                ListeningCube, as every statistic sums ms_played.
+            ts: The play timestamp column.
+            hours: Whether ts has the time of day; if not, there are no
+                hourly statistics.
+        """
+        valid = plays[ts].notna().to_numpy()
+        features = time_features(plays[ts][valid])
+        if not hours:
+            del features['hour']
+        self.periods = {period: size for period, size in PERIODS.items() if hours or period != 'hour'}
+        # The one sort: group the plays by year, keeping time order within a year.
+        order = np.argsort(features['year'], kind='stable')
+        self._features = {name: values[order] for name, values in features.items()}
+        self._ms = plays['ms_played'].to_numpy(np.int64)[valid][order]
+
+        self._keys: Dict[str, Tuple[np.ndarray, pd.DataFrame]] = {}
+        for dimension, columns in DIMENSIONS.items():
+            if all(column in plays for column in columns):
+                codes, keys = key_codes(plays, columns)
+                self._keys[dimension] = (codes[valid][order], keys)
+
+        year = self._features['year']
+        starts = np.flatnonzero(np.r_[True, year[1:] != year[:-1]]) if len(year) else np.empty(0, np.int64)
+        stops = np.append(starts[1:], len(year))
+        self.years: List[int] = [int(year[start]) for start in starts]
+        self._slices = {y: slice(start, stop) for y, start, stop in zip(self.years, starts, stops)}
+        self._cache: Dict = {}
+
+    def _year(self, year: int) -> slice:
+        """The plays of a year, as a slice of the sorted arrays."""
+        return self._slices.get(year, slice(0, 0))
+
+    def features(self) -> pd.DataFrame:
+        """
+        The parsed calendar fields of every play, in year order.
+
+        Returns:
+            A DataFrame with year, month, day (a date), weekday (a name) and,
+            if known, hour.
+        """
+        features = pd.DataFrame({
+            'year': self._features['year'],
+            'month': self._features['month'],
+            'day': self._features['day'].astype('datetime64[D]'),
+            'weekday': pd.Categorical.from_codes(self._features['weekday'], categories=WEEKDAYS, ordered=True),
+        })
+        if 'hour' in self._features:
+            features['hour'] = self._features['hour']
+        return features
+
+    @staticmethod
+    def _with_hours(table: pd.DataFrame) -> pd.DataFrame:
+        table['hours_played'] = (table['ms_played'] / MS_PER_HOUR).round(2)
+        return table
+
+    def yearly(self) -> pd.DataFrame:
+        """
+        The listening time of every year.
+
+        Returns:
+            A DataFrame with year, ms_played and hours_played.
+        """
+        if 'yearly' not in self._cache:
+            ms = [int(self._ms[self._slices[year]].sum()) for year in self.years]
+            self._cache['yearly'] = self._with_hours(pd.DataFrame({'year': self.years, 'ms_played': ms}))
+        return self._cache['yearly'].copy()
+
+    def _period_cells(self, period: str) -> np.ndarray:
+        """The (year, period value) cell of every play, as one int code."""
+        if period == 'season':
+            values = SEASON_OF_MONTH[self._features['month']]
+        elif period == 'month':
+            values = self._features['month'] - 1
+        else:
+            values = self._features[period]
+        year_index = np.repeat(np.arange(len(self.years)), [span.stop - span.start for span in self._slices.values()])
+        return year_index * PERIODS[period] + values
+
+    def _period_grid(self, period: str, weighted: bool = True) -> np.ndarray:
+        """
+        The ms_played (or the number of plays) of every (year, period value),
+        for all years in one bincount.
+        """
+        key = ('grid', period, weighted)
+        if key not in self._cache:
+            size = PERIODS[period]
+            grid = np.bincount(self._period_cells(period), weights=self._ms if weighted else None,
+                               minlength=len(self.years) * size)
+            self._cache[key] = grid.reshape(len(self.years), size).astype(np.int64)
+        return self._cache[key]
+
+    def by_period(self, period: str, year: int) -> pd.DataFrame:
+        """
+        The listening time of a year per month, weekday, hour or season.
+
+        Args:
+            period: 'month', 'weekday', 'hour' or 'season'.
+            year: The year.
+
+        Returns:
+            A DataFrame with the period (month and hour numbers, weekday and
+            season names in calendar order), ms_played and hours_played.
+        """
+        if period not in self.periods:
+            raise ValueError(f"Unknown period '{period}', expected one of {', '.join(self.periods)}")
+        grid = self._period_grid(period)
+        ms = grid[self.years.index(year)] if year in self._slices else np.zeros(PERIODS[period], np.int64)
+        labels = {
+            'month': np.arange(1, 13),
+            'hour': np.arange(24),
+            'weekday': pd.Categorical(WEEKDAYS, categories=WEEKDAYS, ordered=True),
+            'season': pd.Categorical(SEASONS, categories=SEASONS, ordered=True),
+        }[period]
+        return self._with_hours(pd.DataFrame({period: labels, 'ms_played': ms}))
+
+    def monthly_pivot(self, min_year: Optional[int] = None) -> pd.DataFrame:
+        """
+        Hours played per year (rows) and month (columns), like a pivot table:
+        months without plays are NaN and months without plays in any year are
+        left out.
+
+        Args:
+            min_year: The first year to include. Defaults to all years.
+        """
+        index = pd.Index(self.years, name='year')
+        columns = pd.Index(range(1, 13), name='month')
+        hours = pd.DataFrame(self._period_grid('month') / MS_PER_HOUR, index=index, columns=columns)
+        played = pd.DataFrame(self._period_grid('month', weighted=False) > 0, index=index, columns=columns)
+        if min_year is not None:
+            hours, played = hours[index >= min_year], played[index >= min_year]
+        return hours.where(played).loc[:, played.any()].round(1)
+
+    def _key_totals(self, dimension: str, year: int) -> np.ndarray:
+        """The ms_played of every key of a dimension in a year."""
+        if dimension not in self._keys:
+            raise ValueError(f"Unknown dimension '{dimension}', expected one of {', '.join(self._keys)}")
+        cache_key = ('totals', dimension, year)
+        if cache_key not in self._cache:
+            codes, keys = self._keys[dimension]
+            span = self._year(year)
+            year_codes, year_ms = codes[span], self._ms[span]
+            known = year_codes >= 0
+            self._cache[cache_key] = np.bincount(
+                year_codes[known], weights=year_ms[known], minlength=len(keys)).astype(np.int64)
+        return self._cache[cache_key]
+
+    @staticmethod
+    def _top_rows(values: np.ndarray, n: int, tiebreak: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        The positions of the n largest positive values, largest first. Ties
+        go to the larger tiebreak value, then to the earlier position.
+        """
+        candidates = np.flatnonzero(values > 0)
+        if n < len(candidates):
+            # Keep every value tied with the n-th largest, so the sort decides ties.
+            threshold = np.partition(values[candidates], len(candidates) - n)[len(candidates) - n]
+            candidates = candidates[values[candidates] >= threshold]
+        if tiebreak is None:
+            return candidates[np.argsort(-values[candidates], kind='stable')][:n]
+        return candidates[np.lexsort((-tiebreak[candidates], -values[candidates]))][:n]
+
+    def top(self, dimension: str, year: int, n: int = 10) -> pd.DataFrame:
+        """
+        The most played artists, albums or tracks of a year.
+
+        Args:
+            dimension: 'artist', 'album' or 'track'.
+            year: The year.
+            n: The number of rows.
+
+        Returns:
+            A DataFrame with the key column(s), ms_played and hours_played,
+            most played first.
+        """
+        totals = self._key_totals(dimension, year)
+        rows = self._top_rows(totals, n)
+        table = self._keys[dimension][1].iloc[rows].reset_index(drop=True)
+        table['ms_played'] = totals[rows]
+        return self._with_hours(table)
+
+    def top_by_season(self, year: int, n: int = 3, dimension: str = 'artist') -> pd.DataFrame:
+        """
+        The most played artists (or albums, or tracks) of every season of a year.
+        Seasons follow the calendar year, so December counts toward that year's winter.
+
+        Args:
+            year: The year.
+            n: The number of rows per season.
+            dimension: 'artist', 'album' or 'track'.
+
+        Returns:
+            A DataFrame with season, rank, the key column(s), ms_played and
+            hours_played, seasons in calendar order.
+        """
+        if dimension not in self._keys:
+            raise ValueError(f"Unknown dimension '{dimension}', expected one of {', '.join(self._keys)}")
+        codes, keys = self._keys[dimension]
+        span = self._year(year)
+        season = SEASON_OF_MONTH[self._features['month'][span]].astype(np.int64)
+        year_codes, year_ms = codes[span], self._ms[span]
+        known = year_codes >= 0
+        grid = np.bincount(season[known] * len(keys) + year_codes[known], weights=year_ms[known],
+                           minlength=len(SEASONS) * len(keys)).reshape(len(SEASONS), len(keys)).astype(np.int64)
+        tables = []
+        for index, name in enumerate(SEASONS):
+            rows = self._top_rows(grid[index], n)
+            table = keys.iloc[rows].reset_index(drop=True)
+            table.insert(0, 'season', name)
+            table.insert(1, 'rank', np.arange(1, len(rows) + 1))
+            table['ms_played'] = grid[index][rows]
+            tables.append(table)
+        table = pd.concat(tables, ignore_index=True)
+        table['season'] = pd.Categorical(table['season'], categories=SEASONS, ordered=True)
+        return self._with_hours(table)
+
+    def unique_days(self, dimension: str, year: int, n: int = 10) -> pd.DataFrame:
+        """
+        The artists, albums or tracks played on the most distinct days of a year.
+
+        Args:
+            dimension: 'artist', 'album' or 'track'.
+            year: The year.
+            n: The number of rows.
+
+        Returns:
+            A DataFrame with the key column(s), unique_days, ms_played and
+            hours_played, most days first (ties: most played first).
+        """
+        totals = self._key_totals(dimension, year)
+        codes, keys = self._keys[dimension]
+        span = self._year(year)
+        year_codes, days = codes[span], self._features['day'][span]
+        known = year_codes >= 0
+        first_day = np.datetime64(f'{year:04d}-01-01', 'D').astype(np.int64)
+        # A year has at most 366 days, so (key, day of the year) packs into one int64.
+        pairs = np.unique(year_codes[known] * 366 + (days[known] - first_day))
+        counts = np.bincount(pairs // 366, minlength=len(keys))
+        rows = self._top_rows(counts, n, tiebreak=totals)
+        table = keys.iloc[rows].reset_index(drop=True)
+        table['unique_days'] = counts[rows]
+        table['ms_played'] = totals[rows]
+        return self._with_hours(table)
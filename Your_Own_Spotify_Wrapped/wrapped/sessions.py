@@ -0,0 +1,222 @@
+"""
+Listening Sessions and Skips.
+
+This module groups plays into listening sessions and measures how plays
+end, including:
+- sessionize: Assigns every play to a session by an idle-gap threshold.
+- session_summary: Length, plays, skip rate and completion of every session.
+- track_summary: Skip rate and completion of every track (or artist).
+
+In the export, ts is the moment a play stopped, so a play started at
+ts - ms_played. sessionize sorts the plays by start time once; a new
+session begins wherever a play starts more than idle_gap after the
+latest end of the plays before it (a running maximum, so overlapping
+plays from two devices do not split a session). Sessions are then
+contiguous runs of the sorted plays, and every per-session statistic is
+one np.add.reduceat (or np.maximum.reduceat) over them. Per-track
+statistics are np.bincount reductions over the track codes.
+
+A play counts as skipped when its skipped field is true; older exports
+leave skipped empty, and then a play ended by the forward button counts
+as skipped. The completion of a play is ms_played divided by the track's
+length, estimated as the longest play of that track in the history
+(the export has no track lengths), capped at 1.
+"""
+
+from typing import Sequence, Union
+import numpy as np
+import pandas as pd
+
+from .report import key_codes
+
+DEFAULT_IDLE_GAP = pd.Timedelta(minutes=30)
+# reason_end values that mean the listener skipped, used when skipped is missing.
+SKIP_REASONS = ('fwdbtn',)
+# The fields sessionize uses; read them from the store with HistoryStore.read(columns=SESSION_COLUMNS).
+SESSION_COLUMNS = (
+    'ts',
+    'ms_played',
+    'master_metadata_track_name',
+    'master_metadata_album_artist_name',
+    'spotify_track_uri',
+    'skipped',
+    'reason_start',
+    'reason_end',
+    'shuffle',
+)
+
+
+def _epoch_ms(ts: pd.Series) -> np.ndarray:
+    """Timestamps as int64 milliseconds since 1970-01-01 UTC."""
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+    return ts.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+
+def _timestamps(epoch_ms: np.ndarray, like: pd.Series) -> pd.Series:
+    """The inverse of _epoch_ms, in UTC if the timestamps like were timezone-aware."""
+    ts = pd.Series(epoch_ms.astype('datetime64[ms]'))
+    return ts.dt.tz_localize('UTC') if like.dt.tz is not None else ts
+
+
+def _skips(plays: pd.DataFrame) -> np.ndarray:
+    """Whether every play was skipped, from skipped or, where it is missing, reason_end."""
+    if 'reason_end' in plays:
+        fallback = plays['reason_end'].isin(SKIP_REASONS).to_numpy()
+    else:
+        fallback = np.zeros(len(plays), dtype=bool)
+    if 'skipped' not in plays:
+        return fallback
+    skipped = plays['skipped'].astype('boolean')
+    return np.where(skipped.isna().to_numpy(), fallback, skipped.fillna(False).to_numpy(bool))
+
+
+def _track_codes(plays: pd.DataFrame) -> np.ndarray:
+    """A code per distinct track: its URI if present, else its artist and name."""
+    if 'spotify_track_uri' in plays and plays['spotify_track_uri'].notna().any():
+        codes, _ = pd.factorize(plays['spotify_track_uri'])
+    else:
+        codes, _ = key_codes(plays, ['master_metadata_album_artist_name', 'master_metadata_track_name'])
+    return np.asarray(codes, dtype=np.int64)
+
+
+def sessionize(plays: pd.DataFrame, idle_gap: Union[pd.Timedelta, str] = DEFAULT_IDLE_GAP) -> pd.DataFrame:
+    """
+    Assign every play to a listening session.
+
+    Args:
+        plays: One row per play with ts and ms_played, and optionally the
+            other SESSION_COLUMNS.
+        idle_gap: The longest pause between two plays of one session.
+
+    Returns:
+        The plays with a timestamp, sorted by start time, with the added
+        columns start, session (numbered from 0 in time order), skip
+        (bool) and completion (0-1, NaN for plays without a track).
+    """
+    idle_gap = pd.Timedelta(idle_gap)
+    plays = plays[plays['ts'].notna()]
+    ms_played = plays['ms_played'].to_numpy(np.int64)
+    end_ms = _epoch_ms(plays['ts'])
+    start_ms = end_ms - ms_played
+
+    order = np.argsort(start_ms, kind='stable')
+    start_ms, end_ms, ms_played = start_ms[order], end_ms[order], ms_played[order]
+    sessions = plays.iloc[order].reset_index(drop=True)
+
+    # A session breaks where a play starts too long after every earlier play has ended.
+    latest_end = np.maximum.accumulate(end_ms)
+    breaks = np.ones(len(start_ms), dtype=bool)
+    breaks[1:] = start_ms[1:] - latest_end[:-1] > idle_gap // pd.Timedelta(milliseconds=1)
+
+    sessions['start'] = _timestamps(start_ms, plays['ts'])
+    sessions['session'] = np.cumsum(breaks) - 1
+    sessions['skip'] = _skips(sessions)
+
+    tracks = _track_codes(sessions)
+    known = tracks >= 0
+    track_length = np.zeros(tracks.max(initial=-1) + 1, dtype=np.int64)
+    np.maximum.at(track_length, tracks[known], ms_played[known])
+    completion = np.full(len(ms_played), np.nan)
+    lengths = track_length[tracks[known]]
+    completion[known] = np.where(lengths > 0, np.minimum(ms_played[known] / np.maximum(lengths, 1), 1.0), np.nan)
+    sessions['completion'] = completion
+    return sessions
+
+
+def session_summary(sessions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize every session of sessionize's output.
+
+    Args:
+        sessions: The output of sessionize.
+
+    Returns:
+        One row per session: session, start, end, length (end - start),
+        plays, ms_played, skips, skip_rate, completion (the mean
+        completion of its plays) and, if shuffle is known, shuffle_rate.
+    """
+    if len(sessions) == 0:
+        return pd.DataFrame(columns=['session', 'start', 'end', 'length', 'plays', 'ms_played',
+                                     'skips', 'skip_rate', 'completion'])
+    session = sessions['session'].to_numpy()
+    # Sessions are contiguous in sessionize's order, so reduceat sums each run.
+    firsts = np.flatnonzero(np.r_[True, session[1:] != session[:-1]])
+    counts = np.diff(np.append(firsts, len(session)))
+    end_ms = np.maximum.reduceat(_epoch_ms(sessions['ts']), firsts)
+
+    completion = sessions['completion'].to_numpy()
+    rated = ~np.isnan(completion)
+    completion_sums = np.add.reduceat(np.where(rated, completion, 0.0), firsts)
+    rated_counts = np.add.reduceat(rated.astype(np.int64), firsts)
+    skips = np.add.reduceat(sessions['skip'].to_numpy(np.int64), firsts)
+
+    summary = pd.DataFrame({
+        'session': session[firsts],
+        'start': sessions['start'].iloc[firsts].reset_index(drop=True),
+        'plays': counts,
+        'ms_played': np.add.reduceat(sessions['ms_played'].to_numpy(np.int64), firsts),
+        'skips': skips,
+        'skip_rate': skips / counts,
+        'completion': np.divide(completion_sums, rated_counts, out=np.full(len(firsts), np.nan), where=rated_counts > 0),
+    })
+    summary.insert(2, 'end', _timestamps(end_ms, sessions['ts']))
+    summary.insert(3, 'length', summary['end'] - summary['start'])
+    if 'shuffle' in sessions:
+        shuffle = sessions['shuffle'].astype('boolean')
+        known = np.add.reduceat(shuffle.notna().to_numpy(np.int64), firsts)
+        on = np.add.reduceat(shuffle.fillna(False).to_numpy(np.int64), firsts)
+        summary['shuffle_rate'] = np.divide(on, known, out=np.full(len(firsts), np.nan), where=known > 0)
+    return summary
+
+
+def track_summary(
+    sessions: pd.DataFrame,
+    by: Union[str, Sequence[str]] = ('master_metadata_album_artist_name', 'master_metadata_track_name'),
+    min_plays: int = 1,
+) -> pd.DataFrame:
+    """
+    Summarize the skips and completion of every track (or artist, or album).
+
+    Args:
+        sessions: The output of sessionize.
+        by: The key column(s).
+        min_plays: Leave out keys with fewer plays.
+
+    Returns:
+        One row per key, most plays first: the key column(s), plays,
+        ms_played, skips, skip_rate, completion (mean of its plays),
+        sessions (the number of sessions it was played in) and
+        session_openers (plays that started a session).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes, keys = key_codes(sessions, by)
+    known = codes >= 0
+    codes = codes[known]
+    size = len(keys)
+
+    plays = np.bincount(codes, minlength=size)
+    skips = np.bincount(codes, weights=sessions['skip'].to_numpy()[known], minlength=size).astype(np.int64)
+    completion = sessions['completion'].to_numpy()[known]
+    rated = ~np.isnan(completion)
+    completion_sums = np.bincount(codes[rated], weights=completion[rated], minlength=size)
+    rated_counts = np.bincount(codes[rated], minlength=size)
+
+    session = sessions['session'].to_numpy()[known]
+    session_count = int(session.max(initial=0)) + 1
+    # Distinct (key, session) pairs give the number of sessions per key.
+    pairs = pd.unique(codes * session_count + session)
+    in_sessions = np.bincount(pairs // session_count, minlength=size)
+    all_sessions = sessions['session'].to_numpy()
+    opener = np.r_[True, all_sessions[1:] != all_sessions[:-1]][known]
+
+    summary = keys
+    summary['plays'] = plays
+    summary['ms_played'] = np.bincount(codes, weights=sessions['ms_played'].to_numpy()[known], minlength=size).astype(np.int64)
+    summary['skips'] = skips
+    summary['skip_rate'] = skips / np.maximum(plays, 1)
+    summary['completion'] = np.divide(completion_sums, rated_counts, out=np.full(size, np.nan), where=rated_counts > 0)
+    summary['sessions'] = in_sessions
+    summary['session_openers'] = np.bincount(codes[opener], minlength=size)
+    summary = summary[summary['plays'] >= min_plays]
+    return summary.sort_values('plays', ascending=False, kind='stable', ignore_index=True)
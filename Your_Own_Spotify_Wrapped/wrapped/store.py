@@ -0,0 +1,146 @@
+"""
+Columnar History Store.
+
+This module keeps the combined streaming history as Parquet files
+partitioned by year, including:
+- HistoryStore: Ingests export files incrementally and reads back only the
+  requested columns and years.
+
+The store is a directory of `year=YYYY/part-NNNNN.parquet` files plus a
+`_manifest.json` recording the export files already ingested and the
+latest play timestamp stored. Ingest skips export files it has seen
+(same name, size and modification time) and, from new or changed files,
+appends only the plays newer than the latest stored play, so a fresh
+full export only adds the plays since the previous one.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .loader import DEFAULT_COLUMNS, FIELD_KINDS, find_export_files, load_streaming_history
+
+# Every field the loader can type is stored, so later analyses can use them.
+STORE_COLUMNS = tuple(FIELD_KINDS)
+MANIFEST_NAME = '_manifest.json'
+
+
+class HistoryStore:
+    """
+    A Parquet store of one user's streaming history, partitioned by year.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: The store directory; created on the first ingest.
+        """
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.manifest: Dict = {'files': {}, 'max_ts': None, 'next_part': 0}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    @property
+    def max_ts(self) -> Optional[pd.Timestamp]:
+        """The timestamp of the latest stored play."""
+        value = self.manifest['max_ts']
+        return pd.Timestamp(value) if value else None
+
+    def _file_signature(self, path: str) -> List:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def ingest(self, paths: Union[str, Iterable[str]]) -> int:
+        """
+        Append the new plays of export files to the store.
+
+        Args:
+            paths: A folder of export files, or the export files themselves.
+
+        Returns:
+            The number of plays added.
+        """
+        if isinstance(paths, str):
+            paths = find_export_files(paths) if os.path.isdir(paths) else [paths]
+        new_files = [
+            path for path in paths
+            if self.manifest['files'].get(os.path.basename(path)) != self._file_signature(path)
+        ]
+        if not new_files:
+            return 0
+
+        plays = load_streaming_history(new_files, columns=STORE_COLUMNS)
+        cutoff = self.max_ts
+        if cutoff is not None:
+            plays = plays[plays['ts'] > cutoff]
+        plays = plays.dropna(subset=['ts']).sort_values('ts', kind='stable')
+
+        if len(plays):
+            years = plays['ts'].dt.year
+            for year, year_plays in plays.groupby(years, sort=True):
+                self._write_part(int(year), year_plays)
+            self.manifest['max_ts'] = plays['ts'].iloc[-1].isoformat()
+        for path in new_files:
+            self.manifest['files'][os.path.basename(path)] = self._file_signature(path)
+        self._save_manifest()
+        return len(plays)
+
+    def _write_part(self, year: int, plays: pd.DataFrame):
+        """Write one year's new plays as a new part file of its partition."""
+        directory = os.path.join(self.root, f'year={year}')
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{self.manifest['next_part']:05d}.parquet")
+        self.manifest['next_part'] += 1
+        table = pa.Table.from_pandas(plays, preserve_index=False)
+        pq.write_table(table, path, compression='zstd')
+
+    def _save_manifest(self):
+        """Save the manifest atomically, so an interrupted ingest never corrupts it."""
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def years(self) -> List[int]:
+        """The years with stored plays."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            int(name.split('=', 1)[1]) for name in os.listdir(self.root)
+            if name.startswith('year=') and name.split('=', 1)[1].isdigit()
+        )
+
+    def read(self, columns: Optional[Sequence[str]] = None, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Read plays from the store, touching only the needed files and columns.
+
+        Args:
+            columns: The columns to read, including 'year' if wanted.
+                Defaults to the loader's DEFAULT_COLUMNS plus 'year'.
+            years: The years to read. Defaults to all years.
+
+        Returns:
+            A DataFrame of plays in timestamp order, with categorical names.
+        """
+        columns = list(columns) if columns is not None else list(DEFAULT_COLUMNS) + ['year']
+        stored = self.years()
+        selected = stored if years is None else sorted(set(years) & set(stored))
+        if not selected:
+            return pd.DataFrame({name: pd.Series(dtype=object) for name in columns})
+
+        files = [
+            os.path.join(self.root, f'year={year}', name)
+            for year in selected
+            for name in sorted(os.listdir(os.path.join(self.root, f'year={year}')))
+            if name.endswith('.parquet')
+        ]
+        dataset = ds.dataset(files, format='parquet', partitioning='hive', partition_base_dir=self.root)
+        table = dataset.to_table(columns=columns)
+        return table.to_pandas()
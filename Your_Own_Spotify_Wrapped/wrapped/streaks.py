@@ -0,0 +1,121 @@
+"""
+Listening Streaks.
+
+This module finds, for every track, artist or album, the longest run of
+consecutive days it was played on and the run that is still going,
+including:
+- day_numbers: Converts play timestamps to integer day numbers.
+- longest_streak: The notebook's original per-track reference function.
+- compute_streaks: All streaks of all keys in one vectorized pass.
+
+compute_streaks packs each (key, day) pair into one int64, so a single
+np.unique sorts the plays and drops repeated plays on the same day. A run
+break is wherever the key changes or the day gap is not exactly one; the
+run lengths then follow from the break positions, and the longest run of
+every key is a grouped maximum over its runs (np.maximum.reduceat).
+"""
+
+from typing import List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from .report import key_codes
+
+_DAY_BITS = 32
+
+
+def day_numbers(ts: pd.Series) -> np.ndarray:
+    """
+    Convert play timestamps to days since 1970-01-01, as the UTC calendar
+    date (like ts.dt.date on the loader's UTC timestamps).
+
+    Args:
+        ts: A datetime Series, timezone-aware or naive.
+
+    Returns:
+        An int64 array of day numbers.
+    """
+    if getattr(ts.dt, 'tz', None) is not None:
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+    return ts.to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+def longest_streak(dates) -> int:
+    """
+    The notebook's reference implementation: the longest run of consecutive
+    days in a collection of distinct dates.
+    """
+    dates = sorted(dates)
+    max_streak = 1
+    current_streak = 1
+    for i in range(1, len(dates)):
+        if (dates[i] - dates[i - 1]).days == 1:
+            current_streak += 1
+        else:
+            max_streak = max(max_streak, current_streak)
+            current_streak = 1
+    max_streak = max(max_streak, current_streak)
+    return max_streak
+
+
+def compute_streaks(
+    plays: pd.DataFrame,
+    by: Union[str, Sequence[str]] = 'master_metadata_track_name',
+    ts: str = 'ts',
+    as_of: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Compute the longest and current listening streak of every key.
+
+    Args:
+        plays: The plays, one row per play.
+        by: The key column(s), e.g. the track, artist or album name, or
+            ['master_metadata_album_artist_name', 'master_metadata_track_name'].
+        ts: The play timestamp column.
+        as_of: The day the current streaks are measured at. A streak is
+            current if its last day is as_of or the day before. Defaults to
+            the last day in the plays.
+
+    Returns:
+        A DataFrame sorted by key with the key column(s), longest_streak_days,
+        current_streak_days, unique_days and last_played (a date). Keys
+        without plays (and plays with a missing key) are left out.
+    """
+    by: List[str] = [by] if isinstance(by, str) else list(by)
+    codes, keys = key_codes(plays, by)
+    days = day_numbers(plays[ts])
+    valid = (codes >= 0) & (days != np.iinfo(np.int64).min)
+    codes, days = codes[valid], days[valid]
+    columns = by + ['longest_streak_days', 'current_streak_days', 'unique_days', 'last_played']
+    if len(days) == 0:
+        return pd.DataFrame(columns=columns)
+
+    first_day = days.min()
+    # One sorted, de-duplicated array of (key, day) pairs.
+    pairs = np.unique((codes << _DAY_BITS) | (days - first_day))
+    pair_keys = pairs >> _DAY_BITS
+    pair_days = pairs & ((1 << _DAY_BITS) - 1)
+
+    breaks = np.ones(len(pairs), dtype=bool)
+    breaks[1:] = (pair_keys[1:] != pair_keys[:-1]) | (np.diff(pair_days) != 1)
+    run_starts = np.flatnonzero(breaks)
+    run_lengths = np.diff(np.append(run_starts, len(pairs)))
+    run_keys = pair_keys[run_starts]
+
+    key_starts = np.flatnonzero(np.r_[True, run_keys[1:] != run_keys[:-1]])
+    key_ends = np.append(key_starts[1:], len(run_starts)) - 1
+    longest = np.maximum.reduceat(run_lengths, key_starts)
+
+    # The last run of each key is current if it reaches as_of or the day before.
+    last_pair = np.append(run_starts[key_starts[1:]], len(pairs)) - 1
+    last_days = pair_days[last_pair] + first_day
+    as_of_day = last_days.max() if as_of is None else int(day_numbers(pd.Series([pd.Timestamp(as_of)]))[0])
+    current = np.where(last_days >= as_of_day - 1, run_lengths[key_ends], 0)
+    unique_days = np.diff(np.append(np.flatnonzero(np.r_[True, pair_keys[1:] != pair_keys[:-1]]), len(pairs)))
+
+    result = keys.iloc[run_keys[key_starts]].reset_index(drop=True)
+    result['longest_streak_days'] = longest
+    result['current_streak_days'] = current
+    result['unique_days'] = unique_days
+    result['last_played'] = last_days.astype('datetime64[D]')
+    return result.sort_values(by, kind='stable', ignore_index=True)
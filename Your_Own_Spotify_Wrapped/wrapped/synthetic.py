@@ -0,0 +1,241 @@
+"""
+Synthetic Streaming History.
+
+This module writes fake Spotify exports for benchmarks and demos,
+including:
+- make_catalog: A catalog of artists, albums and tracks.
+- generate_plays: Play columns with Zipf-distributed popularity.
+- write_export: Writes plays as Streaming_History_Audio_*.json files.
+- generate_export: All of the above in one call.
+
+The records follow the extended streaming history schema field for field.
+Artist popularity follows a Zipf law, and so does track popularity within
+an artist, so a few artists and tracks get most of the plays, as in real
+histories. Plays are spread over the requested years with a daily rhythm
+(more plays in the evening, fewer at night); most run to the end of the
+track, some are skipped early, and a small share are podcast episodes
+without track metadata.
+
+Usage:
+    python -m wrapped.synthetic OUTPUT_DIR --plays 1000000 [--seed 0]
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+
+RECORDS_PER_FILE = 20_000
+PLATFORMS = ('android', 'ios', 'windows', 'osx', 'web_player')
+COUNTRIES = ('PL', 'DE', 'GB', 'US', 'ES')
+# Relative number of plays per hour of the day (UTC), lowest at night.
+HOUR_WEIGHTS = np.array([3, 2, 1, 1, 1, 1, 2, 4, 6, 6, 6, 6, 7, 7, 6, 6, 7, 8, 9, 10, 10, 9, 7, 5], dtype=np.float64)
+SKIP_SHARE = 0.2
+EPISODE_SHARE = 0.02
+
+
+def _zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def make_catalog(
+    artists: int,
+    rng: np.random.Generator,
+    albums_per_artist: int = 4,
+    tracks_per_album: int = 10,
+    exponent: float = 1.1,
+) -> pd.DataFrame:
+    """
+    Make a catalog of tracks with their popularity.
+
+    Args:
+        artists: The number of artists.
+        rng: A NumPy random generator.
+        albums_per_artist: The average number of albums per artist.
+        tracks_per_album: The average number of tracks per album.
+        exponent: The Zipf exponent of artist and track popularity.
+
+    Returns:
+        One row per track: artist, album, track, uri, length_ms and weight
+        (the probability that a play is of this track).
+    """
+    albums = rng.poisson(albums_per_artist - 1, artists) + 1
+    album_artist = np.repeat(np.arange(artists), albums)
+    tracks = rng.poisson(tracks_per_album - 1, len(album_artist)) + 1
+    track_album = np.repeat(np.arange(len(album_artist)), tracks)
+    track_artist = album_artist[track_album]
+
+    # Rank of each track within its artist, for the within-artist Zipf law.
+    artist_starts = np.searchsorted(track_artist, np.arange(artists))
+    rank = np.arange(len(track_artist)) - artist_starts[track_artist]
+    within = 1.0 / (rank + 1) ** exponent
+    within /= np.bincount(track_artist, weights=within)[track_artist]
+    weight = _zipf_weights(artists, exponent)[track_artist] * within
+
+    album_number = np.arange(len(album_artist)) - np.searchsorted(album_artist, album_artist)
+    return pd.DataFrame({
+        'artist': [f'Artist {a + 1}' for a in track_artist],
+        'album': [f'Album {a + 1}-{n + 1}' for a, n in zip(album_artist[track_album], album_number[track_album])],
+        'track': [f'Track {a + 1}-{r + 1}' for a, r in zip(track_artist, rank)],
+        'uri': [f'spotify:track:{i:022d}' for i in range(len(track_artist))],
+        'length_ms': rng.integers(120_000, 360_000, len(track_artist)),
+        'weight': weight / weight.sum(),
+    })
+
+
+def generate_plays(
+    plays: int,
+    catalog: pd.DataFrame,
+    rng: np.random.Generator,
+    start: str = '2019-01-01',
+    end: str = '2025-01-01',
+) -> Dict[str, np.ndarray]:
+    """
+    Draw plays from a catalog.
+
+    Args:
+        plays: The number of plays.
+        catalog: The output of make_catalog.
+        rng: A NumPy random generator.
+        start: The first day of the history.
+        end: The day after the last day of the history.
+
+    Returns:
+        Column arrays in time order: ts (datetime64[s], when the play
+        stopped), ms_played, track (catalog row, -1 for an episode),
+        skipped, after_skip (the previous play was skipped), shuffle,
+        platform and country (indexes into PLATFORMS and COUNTRIES).
+    """
+    days = (np.datetime64(end, 'D') - np.datetime64(start, 'D')).astype(np.int64)
+    day = rng.integers(0, days, plays)
+    hour = rng.choice(24, plays, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    seconds = day * 86400 + hour * 3600 + rng.integers(0, 3600, plays)
+    ts = np.datetime64(start, 's') + np.sort(seconds)
+
+    track = np.searchsorted(np.cumsum(catalog['weight'].to_numpy()), rng.random(plays), side='right')
+    track = np.minimum(track, len(catalog) - 1)
+    length = catalog['length_ms'].to_numpy()[track]
+    skipped = rng.random(plays) < SKIP_SHARE
+    ms_played = np.where(skipped, (length * rng.random(plays) * 0.5).astype(np.int64), length)
+    track = np.where(rng.random(plays) < EPISODE_SHARE, -1, track)
+    # One listening device and country at a time, changing now and then.
+    switches = np.cumsum(rng.random(plays) < 0.001)
+    return {
+        'ts': ts,
+        'ms_played': ms_played,
+        'track': track,
+        'skipped': skipped,
+        'after_skip': np.r_[False, skipped[:-1]],
+        'shuffle': rng.random(plays) < 0.4,
+        'platform': switches % len(PLATFORMS),
+        'country': (switches // 7) % len(COUNTRIES),
+    }
+
+
+def _records(plays: Dict[str, np.ndarray], names: tuple, rows: slice) -> List[dict]:
+    """The export records of a range of plays; names holds the catalog's name lists."""
+    artist, album, track_name, uri = names
+    records = []
+    for ts, ms, track, skipped, after_skip, shuffle, platform, country in zip(
+            np.datetime_as_string(plays['ts'][rows], unit='s'), plays['ms_played'][rows].tolist(),
+            plays['track'][rows].tolist(), plays['skipped'][rows].tolist(), plays['after_skip'][rows].tolist(),
+            plays['shuffle'][rows].tolist(), plays['platform'][rows].tolist(), plays['country'][rows].tolist()):
+        is_track = track >= 0
+        records.append({
+            'ts': f'{ts}Z',
+            'platform': PLATFORMS[platform],
+            'ms_played': ms,
+            'conn_country': COUNTRIES[country],
+            'ip_addr': '192.0.2.1',
+            'master_metadata_track_name': track_name[track] if is_track else None,
+            'master_metadata_album_artist_name': artist[track] if is_track else None,
+            'master_metadata_album_album_name': album[track] if is_track else None,
+            'spotify_track_uri': uri[track] if is_track else None,
+            'episode_name': None if is_track else 'Episode',
+            'episode_show_name': None if is_track else 'Show',
+            'spotify_episode_uri': None if is_track else 'spotify:episode:0000000000000000000000',
+            'audiobook_title': None,
+            'audiobook_uri': None,
+            'audiobook_chapter_uri': None,
+            'audiobook_chapter_title': None,
+            'reason_start': 'fwdbtn' if after_skip else 'trackdone',
+            'reason_end': 'fwdbtn' if skipped else 'trackdone',
+            'shuffle': shuffle,
+            'skipped': skipped,
+            'offline': False,
+            'offline_timestamp': None,
+            'incognito_mode': False,
+        })
+    return records
+
+
+def write_export(
+    plays: Dict[str, np.ndarray],
+    catalog: pd.DataFrame,
+    output_dir: str,
+    records_per_file: int = RECORDS_PER_FILE,
+) -> List[str]:
+    """
+    Write plays as export files, like Spotify: JSON arrays of at most
+    records_per_file records, named by their years.
+
+    Args:
+        plays: The output of generate_plays.
+        catalog: The catalog the plays were drawn from.
+        output_dir: The folder to write to; created if needed.
+        records_per_file: The most records per file.
+
+    Returns:
+        The paths written, in time order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    years = plays['ts'].astype('datetime64[Y]').astype(np.int64) + 1970
+    names = tuple(catalog[name].tolist() for name in ('artist', 'album', 'track', 'uri'))
+    paths = []
+    for index, first in enumerate(range(0, len(years), records_per_file)):
+        rows = slice(first, min(first + records_per_file, len(years)))
+        first_year, last_year = years[rows.start], years[rows.stop - 1]
+        span = str(first_year) if first_year == last_year else f'{first_year}-{last_year}'
+        path = os.path.join(output_dir, f'Streaming_History_Audio_{span}_{index}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(_records(plays, names, rows), f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def generate_export(output_dir: str, plays: int, seed: int = 0, artists: Optional[int] = None) -> List[str]:
+    """
+    Write a synthetic export of a number of plays.
+
+    Args:
+        output_dir: The folder to write to.
+        plays: The number of plays.
+        seed: The random seed; the same seed gives the same files.
+        artists: The number of artists. Defaults to one per 200 plays,
+            at least 50 and at most 50,000.
+
+    Returns:
+        The paths written.
+    """
+    rng = np.random.default_rng(seed)
+    artists = artists or int(np.clip(plays // 200, 50, 50_000))
+    catalog = make_catalog(artists, rng)
+    return write_export(generate_plays(plays, catalog, rng), catalog, output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic Spotify extended streaming history.')
+    parser.add_argument('output_dir', help='Folder for the export files')
+    parser.add_argument('--plays', type=int, default=100_000)
+    parser.add_argument('--artists', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_export(args.output_dir, args.plays, seed=args.seed, artists=args.artists)
+    print(f"Wrote {args.plays:,} plays to {len(paths)} files in {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()